@@ -43,6 +43,24 @@ def db_songs_with_mono():
     return [(row_id, title, json.loads(lyrics)) for row_id, title, lyrics in rows]
 
 
+@pytest.fixture
+def isolated_store(monkeypatch, tmp_path):
+    """A fresh, empty artifact store under tmp_path for one test."""
+    from scripts.config import Config
+    from scripts import artifact_store
+    monkeypatch.setattr(Config, "ARTIFACT_CACHE_DIR", str(tmp_path / "store"))
+    monkeypatch.setattr(artifact_store, "_store", None)
+    return tmp_path / "store"
+
+
+@pytest.fixture
+def isolated_song_db(monkeypatch, tmp_path):
+    """Config.SONG_DB_PATH pointed at a new database under tmp_path."""
+    from scripts.config import Config
+    monkeypatch.setattr(Config, "SONG_DB_PATH", str(tmp_path / "songs.db"))
+    return tmp_path / "songs.db"
+
+
 @pytest.fixture
 def sample_markers():
     """Minimal set of well-formed markers for unit tests."""
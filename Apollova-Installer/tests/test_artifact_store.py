@@ -0,0 +1,168 @@
+"""
+Tests for assets/scripts/artifact_store.py
+
+Covers content-addressed keys, hit/miss counters, hardlink materialisation,
+LRU eviction under the disk budget, and the whisper_common cache fallback.
+"""
+import os
+import sys
+import time
+import json
+import types
+from unittest.mock import MagicMock
+
+# ---------------------------------------------------------------------------
+# Mock heavy dependencies BEFORE importing whisper_common
+# ---------------------------------------------------------------------------
+sys.modules.setdefault("stable_whisper", MagicMock())
+sys.modules.setdefault("torch", MagicMock())
+sys.modules.setdefault("pydub", MagicMock())
+sys.modules.setdefault("pydub.playback", MagicMock())
+sys.modules.setdefault("scripts.audio_processing", MagicMock())
+
+import numpy as np
+import pytest
+
+from scripts.config import Config
+from scripts import artifact_store
+from scripts.artifact_store import ArtifactStore, file_hash
+from scripts import whisper_common
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArtifactStore(root=str(tmp_path / "store"), max_bytes=10_000)
+
+
+def _write(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+    return str(path)
+
+
+class TestKeys:
+    def test_key_stable_and_order_independent(self):
+        a = ArtifactStore.key("abc", model="small", passes=[True, False])
+        b = ArtifactStore.key("abc", passes=[True, False], model="small")
+        assert a == b
+        assert a.startswith("abc-")
+
+    def test_key_changes_with_params(self):
+        assert (ArtifactStore.key("abc", model="small")
+                != ArtifactStore.key("abc", model="medium"))
+
+    def test_file_hash_content_addressed(self, tmp_path):
+        a = _write(tmp_path / "a.wav", b"same bytes")
+        b = _write(tmp_path / "b.wav", b"same bytes")
+        assert file_hash(a) == file_hash(b)
+        assert len(file_hash(a)) == 16
+
+
+class TestStore:
+    def test_miss_then_hit_counted(self, store, tmp_path):
+        src = _write(tmp_path / "v.wav", b"x" * 100)
+        assert store.get("vocals", "k1", ".wav") is None
+        store.put_file("vocals", "k1", src)
+        assert store.get("vocals", "k1", ".wav") is not None
+        stats = store.stats()
+        assert stats["hits"] == {"vocals": 1}
+        assert stats["misses"] == {"vocals": 1}
+        assert stats["bytes"] == 100
+
+    def test_materialize_hardlinks(self, store, tmp_path):
+        src = _write(tmp_path / "v.wav", b"stem")
+        stored = store.put_file("vocals", "k1", src)
+        dest = str(tmp_path / "job" / "vocals.wav")
+        os.makedirs(os.path.dirname(dest))
+        store.materialize(stored, dest)
+        assert os.path.samefile(stored, dest)
+
+    def test_materialize_replaces_existing(self, store, tmp_path):
+        stored = store.put_bytes("whisper", "k1", b"new", ".json")
+        dest = _write(tmp_path / "whisper_raw.json", b"old")
+        store.materialize(stored, dest)
+        with open(dest, "rb") as f:
+            assert f.read() == b"new"
+
+    def test_lru_eviction(self, store):
+        store.put_bytes("vocals", "old", b"a" * 4000, ".wav")
+        store.put_bytes("vocals", "mid", b"b" * 4000, ".wav")
+        old = store.path_for("vocals", "old", ".wav")
+        mid = store.path_for("vocals", "mid", ".wav")
+        os.utime(old, (time.time() - 100, time.time() - 100))
+        os.utime(mid, (time.time() - 50, time.time() - 50))
+        # Touching "old" makes "mid" the least recently used entry
+        assert store.get("vocals", "old", ".wav")
+        store.put_bytes("vocals", "new", b"c" * 4000, ".wav")
+        assert os.path.exists(old)
+        assert not os.path.exists(mid)
+        assert store.total_bytes() <= store.max_bytes
+
+
+@pytest.mark.usefixtures("isolated_store")
+class TestWhisperCacheStore:
+    def test_segments_reused_in_new_job_folder(self, tmp_path):
+        first = tmp_path / "job_001"
+        second = tmp_path / "job_002"
+        first.mkdir()
+        second.mkdir()
+        segments = [{"t": 1.0, "end_time": 2.0, "lyric_current": "hello"}]
+        whisper_common.save_whisper_cache(str(first), segments, "song-key")
+
+        loaded = whisper_common.load_whisper_cache(str(second), "song-key")
+        assert loaded == [{"start": 1.0, "end": 2.0, "text": "hello"}]
+        assert (second / "whisper_raw.json").exists()
+
+    def test_resave_does_not_corrupt_store(self, tmp_path):
+        first = tmp_path / "job_001"
+        first.mkdir()
+        whisper_common.save_whisper_cache(
+            str(first), [{"t": 1.0, "end_time": 2.0, "text": "a"}], "k")
+        second = tmp_path / "job_002"
+        second.mkdir()
+        whisper_common.load_whisper_cache(str(second), "k")
+        # Rewriting the (hardlinked) job copy must not change the stored entry
+        whisper_common.save_whisper_cache(
+            str(second), [{"t": 5.0, "end_time": 6.0, "text": "b"}])
+        stored = artifact_store.get_store().path_for("whisper", "k", ".json")
+        with open(stored, encoding="utf-8") as f:
+            assert json.load(f)["segments"][0]["text"] == "a"
+
+    def test_store_key_depends_on_template(self, tmp_path):
+        audio = _write(tmp_path / "audio_trimmed.wav", b"pcm")
+        assert (whisper_common.whisper_store_key(audio, "Mono")
+                != whisper_common.whisper_store_key(audio, "Onyx"))
+        assert whisper_common.whisper_store_key(str(tmp_path / "missing.wav"), "Mono") is None
+
+
+@pytest.mark.usefixtures("isolated_store")
+class TestTranscriptionRequest:
+    @pytest.mark.parametrize("name,regroup,from_demucs", [
+        ("Aurora", [True] * 4, False),          # Aurora still denoises the stem
+        ("Mono", [True] * 4, True),
+        ("Onyx", [False, False, False, True], True),
+    ])
+    def test_request_keeps_template_passes(self, tmp_path, monkeypatch,
+                                           name, regroup, from_demucs):
+        vocals = str(tmp_path / "vocals.wav")
+        monkeypatch.setattr(whisper_common, "separate_vocals", lambda path, folder: vocals)
+        monkeypatch.setattr(whisper_common, "load_audio", lambda path: path)
+        monkeypatch.setattr(whisper_common, "get_audio_duration", lambda audio: 60.0)
+        request = whisper_common.transcription_request(str(tmp_path), "Song", name)
+        assert request["audio"] == vocals
+        assert request["regroup_passes"] == regroup
+        assert request["from_demucs"] is from_demucs
+
+    def test_pass_keys_shared_by_templates_not_models(self, monkeypatch):
+        audio = types.SimpleNamespace(samples=np.ones(10), path=None)
+        cfg = whisper_common.TEMPLATE_PASS_CONFIG
+
+        def keys(template):
+            passes = whisper_common._build_passes(
+                "p", "en", True, cfg[template]["regroup_passes"])
+            return [whisper_common.pass_checkpoint_key(audio, p["params"]) for p in passes]
+
+        aurora = keys("Aurora")
+        assert keys("Onyx") == aurora and len(set(aurora)) == 4
+        monkeypatch.setattr(Config, "WHISPER_MODEL", "some-other-model")
+        assert not set(keys("Mono")) & set(aurora)
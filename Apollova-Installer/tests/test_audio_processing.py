@@ -0,0 +1,187 @@
+"""
+Tests for assets/scripts/audio_processing.py — the windowed trim used by
+trim_audio and download_audio_clip, and the section download itself.
+
+ffmpeg, soundfile and pydub may be missing here, so the trim backends are
+replaced with a stdlib `wave` trimmer where needed, and yt_dlp with a fake
+that writes a WAV section.  Other test modules
+replace scripts.audio_processing with a MagicMock, so the real module is
+loaded from its file under a private name.
+"""
+import importlib.util
+import os
+import subprocess
+import sys
+import wave
+from unittest.mock import MagicMock
+
+sys.modules.setdefault("pydub", MagicMock())
+
+import pytest
+
+_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "assets", "scripts",
+                     "audio_processing.py")
+_spec = importlib.util.spec_from_file_location("_audio_processing_under_test", _PATH)
+ap = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(ap)
+
+RATE = 8000
+
+
+def _write_wav(path, seconds):
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(RATE)
+        w.writeframes(b"\x01\x00" * int(seconds * RATE))
+    return str(path)
+
+
+def _wave_trim(src, dst, start_sec, duration_sec):
+    """Stand-in backend: copy the window's frames like ffmpeg -ss/-t would."""
+    with wave.open(src, "rb") as r:
+        params = r.getparams()
+        r.setpos(min(int(round(start_sec * RATE)), r.getnframes()))
+        frames = r.readframes(int(round(duration_sec * RATE)))
+    with wave.open(dst, "wb") as w:
+        w.setparams(params)
+        w.writeframes(frames)
+    return True
+
+
+def _fail(message, leave_part=False):
+    def trim(src, dst, start_sec, duration_sec):
+        if leave_part:
+            open(dst, "wb").write(b"half")
+        raise RuntimeError(message)
+    return trim
+
+
+@pytest.fixture
+def src(tmp_path):
+    return _write_wav(tmp_path / "source.wav", 10.0)
+
+
+class TestTrimWindow:
+    def test_exact_duration_from_header(self, tmp_path, src, monkeypatch):
+        monkeypatch.setattr(ap, "_ffmpeg_trim", _wave_trim)
+        dst = str(tmp_path / "audio_trimmed.wav")
+        assert ap.trim_window(src, dst, 2.0, 4.5) == 2.5
+        assert ap.wav_duration(dst) == 2.5
+        assert not os.path.exists(dst + ".part")
+
+    def test_missing_ffmpeg_falls_back_to_soundfile(self, tmp_path, src, monkeypatch):
+        monkeypatch.setattr(ap.shutil, "which", lambda name: None)
+        monkeypatch.setattr(ap, "_soundfile_trim", _wave_trim)
+        monkeypatch.setattr(ap, "_pydub_trim", _fail("pydub should not run"))
+        dst = str(tmp_path / "out.wav")
+        assert ap.trim_window(src, dst, 1.0, 3.0) == 2.0
+
+    def test_failing_ffmpeg_part_removed_before_fallback(self, tmp_path, src, monkeypatch):
+        seen = []
+
+        def broken_run(cmd, **kwargs):
+            open(cmd[-1], "wb").write(b"half")   # ffmpeg died mid-write
+            return subprocess.CompletedProcess(cmd, 1, "", "Invalid data")
+
+        def soundfile(src_, dst, start_sec, duration_sec):
+            seen.append(os.path.exists(dst))
+            return _wave_trim(src_, dst, start_sec, duration_sec)
+
+        monkeypatch.setattr(ap.shutil, "which", lambda name: "/usr/bin/ffmpeg")
+        monkeypatch.setattr(ap.subprocess, "run", broken_run)
+        monkeypatch.setattr(ap, "_soundfile_trim", soundfile)
+        dst = str(tmp_path / "out.wav")
+        assert ap.trim_window(src, dst, 0.0, 1.0) == 1.0
+        assert seen == [False]
+
+    def test_ffmpeg_seeks_before_input(self, tmp_path, monkeypatch):
+        cmds = []
+        monkeypatch.setattr(ap.shutil, "which", lambda name: "/usr/bin/ffmpeg")
+        monkeypatch.setattr(ap.subprocess, "run",
+                            lambda cmd, **kw: cmds.append(cmd) or
+                            subprocess.CompletedProcess(cmd, 0, "", ""))
+        assert ap._ffmpeg_trim("in.mp3", "out.wav", 12.5, 30.0)
+        cmd = cmds[0]
+        assert cmd[cmd.index("-ss") + 1] == "12.500"
+        assert cmd[cmd.index("-t") + 1] == "30.000"
+        assert cmd.index("-ss") < cmd.index("-i")
+
+    def test_every_backend_failing_cleans_up_and_raises_last(self, tmp_path, src, monkeypatch):
+        monkeypatch.setattr(ap, "_ffmpeg_trim", _fail("ffmpeg", leave_part=True))
+        monkeypatch.setattr(ap, "_soundfile_trim", _fail("soundfile", leave_part=True))
+        monkeypatch.setattr(ap, "_pydub_trim", _fail("pydub", leave_part=True))
+        dst = str(tmp_path / "out.wav")
+        with pytest.raises(RuntimeError, match="pydub"):
+            ap.trim_window(src, dst, 0.0, 1.0)
+        assert os.listdir(tmp_path) == ["source.wav"]
+
+    def test_source_shorter_than_start(self, tmp_path, src, monkeypatch):
+        monkeypatch.setattr(ap, "_ffmpeg_trim", _wave_trim)
+        dst = str(tmp_path / "out.wav")
+        with pytest.raises(ValueError, match="shorter than 15s"):
+            ap.trim_window(src, dst, 15.0, 20.0)
+        assert os.listdir(tmp_path) == ["source.wav"]
+
+    def test_existing_clip_replaced_only_on_success(self, tmp_path, src, monkeypatch):
+        dst = _write_wav(tmp_path / "out.wav", 7.0)
+        monkeypatch.setattr(ap, "_ffmpeg_trim", _wave_trim)
+        with pytest.raises(ValueError):
+            ap.trim_window(src, dst, 15.0, 20.0)
+        assert ap.wav_duration(dst) == 7.0
+        assert ap.trim_window(src, dst, 0.0, 4.0) == 4.0
+
+    def test_real_soundfile_backend(self, tmp_path, src, monkeypatch):
+        pytest.importorskip("soundfile")
+        monkeypatch.setattr(ap.shutil, "which", lambda name: None)
+        monkeypatch.setattr(ap, "_pydub_trim", _fail("pydub should not run"))
+        dst = str(tmp_path / "out.wav")
+        assert ap.trim_window(src, dst, 2.0, 5.0) == 3.0
+        # A start past the end is reported, not handed to a full pydub decode
+        with pytest.raises(ValueError, match="shorter than 15s"):
+            ap.trim_window(src, dst, 15.0, 20.0)
+        assert ap.wav_duration(dst) == 3.0
+
+
+class _FakeYDL:
+    """yt_dlp.YoutubeDL stand-in that writes a 10 s section as <outtmpl>.m4a."""
+    def __init__(self, opts):
+        self.opts = opts
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def download(self, urls):
+        _write_wav(self.opts["outtmpl"].replace("%(ext)s", "m4a"), 10.0)
+
+
+@pytest.fixture
+def fake_yt_dlp(monkeypatch):
+    utils = MagicMock()
+    module = MagicMock(YoutubeDL=_FakeYDL, utils=utils)
+    monkeypatch.setitem(sys.modules, "yt_dlp", module)
+    monkeypatch.setitem(sys.modules, "yt_dlp.utils", utils)
+    monkeypatch.setattr(ap, "_find_cookies_file", lambda: None)
+    monkeypatch.setattr(ap, "_ffmpeg_trim", _wave_trim)
+
+
+URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+class TestClipDownload:
+    def test_stale_section_files_removed_first(self, tmp_path, fake_yt_dlp):
+        # An interrupted earlier run left a section that sorts first
+        _write_wav(tmp_path / "yt_section.aac", 1.0)
+        path = ap.download_audio(URL, str(tmp_path), section=(0.0, 10.0))
+        assert path == str(tmp_path / "yt_section.m4a")
+        assert sorted(os.listdir(tmp_path)) == ["yt_section.m4a"]
+
+    def test_clip_is_cut_from_section_and_section_deleted(self, tmp_path, fake_yt_dlp):
+        _write_wav(tmp_path / "yt_section.webm", 1.0)
+        path = ap.download_audio_clip(URL, str(tmp_path), "01:00", "01:05")
+        assert path == str(tmp_path / "audio_trimmed.wav")
+        assert ap.wav_duration(path) == 5.0
+        assert os.listdir(tmp_path) == ["audio_trimmed.wav"]
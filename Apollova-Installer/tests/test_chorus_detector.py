@@ -0,0 +1,158 @@
+"""
+Tests for assets/scripts/chorus_detector.py
+
+Covers the shared SongFeatures analysis: serialisation, beat slicing for a
+trim window and the per-video feature cache in the artifact store (the
+librosa analysis itself is replaced with a fake), and the blocked k-NN
+recurrence scoring against a dense reference of librosa's affinity matrix
+and, where librosa is installed, against librosa.segment.recurrence_matrix.
+"""
+import sys
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from scripts import chorus_detector as cd
+
+URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+def _features():
+    return cd.SongFeatures(
+        duration=200.0, tempo=120.0,
+        beat_times=np.arange(0.25, 200.0, 0.5),
+        chroma=np.random.default_rng(0).random((12, 40)).astype(np.float32),
+        rms=np.linspace(0, 1, 40, dtype=np.float32),
+    )
+
+
+pytestmark = pytest.mark.usefixtures("isolated_store")
+
+
+class TestSongFeatures:
+    def test_beats_in_window_are_relative_to_start(self):
+        beats = _features().beats_in_window(60.0, 62.0)
+        assert beats == [0.25, 0.75, 1.25, 1.75]
+
+    def test_bytes_round_trip(self):
+        f = _features()
+        g = cd.SongFeatures.from_bytes(f.to_bytes())
+        assert (g.duration, g.tempo, g.sr, g.hop_length) == (f.duration, f.tempo, f.sr, f.hop_length)
+        np.testing.assert_array_equal(g.beat_times, f.beat_times)
+        np.testing.assert_array_equal(g.chroma, f.chroma)
+        np.testing.assert_array_equal(g.rms, f.rms)
+
+
+class TestFeatureCache:
+    def test_analysed_once_per_video(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(cd, "analyze_song", lambda path: calls.append(path) or _features())
+        assert not cd.has_song_features(URL)
+        cd.song_features("song.mp3", URL)
+        assert cd.has_song_features("https://youtu.be/dQw4w9WgXcQ")
+        cached = cd.song_features(None, "https://youtu.be/dQw4w9WgXcQ")
+        assert calls == ["song.mp3"]
+        assert cached.beats_in_window(10.0, 11.0) == [0.25, 0.75]
+
+    def test_no_url_is_not_cached(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(cd, "analyze_song", lambda path: calls.append(path) or _features())
+        cd.song_features("a.mp3")
+        cd.song_features("a.mp3", "not a youtube link")
+        assert len(calls) == 2
+        assert cd.load_song_features(None) is None
+
+    def test_key_does_not_need_audio_processing(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "scripts.audio_processing", MagicMock())
+        assert cd._features_key(URL) == cd._features_key("https://youtu.be/dQw4w9WgXcQ")
+        assert cd._features_key("https://example.com/watch?v=x") is None
+
+    def test_evicted_features_without_audio_raise(self, monkeypatch):
+        monkeypatch.setattr(cd, "analyze_song", lambda path: pytest.fail("no audio to analyse"))
+        with pytest.raises(cd.FeaturesNotCached):
+            cd.song_features(None, URL)
+
+
+def _dense_row_sums(data):
+    """Reference: full t x t recurrence_matrix(mode='affinity', metric='cosine', sym=True)."""
+    X = data.T.astype(np.float64)
+    t = len(X)
+    k = min(int(2 * np.ceil(np.sqrt(t - 1))), t - 1)
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    X = X / norms
+    D = np.clip(1 - X @ X.T, 0, 2)
+    np.fill_diagonal(D, np.inf)
+    rows = np.repeat(np.arange(t), k)
+    cols = np.argsort(D, axis=1)[:, :k].ravel()
+    A = np.zeros((t, t))
+    A[rows, cols] = D[rows, cols]
+    A = np.minimum(A, A.T)
+    bandwidth = np.median(A.max(axis=1)[A.max(axis=1) > 0])
+    return np.where(A > 0, np.exp(-A / bandwidth), 0).sum(axis=1)
+
+
+def _song_chroma(frames, seed):
+    rng = np.random.default_rng(seed)
+    parts = [rng.random((12, 40)) for _ in range(4)]
+    form = [0, 1, 2, 1, 2, 3, 1, 2, 2] * (frames // 360 + 1)
+    chroma = np.concatenate([parts[i] + 0.15 * rng.random((12, 40)) for i in form], axis=1)
+    return chroma[:, :frames]
+
+
+class TestRecurrenceRowSums:
+    @pytest.mark.parametrize("frames,block", [(200, 256), (900, 64), (1500, 256)])
+    def test_matches_dense_affinity_matrix(self, frames, block):
+        data = _song_chroma(frames, seed=frames)
+        fast = cd.recurrence_row_sums(data, block=block)
+        np.testing.assert_allclose(fast, _dense_row_sums(data), rtol=1e-9)
+
+    def test_same_chorus_peak_as_dense(self):
+        data = _song_chroma(1200, seed=3)
+        rms = np.ones(1200)
+        peak = np.argmax(cd._combined_score(cd.recurrence_row_sums(data), rms, cd._SR, cd._INTRO_SKIP))
+        dense_peak = np.argmax(cd._combined_score(_dense_row_sums(data), rms, cd._SR, cd._INTRO_SKIP))
+        assert peak == dense_peak
+
+    def test_degenerate_inputs(self):
+        assert cd.recurrence_row_sums(np.ones((12, 2))).tolist() == [0.0, 0.0]
+        assert not cd.recurrence_row_sums(np.ones((12, 50))).any()  # identical frames: no links
+
+
+class TestAgainstLibrosa:
+    """The blocked k-NN against librosa's own recurrence_matrix (pinned 0.10.2)."""
+
+    def test_same_chorus_result_as_recurrence_matrix(self, monkeypatch):
+        librosa = pytest.importorskip("librosa")
+        # Other test modules install a MagicMock torch; scipy's array-API
+        # helpers probe sys.modules["torch"] and fail on it
+        if isinstance(sys.modules.get("torch"), MagicMock):
+            monkeypatch.delitem(sys.modules, "torch")
+        y = cd._synthetic_song(2.5)
+        duration = len(y) / cd._SR
+        features = cd.SongFeatures(
+            duration=duration, tempo=120.0,
+            beat_times=np.arange(0.0, duration, 0.5),
+            chroma=librosa.feature.chroma_cqt(y=y, sr=cd._SR, hop_length=cd._HOP_LENGTH,
+                                              bins_per_octave=36),
+            rms=librosa.feature.rms(y=y, hop_length=cd._HOP_LENGTH)[0],
+        )
+        monkeypatch.setattr(cd, "song_features", lambda audio_path, source_url=None: features)
+
+        def dense_row_sums(data, block=None):
+            R = librosa.segment.recurrence_matrix(data, mode="affinity", metric="cosine", sym=True)
+            return np.asarray(R.sum(axis=1)).ravel()
+
+        stack = librosa.feature.stack_memory(features.chroma, n_steps=cd._N_STEPS,
+                                             delay=cd._DELAY, mode="edge")
+        # librosa accumulates in float32
+        np.testing.assert_allclose(cd.recurrence_row_sums(stack), dense_row_sums(stack),
+                                   rtol=1e-4)
+
+        fast = cd.detect_chorus("song.wav")
+        monkeypatch.setattr(cd, "recurrence_row_sums", dense_row_sums)
+        dense = cd.detect_chorus("song.wav")
+        assert fast.method == dense.method == "recurrence"
+        assert (fast.start_sec, fast.end_sec) == (dense.start_sec, dense.end_sec)
+        assert fast.confidence == pytest.approx(dense.confidence, rel=1e-4)
@@ -90,6 +90,14 @@ class TestConfig:
         assert not any("Unknown WHISPER_MODEL" in w for w in warnings)
         Config.WHISPER_MODEL = original
 
+    def test_validate_invalid_backend_resets_to_auto(self):
+        original = Config.WHISPER_BACKEND
+        Config.WHISPER_BACKEND = "whisper.cpp"
+        warnings = Config.validate()
+        assert Config.WHISPER_BACKEND == "auto"
+        assert any("WHISPER_BACKEND" in w for w in warnings)
+        Config.WHISPER_BACKEND = original
+
     def test_set_max_line_length(self):
         original = Config.MAX_LINE_LENGTH
         Config.set_max_line_length(50)
@@ -397,6 +405,72 @@ class TestWhisperCache:
         assert result is None
 
 
+class TestWhisperCacheV2:
+    """#51: versioned, columnar, compact whisper_raw.json."""
+
+    SEGMENTS = [
+        {"time": 0.0, "end_time": 2.0, "text": "hello world", "words": [
+            {"word": "hello", "start": 0.0, "end": 0.8, "probability": 0.91},
+            {"word": "world", "start": 0.9, "end": 1.6}]},
+        {"time": 2.5, "end_time": 3.0, "text": "no words"},
+        {"time": 3.0, "end_time": 4.0, "text": "empty", "words": []},
+    ]
+
+    def test_words_stored_as_columns_without_indent(self, tmp_path):
+        save_whisper_cache(str(tmp_path), self.SEGMENTS)
+        text = (tmp_path / "whisper_raw.json").read_text(encoding="utf-8")
+        assert "\n" not in text
+        raw = json.loads(text)
+        assert raw["version"] == 2
+        assert raw["words"]["counts"] == [2, None, 0]
+        assert raw["words"]["probability"] == [0.91, None]
+        assert all("words" not in seg for seg in raw["segments"])
+
+    def test_roundtrip_restores_word_dicts(self, tmp_path):
+        save_whisper_cache(str(tmp_path), self.SEGMENTS)
+        loaded = load_whisper_cache(str(tmp_path))
+        assert loaded[0]["words"] == self.SEGMENTS[0]["words"]
+        assert "words" not in loaded[1]
+        assert loaded[2]["words"] == []
+
+    def test_words_false_skips_materialisation(self, tmp_path):
+        save_whisper_cache(str(tmp_path), self.SEGMENTS)
+        loaded = load_whisper_cache(str(tmp_path), words=False)
+        assert [seg["text"] for seg in loaded] == ["hello world", "no words", "empty"]
+        assert all("words" not in seg for seg in loaded)
+
+    def test_v1_inline_words_still_load(self, tmp_path):
+        v1 = {"model": Config.WHISPER_MODEL, "segments": [
+            {"start": 0.0, "end": 1.0, "text": "old",
+             "words": [{"word": "old", "start": 0.0, "end": 1.0}]}]}
+        (tmp_path / "whisper_raw.json").write_text(json.dumps(v1, indent=2))
+        loaded = load_whisper_cache(str(tmp_path))
+        assert loaded[0]["words"] == v1["segments"][0]["words"]
+
+    def test_non_dict_row_keeps_later_words_aligned(self, tmp_path):
+        save_whisper_cache(str(tmp_path), self.SEGMENTS)
+        path = tmp_path / "whisper_raw.json"
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        # A corrupted first row still owns its two words in the columns
+        raw["segments"][0] = "garbage"
+        raw["segments"].append({"start": 4.0, "end": 5.0, "text": "late"})
+        raw["words"]["counts"].append(1)
+        for col in ("word", "start", "end", "probability"):
+            raw["words"][col].append({"word": "late", "start": 4.0,
+                                      "end": 5.0, "probability": None}[col])
+        path.write_text(json.dumps(raw))
+        loaded = load_whisper_cache(str(tmp_path))
+        assert [w["word"] for w in loaded[-1]["words"]] == ["late"]
+
+    def test_backend_mismatch_returns_none(self, tmp_path, monkeypatch, capsys):
+        save_whisper_cache(str(tmp_path), self.SEGMENTS)
+        path = tmp_path / "whisper_raw.json"
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        raw["backend"] = "not-" + str(Config.WHISPER_BACKEND)
+        path.write_text(json.dumps(raw))
+        assert load_whisper_cache(str(tmp_path)) is None
+
+
 # ===========================================================================
 # Composition: fix_marker_gaps + spread_clustered_words — 10 tests
 # ===========================================================================
@@ -0,0 +1,158 @@
+"""
+Tests for assets/scripts/discovery_executor.py
+
+Covers the staged discovery run: outcomes in track order whatever order the
+songs finish in, the per-track statuses, skipping downloads for cached
+features (and downloading after all when they were evicted), temp-folder
+cleanup, cancellation and the spawn process pool, including a chorus process
+that is killed mid-song.
+"""
+import os
+import signal
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+import pytest
+
+from scripts import discovery_executor as de
+from scripts.chorus_detector import ChorusResult, FeaturesNotCached
+
+
+@dataclass
+class Track:
+    title: str
+    duration_sec_safe: float = 200.0
+
+    @property
+    def db_title(self):
+        return f"Artist - {self.title}"
+
+
+@dataclass
+class YT:
+    url: str
+    confidence: str = "high"
+
+
+def _find(track):
+    if track.title.startswith("missing"):
+        return None
+    time.sleep(0.05 if track.title.endswith("slow") else 0)
+    return YT(f"https://youtu.be/{track.title}")
+
+
+def _killed_chorus_job(audio_path, source_url):
+    """Runs in the spawned chorus process: dies like an OOM kill would."""
+    os.kill(os.getpid(), signal.SIGKILL)
+
+
+def _run(tracks, monkeypatch, download=None, cancel=None, **kw):
+    folders, progress = [], []
+
+    def fake_download(url, folder):
+        folders.append(folder)
+        path = os.path.join(folder, "song.mp3")
+        open(path, "wb").close()
+        return path
+
+    def fake_chorus(audio_path, source_url):
+        if "bad" in source_url:
+            raise RuntimeError("no beats")
+        if audio_path is None and "evicted" in source_url:
+            raise FeaturesNotCached(source_url)
+        return ChorusResult(30.0, 90.0, 0.8, "recurrence")
+
+    monkeypatch.setattr(de, "_chorus_job", fake_chorus)
+    kw.setdefault("has_features", lambda url: "cached" in url)
+    out = de.run_discovery(
+        tracks, _find, download or fake_download, cancel or threading.Event(),
+        progress_cb=lambda *a: progress.append(a), network_workers=3,
+        processes=0, **kw)
+    return out, folders, progress
+
+
+class TestRunDiscovery:
+    def test_outcomes_in_track_order_with_statuses(self, monkeypatch, capsys):
+        tracks = [Track("a-slow"), Track("missing"), Track("bad"), Track("cached"), Track("b")]
+        out, folders, _ = _run(tracks, monkeypatch)
+        assert [o.index for o in out] == [0, 1, 2, 3, 4]
+        assert [o.status for o in out] == ["ready", "no_youtube", "chorus_failed", "ready", "ready"]
+        assert out[0].chorus.start_sec == 30.0 and out[0].yt_result.url.endswith("a-slow")
+        # the cached song is never downloaded, and every download folder is removed
+        assert len(folders) == 3
+        assert not any(os.path.exists(f) for f in folders)
+
+    def test_progress_streams_for_every_track(self, monkeypatch, capsys):
+        tracks = [Track(f"t{n}") for n in range(6)]
+        _, _, progress = _run(tracks, monkeypatch)
+        youtube = [p[1] for p in progress if p[0] == "youtube"]
+        chorus = [p[1] for p in progress if p[0] == "chorus"]
+        assert youtube == chorus == [1, 2, 3, 4, 5, 6]
+        assert all(p[2] == 6 for p in progress)
+
+    def test_evicted_features_fall_back_to_download(self, monkeypatch, capsys):
+        tracks = [Track("cached-evicted"), Track("cached")]
+        out, folders, _ = _run(tracks, monkeypatch)
+        assert [o.status for o in out] == ["ready", "ready"]
+        assert len(folders) == 1
+        assert "Chorus detection failed" not in capsys.readouterr().out
+
+    def test_download_failure_is_chorus_failed(self, monkeypatch, capsys):
+        def broken(url, folder):
+            raise OSError("HTTP 403")
+        out, _, _ = _run([Track("x")], monkeypatch, download=broken)
+        assert out[0].status == "chorus_failed" and out[0].yt_result is not None
+
+    def test_cancel_stops_remaining_tracks(self, monkeypatch, capsys):
+        cancel = threading.Event()
+        folders = []
+
+        def slow_download(url, folder):
+            folders.append(folder)
+            if url.endswith("t0"):
+                cancel.set()
+            time.sleep(0.1)
+            return os.path.join(folder, "song.mp3")
+
+        tracks = [Track(f"t{n}") for n in range(20)]
+        out, _, _ = _run(tracks, monkeypatch, download=slow_download, cancel=cancel)
+        assert len(out) < 20
+        time.sleep(0.3)  # in-flight downloads clean up after themselves
+        assert len(folders) <= 3
+        assert not any(os.path.exists(f) for f in folders)
+
+    def test_process_pool_reports_child_errors(self, tmp_path, capsys):
+        # librosa may be missing here: either way the spawned worker's result
+        # (or its exception) must come back through the pool callbacks
+        audio = tmp_path / "song.mp3"
+        audio.write_bytes(b"")
+        out = de.run_discovery(
+            [Track("p")], _find, lambda url, folder: str(audio), threading.Event(),
+            network_workers=1, processes=1, has_features=lambda url: False)
+        assert len(out) == 1 and out[0].status in ("ready", "chorus_failed")
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="SIGKILL is POSIX-only")
+    def test_killed_chorus_process_fails_tracks_instead_of_hanging(
+            self, tmp_path, monkeypatch, capsys):
+        monkeypatch.setattr(de, "_chorus_job", _killed_chorus_job)
+        audio = tmp_path / "song.mp3"
+        audio.write_bytes(b"")
+        result = []
+        run = threading.Thread(target=lambda: result.extend(de.run_discovery(
+            [Track("p"), Track("q")], _find, lambda url, folder: str(audio),
+            threading.Event(), network_workers=1, processes=1,
+            has_features=lambda url: False)), daemon=True)
+        run.start()
+        run.join(timeout=120)
+        assert not run.is_alive()
+        assert [o.status for o in result] == ["chorus_failed", "chorus_failed"]
+
+
+def test_chorus_processes_from_config(monkeypatch):
+    monkeypatch.setattr(de.Config, "DISCOVERY_CHORUS_PROCESSES", 3)
+    assert de.chorus_processes() == 3
+    assert de.chorus_processes(tracks=2) == 2
+    monkeypatch.setattr(de.Config, "DISCOVERY_CHORUS_PROCESSES", 0)
+    assert 1 <= de.chorus_processes() <= 4
@@ -0,0 +1,200 @@
+"""
+Tests for assets/scripts/lyric_alignment.py
+
+Covers the pruned sliding-window search (#47) against a plain full scan of
+every candidate window, the banded DP line matcher (#48) and the end-to-end
+Genius alignment contract.
+"""
+import random
+
+from rapidfuzz import fuzz
+
+from scripts import lyric_alignment as la
+
+
+def _full_scan(segments, genius_lines, key):
+    """Reference: score every window with no pruning (pre-#47 behaviour)."""
+    whisper_block = " ".join(la._clean_for_match(s[key]) for s in segments)
+    if not whisper_block.strip():
+        return None
+    num_segs, num_genius = len(segments), len(genius_lines)
+    best_score, best_start = -1, 0
+    for start in range(num_genius):
+        for ws in range(max(1, num_segs - 4), min(num_genius, num_segs + 8) + 1):
+            end = start + ws
+            if end > num_genius:
+                break
+            block = " ".join(la._clean_for_match(genius_lines[i]) for i in range(start, end))
+            if not block:
+                continue
+            combined = (fuzz.ratio(whisper_block, block) * 0.5
+                        + fuzz.token_sort_ratio(whisper_block, block) * 0.25
+                        + fuzz.partial_ratio(whisper_block, block) * 0.25)
+            if combined > 95:
+                return start
+            if combined > best_score:
+                best_score, best_start = combined, start
+    return None if best_score < 35 else best_start
+
+
+VOCAB = ("love you baby night light fire heart take me home tonight "
+         "we are young run away dance slow down never let go oh yeah").split()
+
+
+def _line(rng):
+    return " ".join(rng.choice(VOCAB) for _ in range(rng.randint(1, 7))) + rng.choice(["", ",", "!"])
+
+
+class TestFindLyricsWindow:
+    def test_matches_full_scan_on_random_songs(self, capsys):
+        rng = random.Random(7)
+        for _ in range(60):
+            chorus = [_line(rng) for _ in range(3)]
+            lines = []
+            for _ in range(rng.randint(3, 6)):
+                lines += chorus if rng.random() < 0.4 else [_line(rng) for _ in range(4)]
+                if rng.random() < 0.3:
+                    lines.append("!!!")     # cleans to an empty line
+            a = rng.randrange(len(lines))
+            segments = [{"text": ln if rng.random() < 0.7 else _line(rng)}
+                        for ln in lines[a:a + rng.randint(1, 16)]]
+            assert la._find_lyrics_window(segments, lines, "text") == \
+                _full_scan(segments, lines, "text")
+
+    def test_exact_excerpt_found(self, capsys):
+        lines = [f"line number {w} of the song" for w in
+                 "one two three four five six seven eight nine ten".split()]
+        segments = [{"text": ln} for ln in lines[4:8]]
+        assert la._find_lyrics_window(segments, lines, "text") == 4
+
+    def test_unrelated_text_rejected(self, capsys):
+        lines = ["aaaa bbbb cccc", "dddd eeee ffff", "gggg hhhh iiii"]
+        assert la._find_lyrics_window([{"text": "xyz qrs"}], lines, "text") is None
+
+    def test_precomputed_clean_lines_used(self, capsys):
+        lines = ["Hello, World!", "Second LINE"]
+        clean = [la._clean_for_match(ln) for ln in lines]
+        segments = [{"text": "hello world"}]
+        assert la._find_lyrics_window(segments, lines, "text", clean) == \
+            la._find_lyrics_window(segments, lines, "text")
+
+
+class TestAlignGeniusToWhisper:
+    def test_replaces_segment_text_with_genius_lines(self, capsys):
+        genius = "[Verse 1]\nI walk the lonely road\nThe only one that I have ever known"
+        segments = [{"lyric_current": "i walk the lonly road"},
+                    {"lyric_current": "the only one that i have ever know"}]
+        out, ratio = la.align_genius_to_whisper(segments, genius)
+        assert ratio == 1.0
+        assert out[0]["lyric_current"] == "I walk the lonely road"
+
+    def test_no_genius_text_is_noop(self, capsys):
+        segments = [{"lyric_current": "words"}]
+        assert la.align_genius_to_whisper(segments, None) == (segments, 0.0)
+
+
+# ===========================================================================
+# Banded global alignment (#48)
+# ===========================================================================
+
+LINES = ["walking down the empty street", "neon lights are calling me",
+         "every corner knows my name", "but nobody stays the same",
+         "hold me close tonight", "never let me go"]
+
+
+def _dense_dp(texts, genius_lines, window_start):
+    """Reference: full (segments+1) x (lines+1) tables, _match_score repeat scan."""
+    clean = [la._clean_for_match(ln) for ln in genius_lines]
+    rows = [(k, la._clean_for_match(t)) for k, t in enumerate(texts) if t.strip()]
+    rows = [(k, c) for k, c in rows if c]
+    n, g = len(rows), len(clean)
+    if not rows or not g:
+        return list(texts)
+    neg = float("-inf")
+    score = [[0.0] * (g + 1)] + [[neg] * (g + 1) for _ in range(n)]
+    move = [[0] * (g + 1) for _ in range(n + 1)]
+    for i in range(1, n + 1):
+        center = min(window_start + i, g)
+        for j in range(max(1, center - la.DP_BAND), min(g, center + la.DP_BAND) + 1):
+            best, step = score[i - 1][j], 0
+            if score[i][j - 1] - la.DP_LINE_SKIP_PENALTY > best:
+                best, step = score[i][j - 1] - la.DP_LINE_SKIP_PENALTY, 1
+            m = la._match_score(rows[i - 1][1], clean[j - 1])
+            if m >= 50 and score[i - 1][j - 1] + m - 49 > best:
+                best, step = score[i - 1][j - 1] + m - 49, 2
+            score[i][j], move[i][j] = best, step
+    pairs, i = {}, n
+    j = max(range(g + 1), key=score[n].__getitem__)
+    while i > 0:
+        if move[i][j] == 2:
+            pairs[i - 1] = j - 1
+            i, j = i - 1, j - 1
+        elif move[i][j] == 1:
+            j -= 1
+        else:
+            i -= 1
+    out = list(texts)
+    for r, (k, c) in enumerate(rows):
+        j = pairs.get(r)
+        if j is None:
+            line_scores = [la._match_score(c, ln) for ln in clean]
+            j = max(range(g), key=line_scores.__getitem__)
+            if line_scores[j] < la.DP_REPEAT_SCORE:
+                continue
+        out[k] = genius_lines[j]
+    return out
+
+
+class TestBandedDP:
+    @staticmethod
+    def _align(texts, genius_lines=LINES, window_start=0):
+        segments = [{"text": t} for t in texts]
+        out, matched, total = la._align_banded_dp(segments, genius_lines, window_start, "text")
+        return [s["text"] for s in out], matched, total
+
+    def test_noisy_lines_map_in_order(self, capsys):
+        texts, matched, total = self._align(["walkin down the empty street",
+                                             "neon light calling me",
+                                             "every corner know my name"])
+        assert texts == LINES[:3]
+        assert (matched, total) == (3, 3)
+
+    def test_junk_segment_kept_and_order_recovered(self, capsys):
+        texts, matched, total = self._align(["walking down the empty street",
+                                             "zzzz qqqq",
+                                             "but nobody stays the same",
+                                             "hold me close tonight"])
+        assert texts == [LINES[0], "zzzz qqqq", LINES[3], LINES[4]]
+        assert (matched, total) == (3, 4)
+
+    def test_unwritten_chorus_repeat_reuses_line(self, capsys):
+        texts, matched, _ = self._align(["hold me close tonight", "never let me go",
+                                         "hold me close tonight"], window_start=4)
+        assert texts == [LINES[4], LINES[5], LINES[4]]
+        assert matched == 3
+
+    def test_blank_segments_not_counted(self, capsys):
+        _, matched, total = self._align(["", "   ", "never let me go"], window_start=5)
+        assert (matched, total) == (1, 1)
+
+    def test_mode_from_config(self, monkeypatch, capsys):
+        calls = []
+        monkeypatch.setattr(la, "_align_banded_dp",
+                            lambda segs, *a: calls.append("dp") or (segs, len(segs), len(segs)))
+        monkeypatch.setattr(la.Config, "LYRIC_ALIGN_MODE", "dp")
+        genius = "\n".join(LINES)
+        _, ratio = la.align_genius_to_whisper([{"lyric_current": ln} for ln in LINES[:3]], genius)
+        assert calls == ["dp"] and ratio == 1.0
+        la.align_genius_to_whisper([{"lyric_current": ln} for ln in LINES[:3]], genius,
+                                   mode="greedy")
+        assert calls == ["dp"]
+
+    def test_matches_dense_tables_on_random_songs(self, capsys):
+        rng = random.Random(11)
+        for _ in range(80):
+            lines = [_line(rng) if rng.random() > 0.05 else "" for _ in range(rng.randint(1, 60))]
+            start = rng.randrange(len(lines))
+            texts = [lines[max(0, min(len(lines) - 1, start + k + rng.randint(-2, 3)))]
+                     if rng.random() < 0.7 else _line(rng) for k in range(rng.randint(1, 30))]
+            got, _, _ = self._align(texts, lines, start)
+            assert got == _dense_dp(texts, lines, start)
@@ -2,9 +2,11 @@
 Tests for marker operations in assets/scripts/whisper_common.py
 
 Covers: fix_marker_gaps, merge_short_markers, quality_gate, assign_colors,
-        rebuild_words_after_alignment, build_markers_from_segments.
+        rebuild_words_after_alignment, build_markers_from_segments,
+        MarkerTable (#49).
 """
 import sys
+import json
 import copy
 from unittest.mock import MagicMock
 
@@ -28,6 +30,9 @@ from scripts.whisper_common import (
     assign_colors,
     rebuild_words_after_alignment,
     build_markers_from_segments,
+    compute_quality_score,
+    spread_clustered_words,
+    MarkerTable,
     MARKER_GAP_THRESHOLD_SEC,
 )
 
@@ -908,3 +913,89 @@ class TestBuildMarkersFromSegments:
         result = build_markers_from_segments([seg])
         # Should be rounded to 3 decimal places
         assert result[0]["time"] == round(1.12345, 3)
+
+
+# ===========================================================================
+# MarkerTable (#49)
+# ===========================================================================
+
+def _table_markers():
+    return [
+        {"time": 0.0, "text": "oh", "words": [{"word": "oh", "start": 0.0, "end": 0.4}],
+         "color": "", "end_time": 0.5, "avg_logprob": -0.3},
+        {"time": 1.0, "text": "hold me close", "words": [
+            {"word": "hold", "start": 1.0, "end": 1.2, "probability": 0.9},
+            {"word": "me", "start": 1.0, "end": 1.2, "probability": 0.8},
+            {"word": "close", "start": 7.0, "end": 7.5, "probability": 0.7}],
+         "color": "", "end_time": 8.0},
+        {"time": 9.0, "text": "never let me go tonight", "words": [],
+         "color": "", "end_time": 11.0, "no_speech_prob": 0.1},
+    ]
+
+
+class TestMarkerTable:
+    def test_round_trip_preserves_dict_shape(self):
+        markers = _table_markers()
+        assert MarkerTable.from_markers(markers).to_markers() == markers
+
+    def test_round_trip_keeps_missing_keys_and_ints(self):
+        markers = [
+            {"time": 1, "text": "a b", "color": "", "end_time": 3,
+             "words": [{"word": "a", "start": 1.0}, {"word": "b", "end": 2},
+                       {"word": "c", "start": 2, "end": 2.5, "probability": 1}]},
+            {"text": "no time", "color": "", "words": []},
+        ]
+        out = MarkerTable.from_markers(markers).to_markers()
+        assert out == markers
+        assert type(out[0]["time"]) is int and type(out[0]["end_time"]) is int
+        assert type(out[0]["words"][2]["start"]) is int
+        json.dumps(out, allow_nan=False)   # no NaN stand-ins leak out
+
+    def test_moved_value_replaces_original(self):
+        table = MarkerTable.from_markers(_table_markers())
+        table.word_start[0] = 0.25
+        assert table.to_markers()[0]["words"][0]["start"] == 0.25
+
+    def test_snapshot_is_independent(self):
+        table = MarkerTable.from_markers(_table_markers())
+        snap = table.snapshot()
+        table.word_start[:] = 99.0
+        table.text[0] = "changed"
+        assert snap.to_markers() == _table_markers()
+
+    def test_chain_matches_dict_functions(self, capsys):
+        markers = merge_short_markers(_table_markers())
+        assign_colors(markers)
+        fix_marker_gaps(markers)
+        spread_clustered_words(markers)
+
+        table = MarkerTable.from_markers(_table_markers()).merge_short()
+        table.assign_colors()
+        table.fix_gaps()
+        table.spread_clusters()
+        assert table.to_markers() == markers
+        assert table.quality_score() == compute_quality_score(markers)
+
+    def test_fix_gaps_never_crosses_markers(self):
+        markers = [
+            {"time": 0.0, "text": "a", "words": [{"word": "a", "start": 0.0, "end": 0.5}],
+             "color": "", "end_time": 0.5},
+            {"time": 10.0, "text": "b", "words": [{"word": "b", "start": 10.0, "end": 10.5}],
+             "color": "", "end_time": 10.5},
+        ]
+        table = MarkerTable.from_markers(markers)
+        assert not table.fix_gaps().any()
+        assert table.word_start.tolist() == [0.0, 10.0]
+
+    def test_spread_reports_only_clustered_words(self):
+        table = MarkerTable.from_markers(_table_markers())
+        changed = table.spread_clusters()
+        assert changed.tolist() == [False, True, True, False]
+        assert table.word_start.tolist()[1:3] == [1.0, 4.0]
+
+    def test_write_back_touches_only_changed_words(self):
+        markers = _table_markers()
+        untouched = markers[1]["words"][2]
+        fix_marker_gaps(markers)
+        assert markers[1]["words"][2] is untouched
+        assert untouched["start"] == pytest.approx(1.2 + 0.5)
@@ -0,0 +1,539 @@
+"""
+Tests for assets/scripts/transcribe_pool.py, the parallel multi-pass
+selection (#40) and the VAD-split chunked mode (#41) in whisper_common.
+
+No real process pool is started: submit_passes/submit_chunks are replaced
+with fake jobs so only the selection, planning and stitching logic and the
+in-child pass runner are exercised.
+"""
+import sys
+import types
+import multiprocessing as mp
+from unittest.mock import MagicMock
+
+# ---------------------------------------------------------------------------
+# Mock heavy dependencies BEFORE importing whisper_common
+# ---------------------------------------------------------------------------
+sys.modules.setdefault("stable_whisper", MagicMock())
+sys.modules.setdefault("torch", MagicMock())
+sys.modules.setdefault("pydub", MagicMock())
+sys.modules.setdefault("pydub.playback", MagicMock())
+sys.modules.setdefault("scripts.audio_processing", MagicMock())
+
+import numpy as np
+import pytest
+
+from scripts import whisper_common as wc
+from scripts import transcribe_pool as tp
+
+
+PASSES = [
+    {"name": "Pass 1 (strict)", "weight": 1.0, "params": {"temperature": 0}},
+    {"name": "Pass 2 (medium)", "weight": 0.9, "params": {"temperature": 0.2}},
+    {"name": "Pass 3 (loose)", "weight": 0.75, "params": {"temperature": 0.4}},
+    {"name": "Pass 4 (no prompt)", "weight": 0.6, "params": {"temperature": 0.6}},
+]
+for _i, _p in enumerate(PASSES):
+    _p["index"], _p["regroup"] = _i, False
+
+
+class _Job:
+    def __init__(self, out=None, error=None):
+        self.out, self.error = out, error
+
+    def get(self, timeout=None):
+        if self.error:
+            raise self.error
+        return self.out
+
+
+class _Result:
+    def __init__(self, segments):
+        self.segments = segments
+
+    def to_dict(self):
+        return {"segments": self.segments}
+
+    def regroup(self):
+        return self
+
+
+class _Regrouped(_Result):
+    """Regrouping splits every segment in two."""
+    def regroup(self):
+        self.segments = [half for s in self.segments for half in (s, s)]
+        return self
+
+
+def _out(count):
+    return {"result": {"segments": ["x"] * count} if count else None, "time": 1.0}
+
+
+@pytest.fixture
+def fake_results(monkeypatch):
+    """Results are _Result segment lists; no refinement or silence snapping."""
+    monkeypatch.setattr(wc, "_result_from_dict", lambda d: _Result(d["segments"]))
+    monkeypatch.setattr(wc, "_refine_result", lambda result: None)
+    monkeypatch.setattr(wc, "count_segments", lambda result: len(result.segments))
+    monkeypatch.setattr(wc, "_snap_to_silence", lambda result, audio: None)
+
+
+@pytest.fixture
+def run_parallel(monkeypatch, isolated_store, fake_results):
+    cancelled = []
+    monkeypatch.setattr(tp, "cancel_all", lambda: cancelled.append(True))
+
+    def run(jobs, min_expected, submitted=None):
+        def submit(samples, params):
+            if submitted is not None:
+                submitted.append([p["temperature"] for p in params])
+            return jobs[-len(params):]
+        monkeypatch.setattr(tp, "submit_passes", submit)
+        audio = types.SimpleNamespace(samples=np.zeros(10), path=None)
+        result, idx = wc._multi_pass_parallel(audio, PASSES, min_expected)
+        return result, idx, cancelled
+    return run
+
+
+class TestParallelSelection:
+    def test_first_sufficient_pass_in_priority_order(self, run_parallel):
+        # Pass 3 also qualifies, but pass 2 comes first — same as sequential
+        jobs = [_Job(_out(3)), _Job(_out(10)), _Job(_out(20)), _Job(_out(1))]
+        result, idx, cancelled = run_parallel(jobs, min_expected=8)
+        assert idx == 1
+        assert len(result.segments) == 10
+        assert cancelled == [True]
+
+    def test_best_weighted_when_none_sufficient(self, run_parallel):
+        # 5*1.0=5 vs 6*0.75=4.5 vs 7*0.6=4.2 -> pass 1 wins on weighted score
+        jobs = [_Job(_out(5)), _Job(_out(0)), _Job(_out(6)), _Job(_out(7))]
+        _, idx, _ = run_parallel(jobs, min_expected=20)
+        assert idx == 0
+
+    def test_failed_pass_is_skipped(self, run_parallel):
+        jobs = [_Job(error=RuntimeError("boom")), _Job(_out(9)), _Job(_out(1)), _Job(_out(1))]
+        _, idx, _ = run_parallel(jobs, min_expected=8)
+        assert idx == 1
+
+    def test_time_cap_returns_best_so_far(self, run_parallel):
+        jobs = [_Job(_out(4)), _Job(error=mp.TimeoutError()), _Job(_out(50)), _Job(_out(50))]
+        _, idx, cancelled = run_parallel(jobs, min_expected=8)
+        assert idx == 0
+        assert cancelled == [True]
+
+    def test_checkpointed_passes_are_not_resubmitted(self, run_parallel):
+        submitted = []
+        jobs = [_Job(_out(3)), _Job(_out(0)), _Job(None), _Job(error=RuntimeError("boom"))]
+        run_parallel(jobs, min_expected=20, submitted=submitted)
+        # Passes 1 and 2 finished; pass 3 was cancelled and pass 4 failed
+        jobs = [_Job(_out(9)), _Job(_out(1))]
+        result, idx, _ = run_parallel(jobs, min_expected=8, submitted=submitted)
+        assert submitted == [[0, 0.2, 0.4, 0.6], [0.4, 0.6]]
+        assert idx == 2 and len(result.segments) == 9
+
+
+class _Seg:
+    def __init__(self, text):
+        self.text = text
+
+
+class TestRunPass:
+    def _fake_backend(self, monkeypatch, segments, seen):
+        class Backend:
+            def transcribe(self, model, samples, progress_callback=None, **params):
+                seen.append(params)
+                progress_callback(seek=0, total=60)
+                return types.SimpleNamespace(
+                    segments=[_Seg(t) for t in segments],
+                    to_dict=lambda: {"segments": segments})
+
+        monkeypatch.setattr(wc, "load_whisper_model", lambda force_cpu=False: "model")
+        monkeypatch.setattr(wc, "_active_backend", lambda: Backend())
+        monkeypatch.setattr(wc, "_refine_result",
+                            lambda result: pytest.fail("refined in the pool"))
+
+    def test_returns_raw_picklable_summary(self, monkeypatch):
+        seen = []
+        self._fake_backend(monkeypatch, ["hello there", "x", "again"], seen)
+        monkeypatch.setattr(tp, "_child_generation", types.SimpleNamespace(value=3))
+        out = tp._run_pass(3, np.zeros(10), {"temperature": 0.2})
+        # Regrouping, refinement and the count are per template, in the parent
+        assert set(out) == {"result", "time"}
+        assert out["result"] == {"segments": ["hello there", "x", "again"]}
+        assert seen == [{"temperature": 0.2}]
+
+    def test_cancelled_generation_returns_none(self, monkeypatch):
+        seen = []
+        self._fake_backend(monkeypatch, ["hello"], seen)
+        monkeypatch.setattr(tp, "_child_generation", types.SimpleNamespace(value=4))
+        assert tp._run_pass(3, np.zeros(10), {}) is None
+        assert seen == []
+
+
+def test_pool_threads_split_cores(monkeypatch):
+    monkeypatch.setattr(tp.Config, "WHISPER_POOL_THREADS", 0)
+    monkeypatch.setattr(tp.os, "cpu_count", lambda: 32)
+    assert tp.pool_threads(4) == 8
+    monkeypatch.setattr(tp.Config, "WHISPER_POOL_THREADS", 3)
+    assert tp.pool_threads(4) == 3
+
+
+# ===========================================================================
+# VAD-split chunked transcription (#41)
+# ===========================================================================
+
+class TestPlanChunks:
+    def test_cuts_at_silence_midpoints_near_targets(self):
+        silences = [(14.0, 15.0), (29.0, 31.0), (44.5, 45.5), (50.0, 51.0)]
+        spans = wc.plan_chunks(60.0, silences, n_chunks=4, min_chunk_sec=10)
+        assert spans == [(0.0, 14.5), (14.5, 30.0), (30.0, 45.0), (45.0, 60.0)]
+
+    def test_short_clip_not_split(self):
+        assert wc.plan_chunks(15.0, [(7.0, 8.0)], 4, 10) == [(0.0, 15.0)]
+
+    def test_no_silence_not_split(self):
+        assert wc.plan_chunks(60.0, [], 4, 10) == [(0.0, 60.0)]
+
+    def test_min_chunk_respected(self):
+        spans = wc.plan_chunks(60.0, [(3.0, 4.0), (29.0, 31.0)], 2, 10)
+        assert spans == [(0.0, 30.0), (30.0, 60.0)]
+        assert all(b - a >= 10 for a, b in spans)
+
+
+class TestStitch:
+    def test_offsets_applied_to_segments_and_words(self):
+        chunk_a = {"language": "en", "text": " one", "segments": [
+            {"id": 0, "start": 1.0, "end": 2.0, "text": " one",
+             "words": [{"word": " one", "start": 1.0, "end": 2.0, "probability": 0.9}]}]}
+        chunk_b = {"language": "en", "text": " two", "segments": [
+            {"id": 0, "start": 0.5, "end": 1.5, "text": " two",
+             "words": [{"word": " two", "start": 0.5, "end": 1.5, "probability": 0.8}]}],
+            "nonspeech_sections": [{"start": 0.0, "end": 0.5}]}
+        merged = wc.stitch_chunk_results([chunk_a, None, chunk_b], [0.0, 14.5, 30.0])
+        assert [s["id"] for s in merged["segments"]] == [0, 1]
+        second = merged["segments"][1]
+        assert (second["start"], second["end"]) == (30.5, 31.5)
+        assert second["words"][0]["start"] == 30.5
+        assert second["words"][0]["probability"] == 0.8
+        assert merged["text"] == " one two"
+        assert merged["nonspeech_sections"] == [{"start": 30.0, "end": 30.5}]
+        # Inputs are not mutated
+        assert chunk_b["segments"][0]["start"] == 0.5
+
+    def test_transcribe_chunked_slices_and_stitches(self, monkeypatch):
+        sent = []
+
+        def submit_chunks(slices, params):
+            sent.extend(len(s) for s in slices)
+            return [_Job({"result": {"segments": [
+                {"start": 0.0, "end": 1.0, "text": f" c{i}"}]}, "time": 0})
+                for i in range(len(slices))]
+
+        monkeypatch.setattr(tp, "submit_chunks", submit_chunks)
+        monkeypatch.setattr(tp, "cancel_all", lambda: None)
+        monkeypatch.setattr(wc, "_result_from_dict", lambda d: d)
+        audio = types.SimpleNamespace(samples=np.zeros(100), sample_rate=10)
+        result = wc.transcribe_chunked(audio, [(0.0, 4.0), (4.0, 10.0)], {})
+        assert sent == [40, 60]
+        assert [s["start"] for s in result["segments"]] == [0.0, 4.0]
+
+
+def test_energy_gate_fallback_finds_gap(monkeypatch):
+    fake = types.ModuleType("stable_whisper.stabilization")
+    monkeypatch.setitem(sys.modules, "stable_whisper.stabilization", fake)
+    sr = 100
+    samples = np.concatenate([np.full(300, 0.5), np.zeros(200), np.full(300, 0.5)])
+    audio = types.SimpleNamespace(samples=samples, sample_rate=sr)
+    assert wc.detect_silences(audio) == [(3.0, 5.0)]
+
+
+# ===========================================================================
+# Cross-song batch transcription (#42)
+# ===========================================================================
+
+class TestBatchTranscribe:
+    @pytest.fixture(autouse=True)
+    def _fakes(self, monkeypatch, isolated_store, isolated_song_db, fake_results):
+        monkeypatch.setattr(wc.Config, "TRANSCRIBE_WORKER", False)
+        monkeypatch.setattr(wc, "get_device_info", lambda: "GPU")
+        monkeypatch.setattr(wc, "load_whisper_model", lambda force_cpu=False: "model")
+        monkeypatch.setattr(wc, "clear_vram", lambda: None)
+        monkeypatch.setattr(wc, "_prepare_audio", lambda audio, from_demucs=False: audio)
+        monkeypatch.setattr(wc, "_pretranscribed", {})
+
+    @staticmethod
+    def _song(n, label):
+        return {"audio": types.SimpleNamespace(samples=np.full(10, float(n)), path=None),
+                "prompt": None, "duration": None, "language": "en", "label": label}
+
+    def test_only_unsatisfied_songs_rerun(self, monkeypatch):
+        calls = []
+        per_song = {0.0: 1, 1.0: 5}   # song 0 stays below min_expected (2)
+
+        class Backend:
+            def transcribe(self, model, samples, **params):
+                calls.append((samples[0], params["temperature"]))
+                return _Result(["s"] * per_song[samples[0]])
+
+        monkeypatch.setattr(wc, "_active_backend", lambda: Backend())
+        outcomes = wc.batch_transcribe([self._song(0, "weak"), self._song(1, "good")])
+        assert [c[0] for c in calls] == [0.0, 1.0, 0.0, 0.0, 0.0]
+        assert [idx for _, idx in outcomes] == [0, 0]
+        assert len(outcomes[1][0].segments) == 5
+
+    def test_checkpointed_passes_not_rerun(self, monkeypatch):
+        calls = []
+        per_song = {0.0: 1, 1.0: 5}
+
+        class Result:
+            def __init__(self, segments):
+                self.segments = segments
+
+            def to_dict(self):
+                return {"segments": self.segments}
+
+        class Backend:
+            def transcribe(self, model, samples, **params):
+                calls.append((samples[0], params["temperature"]))
+                return Result(["s"] * per_song[samples[0]])
+
+        monkeypatch.setattr(wc, "_active_backend", lambda: Backend())
+        monkeypatch.setattr(wc, "_result_from_dict", lambda d: Result(d["segments"]))
+        songs = [self._song(0, "weak"), self._song(1, "good")]
+        first = wc.batch_transcribe(songs)
+        assert len(calls) == 5
+
+        calls.clear()
+        second = wc.batch_transcribe(songs)
+        assert calls == []
+        assert [(len(r.segments), i) for r, i in second] == \
+            [(len(r.segments), i) for r, i in first]
+
+    def test_templates_of_one_song_share_each_pass(self, monkeypatch):
+        calls = []
+
+        class Backend:
+            def transcribe(self, model, samples, **params):
+                calls.append((params["temperature"], params["regroup"]))
+                return _Result(["s"])
+
+        monkeypatch.setattr(wc, "_active_backend", lambda: Backend())
+        monkeypatch.setattr(wc, "_result_from_dict", lambda d: _Regrouped(d["segments"]))
+        song = self._song(5, "mono")
+        onyx = dict(self._song(5, "onyx"), regroup_passes=[False, False, False, True])
+        # min_expected 2: only the copies regrouped into 2 segments are accepted
+        mono, onyx = wc.batch_transcribe([song, onyx])
+        assert calls == [(0, False), (0.2, False), (0.4, False), (0.6, False)]
+        assert (mono[1], len(mono[0].segments)) == (0, 2)
+        assert (onyx[1], len(onyx[0].segments)) == (3, 2)
+
+    def test_pretranscribed_result_is_consumed_once(self, monkeypatch):
+        song = self._song(3, "x")
+        monkeypatch.setattr(wc, "batch_transcribe", lambda requests: [("result", 2)])
+        local = []
+        monkeypatch.setattr(wc, "_multi_pass_transcribe_local",
+                            lambda *a, **k: local.append(a) or (None, -1))
+        assert wc.pretranscribe([dict(song, regroup_passes=[True] * 4)]) == 1
+
+        # Different settings miss the registry
+        assert wc.multi_pass_transcribe(song["audio"], None, None, "fr") == (None, -1)
+        assert wc.multi_pass_transcribe(song["audio"], None, None, "en") == ("result", 2)
+        assert wc.multi_pass_transcribe(song["audio"], None, None, "en") == (None, -1)
+        assert len(local) == 2
+
+
+def test_local_transcribe_dispatches_parallel_passes(monkeypatch):
+    monkeypatch.setattr(wc.Config, "WHISPER_PARALLEL_PASSES", True)
+    monkeypatch.setattr(wc, "get_device_info", lambda: "CPU")
+    monkeypatch.setattr(wc, "_prepare_audio", lambda audio, from_demucs=False: audio)
+    monkeypatch.setattr(wc.whisper_features, "begin_clip", lambda clip_id: None)
+    seen = []
+    monkeypatch.setattr(wc.Config, "WHISPER_PASS_PLANNER", False)
+    monkeypatch.setattr(wc, "_multi_pass_parallel",
+                        lambda audio, passes, min_expected, song_key, bucket:
+                        seen.append(len(passes)) or ("r", 0))
+    audio = types.SimpleNamespace(samples=np.zeros(10), sample_rate=10, path=None)
+    assert wc._multi_pass_transcribe_local(audio, None, 7.0, "en") == ("r", 0)
+    assert seen == [4]
+
+
+def test_chunked_mode_takes_precedence_over_parallel_passes(monkeypatch, fake_results):
+    monkeypatch.setattr(wc.Config, "WHISPER_PARALLEL_PASSES", True)
+    monkeypatch.setattr(wc.Config, "WHISPER_CHUNKED", True)
+    monkeypatch.setattr(wc.Config, "WHISPER_PASS_CHECKPOINTS", False)
+    monkeypatch.setattr(wc.Config, "WHISPER_PASS_PLANNER", False)
+    monkeypatch.setattr(wc, "get_device_info", lambda: "CPU")
+    monkeypatch.setattr(wc, "_prepare_audio", lambda audio, from_demucs=False: audio)
+    monkeypatch.setattr(wc.whisper_features, "begin_clip", lambda clip_id: None)
+    monkeypatch.setattr(wc, "clear_vram", lambda: None)
+    monkeypatch.setattr(wc, "plan_audio_chunks", lambda audio: [(0, 5), (5, 10)])
+    monkeypatch.setattr(wc, "_multi_pass_parallel", lambda *a, **k: pytest.fail("not chunked"))
+    runs = []
+    monkeypatch.setattr(wc, "_run_pass", lambda model, audio, params, chunks=None:
+                        runs.append(chunks) or {"segments": ["s"] * 9})
+    audio = types.SimpleNamespace(samples=np.zeros(10), sample_rate=10, path=None)
+    result, idx = wc._multi_pass_transcribe_local(audio, None, 7.0, "en")
+    assert idx == 0 and runs == [[(0, 5), (5, 10)]]
+
+
+@pytest.fixture
+def local_loop(monkeypatch, isolated_store, isolated_song_db, fake_results):
+    """Sequential pass loop with a fake backend, isolated store and song DB."""
+    monkeypatch.setattr(wc.Config, "WHISPER_CHUNKED", False)
+    monkeypatch.setattr(wc, "get_device_info", lambda: "GPU")
+    monkeypatch.setattr(wc, "load_whisper_model", lambda force_cpu=False: "model")
+    monkeypatch.setattr(wc, "clear_vram", lambda: None)
+    monkeypatch.setattr(wc, "_prepare_audio", lambda audio, from_demucs=False: audio)
+    monkeypatch.setattr(wc.whisper_features, "begin_clip", lambda clip_id: None)
+
+    def run(transcribe, samples=np.ones(10), duration=60.0, regroup_passes=None):
+        class Backend:
+            def transcribe(self, model, samples, **params):
+                return transcribe(params)
+
+        monkeypatch.setattr(wc, "_active_backend", lambda: Backend())
+        audio = types.SimpleNamespace(samples=samples, sample_rate=10, path=None)
+        return wc._multi_pass_transcribe_local(audio, None, duration, "en",
+                                               regroup_passes=regroup_passes)
+    return run
+
+
+def test_local_transcribe_resumes_after_last_checkpoint(local_loop):
+    temps = []
+    crash_at = [0.2]
+
+    def transcribe(params):
+        if params["temperature"] == crash_at[0]:
+            raise KeyboardInterrupt
+        temps.append(params["temperature"])
+        return _Result(["s"])
+
+    with pytest.raises(KeyboardInterrupt):
+        local_loop(transcribe)
+    assert temps == [0]
+
+    temps.clear()
+    crash_at[0] = None
+    result, idx = local_loop(transcribe)
+    assert 0 not in temps and temps[0] == 0.2
+    assert idx == 0 and result.segments == ["s"]
+
+
+def test_templates_share_raw_passes(local_loop, monkeypatch):
+    monkeypatch.setattr(wc.Config, "WHISPER_PASS_PLANNER", False)
+    monkeypatch.setattr(wc, "_result_from_dict", lambda d: _Regrouped(d["segments"]))
+    decoded = []
+
+    def transcribe(params):
+        assert params["regroup"] is False
+        decoded.append(params["temperature"])
+        return _Result(["s"] * 10)
+
+    cfg = wc.TEMPLATE_PASS_CONFIG
+    # min_expected is 17: only a regrouped pass (20 segments) is accepted
+    aurora = local_loop(transcribe, regroup_passes=cfg["Aurora"]["regroup_passes"])
+    onyx = local_loop(transcribe, regroup_passes=cfg["Onyx"]["regroup_passes"])
+    mono = local_loop(transcribe, regroup_passes=cfg["Mono"]["regroup_passes"])
+    assert decoded == [0, 0.2, 0.4, 0.6]   # every raw pass decoded once
+    assert [idx for _, idx in (aurora, onyx, mono)] == [0, 3, 0]
+    assert len(onyx[0].segments) == 20
+    assert aurora[0] is not mono[0]
+
+
+# ===========================================================================
+# Adaptive pass planner (#53)
+# ===========================================================================
+
+class TestPassPlanner:
+    @pytest.fixture(autouse=True)
+    def _db(self, monkeypatch, isolated_song_db):
+        monkeypatch.setattr(wc.Config, "WHISPER_PLANNER_MIN_SONGS", 3)
+
+    @staticmethod
+    def _passes():
+        return wc._build_passes("prompt", "en", True, [True] * 4)
+
+    def test_no_history_keeps_order(self, capsys):
+        planned = wc.plan_passes(self._passes(), "song", "small/en/mix")
+        assert [p["index"] for p in planned] == [0, 1, 2, 3]
+
+    def test_known_song_starts_with_its_last_winner(self, capsys):
+        wc.record_pass_history("song", "small/en/mix", [(0, 3, 4.0), (1, 4, 5.0), (2, 20, 6.0)], 2)
+        planned = wc.plan_passes(self._passes(), "song", "small/en/mix")
+        assert [p["index"] for p in planned] == [2, 0, 1, 3]
+        # Other buckets and other songs are unaffected
+        assert [p["index"] for p in wc.plan_passes(self._passes(), "song", "small/fr/mix")] == [0, 1, 2, 3]
+        assert [p["index"] for p in wc.plan_passes(self._passes(), "other", "small/en/mix")] == [0, 1, 2, 3]
+
+    def test_bucket_winner_used_once_enough_songs(self, capsys):
+        bucket = "small/en/demucs"
+        wc.record_pass_history("a", bucket, [(0, 1, 1.0), (1, 9, 1.0)], 1)
+        wc.record_pass_history("b", bucket, [(0, 1, 1.0), (1, 9, 1.0)], 1)
+        assert [p["index"] for p in wc.plan_passes(self._passes(), "new", bucket)] == [0, 1, 2, 3]
+        wc.record_pass_history("c", bucket, [(0, 9, 1.0)], 0)
+        wc.record_pass_history("d", bucket, [(0, 1, 1.0), (1, 9, 1.0)], 1)
+        assert [p["index"] for p in wc.plan_passes(self._passes(), "new", bucket)] == [1, 0, 2, 3]
+
+    def test_rerun_goes_straight_to_known_winner(self, local_loop, monkeypatch):
+        monkeypatch.setattr(wc.Config, "WHISPER_PASS_CHECKPOINTS", False)
+        temps = []
+
+        def transcribe(params):
+            temps.append(params["temperature"])
+            return _Result(["s"] * (30 if params["temperature"] == 0.4 else 2))
+
+        assert local_loop(transcribe)[1] == 2
+        assert temps == [0, 0.2, 0.4]
+
+        temps.clear()
+        result, idx = local_loop(transcribe)
+        assert idx == 2 and temps == [0.4]
+        assert len(result.segments) == 30
+
+    def test_parallel_passes_follow_plan_and_record_history(self, monkeypatch, fake_results,
+                                                            capsys):
+        monkeypatch.setattr(wc.Config, "WHISPER_PARALLEL_PASSES", True)
+        monkeypatch.setattr(wc.Config, "WHISPER_CHUNKED", False)
+        monkeypatch.setattr(wc.Config, "WHISPER_PASS_CHECKPOINTS", False)
+        monkeypatch.setattr(wc, "get_device_info", lambda: "CPU")
+        monkeypatch.setattr(wc, "_prepare_audio", lambda audio, from_demucs=False: audio)
+        monkeypatch.setattr(wc.whisper_features, "begin_clip", lambda clip_id: None)
+        monkeypatch.setattr(tp, "cancel_all", lambda: None)
+        submitted = []
+
+        def submit(samples, params):
+            submitted.append([p["temperature"] for p in params])
+            return [_Job(_out(30 if p["temperature"] == 0.4 else 2)) for p in params]
+
+        monkeypatch.setattr(tp, "submit_passes", submit)
+        audio = types.SimpleNamespace(samples=np.ones(10), sample_rate=10, path=None)
+        assert wc._multi_pass_transcribe_local(audio, None, 60.0, "en")[1] == 2
+        stats = wc._pass_history_db().get_pass_stats(wc.pass_bucket("en", False))
+        assert {i: (s["runs"], s["wins"]) for i, s in stats.items()} == \
+            {0: (1, 0), 1: (1, 0), 2: (1, 1)}
+
+        # The rerun walks the recorded winner first and replaces the history
+        result, idx = wc._multi_pass_transcribe_local(audio, None, 60.0, "en")
+        assert idx == 2 and len(result.segments) == 30
+        assert submitted[1][0] == 0.4
+        stats = wc._pass_history_db().get_pass_stats(wc.pass_bucket("en", False))
+        assert {i: (s["runs"], s["wins"]) for i, s in stats.items()} == {2: (1, 1)}
+
+    def test_song_database_opened_once(self, monkeypatch, capsys):
+        from scripts.song_database import SongDatabase
+        inits = []
+        original = SongDatabase.init_database
+        monkeypatch.setattr(SongDatabase, "init_database",
+                            lambda db: inits.append(db.db_path) or original(db))
+        monkeypatch.setattr(wc, "_history_db", None)
+        wc.plan_passes(self._passes(), "song", "small/en/mix")
+        wc.record_pass_history("song", "small/en/mix", [(0, 9, 1.0)], 0)
+        wc.plan_passes(self._passes(), "song", "small/en/mix")
+        assert len(inits) == 1
+
+    def test_history_records_timings_and_counts(self, local_loop):
+        local_loop(lambda params: _Result(["s"] * (30 if params["temperature"] == 0.2 else 2)))
+        stats = wc._pass_history_db().get_pass_stats(wc.pass_bucket("en", False))
+        assert {i: (s["runs"], s["wins"], s["avg_segments"]) for i, s in stats.items()} == \
+            {0: (1, 0, 2), 1: (1, 1, 30)}
+        assert all(s["avg_seconds"] is not None for s in stats.values())
@@ -0,0 +1,304 @@
+"""
+Tests for assets/scripts/transcription_worker.py
+
+The worker runs in a background thread on a free localhost port;
+whisper_common's transcription entry points are replaced with fakes so no
+model is ever loaded.
+"""
+import sys
+import socket
+import threading
+import time
+from unittest.mock import MagicMock
+
+# ---------------------------------------------------------------------------
+# Mock heavy dependencies BEFORE importing whisper_common
+# ---------------------------------------------------------------------------
+sys.modules.setdefault("stable_whisper", MagicMock())
+sys.modules.setdefault("torch", MagicMock())
+sys.modules.setdefault("pydub", MagicMock())
+sys.modules.setdefault("pydub.playback", MagicMock())
+sys.modules.setdefault("scripts.audio_processing", MagicMock())
+pydub_mock = sys.modules["pydub"]
+pydub_mock.AudioSegment = MagicMock()
+
+import pytest
+
+from scripts.config import Config
+from scripts import whisper_common
+from scripts import transcription_worker as tw
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class _FakeResult:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def to_dict(self):
+        return self._payload
+
+
+@pytest.fixture(autouse=True)
+def token_file(monkeypatch, tmp_path):
+    path = tmp_path / "worker.token"
+    monkeypatch.setattr(Config, "TRANSCRIBE_WORKER_TOKEN_PATH", str(path))
+    return path
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    """Start a worker thread on a free port; yields the port."""
+    port = _free_port()
+    monkeypatch.setattr(tw, "_unavailable_until", 0.0)
+    monkeypatch.setattr(Config, "TRANSCRIBE_WORKER", True)
+    monkeypatch.setattr(Config, "TRANSCRIBE_WORKER_PORT", port)
+    monkeypatch.setattr(tw, "_to_whisper_result", lambda d: d)
+    thread = threading.Thread(target=tw.serve, kwargs={"port": port, "idle_sec": 3600},
+                              daemon=True)
+    thread.start()
+    for _ in range(100):
+        if tw.worker_status(port) is not None:
+            break
+        time.sleep(0.02)
+    yield port
+    try:
+        tw._request("/shutdown", {}, timeout=2, port=port)
+    except tw.WorkerUnavailable:
+        pass
+    thread.join(timeout=5)
+
+
+class TestClient:
+    def test_status_none_when_not_running(self):
+        assert tw.worker_status(_free_port()) is None
+
+    def test_request_unreachable_raises(self):
+        with pytest.raises(tw.WorkerUnavailable):
+            tw._request("/health", timeout=0.5, port=_free_port())
+
+    def test_failed_request_not_rerun_in_process(self, monkeypatch):
+        def remote_fails(*a, **kw):
+            raise tw.WorkerFailed("model exploded")
+
+        local = []
+        monkeypatch.setattr(Config, "TRANSCRIBE_WORKER", True)
+        monkeypatch.setattr(tw, "remote_transcribe", remote_fails)
+        monkeypatch.setattr(whisper_common, "_multi_pass_transcribe_local",
+                            lambda *a, **kw: local.append(a) or (None, -1))
+        with pytest.raises(tw.WorkerFailed):
+            whisper_common.multi_pass_transcribe("clip.wav", None, None, None)
+        assert local == []
+
+
+    def test_read_timeout_is_failed_not_unavailable(self):
+        # Accepts the connection, never answers: the request was taken
+        with socket.socket() as srv:
+            srv.bind(("127.0.0.1", 0))
+            srv.listen(1)
+            with pytest.raises(tw.WorkerFailed) as exc:
+                tw._request("/transcribe", {}, timeout=0.3, port=srv.getsockname()[1])
+        assert not isinstance(exc.value, tw.WorkerUnavailable)
+
+    def test_failed_start_is_remembered(self, monkeypatch, capsys):
+        spawned = []
+        monkeypatch.setattr(tw, "_unavailable_until", 0.0)
+        monkeypatch.setattr(tw, "WORKER_START_TIMEOUT_SEC", 0.3)
+        monkeypatch.setattr(tw, "worker_status", lambda port=None: None)
+        monkeypatch.setattr(tw.subprocess, "Popen", lambda *a, **kw: spawned.append(a))
+        assert tw.ensure_worker(_free_port()) is False
+        start = time.time()
+        assert tw.ensure_worker(_free_port()) is False
+        with pytest.raises(tw.WorkerUnavailable):
+            tw.remote_align("clip.wav", "lyrics")
+        assert len(spawned) == 1 and time.time() - start < 0.1
+
+        monkeypatch.setattr(tw, "_unavailable_until", time.time() - 1)
+        tw.ensure_worker(_free_port())
+        assert len(spawned) == 2
+
+
+class TestWorkerServer:
+    def test_health_reports_model(self, worker):
+        status = tw.worker_status(worker)
+        assert status["status"] == "ok"
+        assert status["model"] == Config.WHISPER_MODEL
+        assert status["busy"] is False
+
+    def test_transcribe_roundtrip(self, worker, monkeypatch):
+        calls = []
+
+        def fake_transcribe(audio_path, prompt, duration, language, **kw):
+            calls.append((audio_path, prompt, duration, language, kw))
+            print("  Pass 1 (strict)...")
+            return _FakeResult({"segments": [{"text": "hi"}]}), 2
+
+        monkeypatch.setattr(whisper_common, "multi_pass_transcribe", fake_transcribe)
+        result, idx = tw.remote_transcribe("clip.wav", "Song, Artist.", 60.0, "en",
+                                           regroup_passes=[False] * 4)
+        assert result == {"segments": [{"text": "hi"}]}
+        assert idx == 2
+        assert calls[0][1:4] == ("Song, Artist.", 60.0, "en")
+        assert calls[0][4]["regroup_passes"] == [False] * 4
+
+    def test_transcribe_log_replayed(self, worker, monkeypatch, capsys):
+        def fake_transcribe(*a, **kw):
+            print("  Pass 1 (strict)...")
+            return None, -1
+
+        monkeypatch.setattr(whisper_common, "multi_pass_transcribe", fake_transcribe)
+        result, idx = tw.remote_transcribe("clip.wav", None, None, None)
+        assert result is None and idx == -1
+        assert "Pass 1 (strict)" in capsys.readouterr().out
+
+    def test_align_roundtrip(self, worker, monkeypatch):
+        monkeypatch.setattr(whisper_common, "align_genius_to_audio",
+                            lambda path, text, lang: _FakeResult({"text": text}))
+        assert tw.remote_align("clip.wav", "la la", "en") == {"text": "la la"}
+
+    def test_error_surfaces_as_failed(self, worker, monkeypatch):
+        def boom(*a, **kw):
+            raise RuntimeError("model exploded")
+
+        monkeypatch.setattr(whisper_common, "multi_pass_transcribe", boom)
+        with pytest.raises(tw.WorkerFailed, match="model exploded"):
+            tw.remote_transcribe("clip.wav", None, None, None)
+
+    def test_cancel_surfaces_as_cancelled(self, worker, monkeypatch):
+        started = threading.Event()
+
+        def slow(*a, **kw):
+            started.set()
+            for _ in range(500):
+                time.sleep(0.01)
+            return None, -1
+
+        monkeypatch.setattr(whisper_common, "multi_pass_transcribe", slow)
+        threading.Thread(target=lambda: started.wait(5) and tw.cancel_active(),
+                         daemon=True).start()
+        with pytest.raises(tw.WorkerCancelled):
+            tw.remote_transcribe("clip.wav", None, None, None)
+
+    def test_batch_outlives_a_single_poll(self, worker, monkeypatch):
+        monkeypatch.setattr(tw, "JOB_POLL_SEC", 0.1)
+        polls = []
+        real_request = tw._request
+        monkeypatch.setattr(tw, "_request", lambda path, *a, **kw:
+                            polls.append(path) or real_request(path, *a, **kw))
+
+        def slow_batch(songs):
+            time.sleep(0.6)
+            return [(_FakeResult({"text": s["label"]}), 1) for s in songs]
+
+        monkeypatch.setattr(whisper_common, "batch_transcribe", slow_batch)
+        results = tw.remote_transcribe_batch([{"audio": "a.wav", "label": "A"},
+                                              {"audio": "b.wav", "label": "B"}])
+        assert results == [({"text": "A"}, 1), ({"text": "B"}, 1)]
+        assert polls.count("/job") >= 3
+
+    def test_worker_lost_mid_job_is_failed(self, worker, monkeypatch):
+        monkeypatch.setattr(tw, "JOB_POLL_SEC", 0.1)
+        release = threading.Event()
+        monkeypatch.setattr(whisper_common, "batch_transcribe",
+                            lambda songs: release.wait(5) and [])
+        threading.Timer(0.3, tw._request, ("/shutdown", {}),
+                        {"port": worker}).start()
+        try:
+            with pytest.raises(tw.WorkerFailed) as exc:
+                tw.remote_transcribe_batch([{"audio": "a.wav"}])
+        finally:
+            release.set()
+        assert not isinstance(exc.value, tw.WorkerUnavailable)
+
+    def test_unknown_job_404(self, worker):
+        with pytest.raises(tw.WorkerUnavailable, match="unknown job"):
+            tw._request("/job", {"job": "nope"}, port=worker)
+
+    def test_cancel_when_idle_is_noop(self, worker):
+        assert tw._request("/cancel", {}, port=worker) == {"cancelled": False}
+
+    def _raw(self, port, headers, body=b"{}"):
+        import urllib.request
+        import urllib.error
+        req = urllib.request.Request(f"http://127.0.0.1:{port}/shutdown", data=body,
+                                     headers=headers, method="POST")
+        try:
+            with urllib.request.urlopen(req, timeout=5) as resp:
+                return resp.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    def test_requests_without_token_are_rejected(self, worker):
+        assert self._raw(worker, {"Content-Type": "application/json"}) == 403
+        assert self._raw(worker, {"Content-Type": "application/json",
+                                  tw.TOKEN_HEADER: "guess"}) == 403
+        assert tw.worker_status(worker) is not None   # still running
+
+    def test_non_json_content_type_rejected(self, worker):
+        assert self._raw(worker, {"Content-Type": "text/plain",
+                                  tw.TOKEN_HEADER: tw._token()}) == 415
+        assert tw.worker_status(worker) is not None
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX file modes")
+    def test_token_file_is_owner_only(self, worker, token_file):
+        assert token_file.read_text() == tw._token()
+        assert token_file.stat().st_mode & 0o777 == 0o600
+
+    def test_cancel_clears_busy_at_once(self, worker, monkeypatch):
+        started, release = threading.Event(), threading.Event()
+
+        def stuck(*a, **kw):
+            started.set()
+            release.wait(5)   # a C-level wait: the cancel lands only after it
+            return None, -1
+
+        monkeypatch.setattr(whisper_common, "multi_pass_transcribe", stuck)
+        outcome = []
+        client = threading.Thread(target=lambda: outcome.append(
+            pytest.raises(tw.WorkerCancelled, tw.remote_transcribe, "c.wav", None, None, None)))
+        client.start()
+        started.wait(5)
+        assert tw._request("/cancel", {}, port=worker) == {"cancelled": True}
+        assert tw.worker_status(worker)["busy"] is False
+        release.set()
+        client.join(5)
+        assert outcome and tw.worker_status(worker)["busy"] is False
+
+    def test_unknown_path_404(self, worker):
+        with pytest.raises(tw.WorkerUnavailable, match="not found"):
+            tw._request("/nope", {}, port=worker)
+
+
+class TestRunExclusive:
+    def test_cancel_after_fn_returned_still_cancels(self):
+        state = tw._WorkerState(3600, "t")
+
+        def fn():
+            # _cancel_busy got in after the work finished; its exception
+            # has not been delivered yet
+            with state.state_lock:
+                state.busy_thread = None
+            return {}
+
+        with pytest.raises(tw._Cancelled):
+            tw._run_exclusive(state, fn)
+        assert state.busy_thread is None
+        time.sleep(0.01)   # nothing left pending for this thread
+
+
+class TestIdleEviction:
+    def test_worker_exits_after_idle_timeout(self, monkeypatch):
+        port = _free_port()
+        monkeypatch.setattr(Config, "TRANSCRIBE_WORKER", True)
+        unloaded = []
+        monkeypatch.setattr(whisper_common, "unload_model", lambda: unloaded.append(True))
+        thread = threading.Thread(target=tw.serve, kwargs={"port": port, "idle_sec": 1},
+                                  daemon=True)
+        thread.start()
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+        assert unloaded == [True]
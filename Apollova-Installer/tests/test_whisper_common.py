@@ -1440,3 +1440,314 @@ class TestRemoveGeniusMismatches:
         items = [{"lyric_current": "Everything lit its fire everything big"}]
         result = remove_genius_mismatches(items, "lyric_current", genius)
         assert len(result) == 1
+
+
+# ===========================================================================
+# ASR backends (#35)
+# ===========================================================================
+
+from scripts import whisper_common as _wc
+from scripts.config import Config as _Config
+
+
+class TestAsrBackends:
+    def test_explicit_stable_ts(self, monkeypatch):
+        monkeypatch.setattr(_Config, "WHISPER_BACKEND", "stable-ts")
+        assert _wc.get_backend().name == "stable-ts"
+
+    def test_explicit_faster_whisper(self, monkeypatch):
+        monkeypatch.setattr(_Config, "WHISPER_BACKEND", "faster-whisper")
+        assert _wc.get_backend().name == "faster-whisper"
+
+    def test_unknown_backend_uses_stable_ts(self, monkeypatch):
+        monkeypatch.setattr(_Config, "WHISPER_BACKEND", "bogus")
+        assert _wc.get_backend().name == "stable-ts"
+
+    def test_auto_cpu_picks_faster_whisper_when_installed(self, monkeypatch):
+        monkeypatch.setattr(_Config, "WHISPER_BACKEND", "auto")
+        monkeypatch.setattr(_wc, "_faster_whisper_installed", lambda: True)
+        assert _wc.get_backend(force_cpu=True).name == "faster-whisper"
+
+    def test_auto_cpu_without_faster_whisper(self, monkeypatch):
+        monkeypatch.setattr(_Config, "WHISPER_BACKEND", "auto")
+        monkeypatch.setattr(_wc, "_faster_whisper_installed", lambda: False)
+        assert _wc.get_backend(force_cpu=True).name == "stable-ts"
+
+    def test_faster_prefers_transcribe_stable(self):
+        model = MagicMock()
+        model.transcribe_stable.return_value = "stable"
+        assert _wc.FasterWhisperBackend().transcribe(model, "a.wav", vad=True) == "stable"
+        model.transcribe_stable.assert_called_once_with("a.wav", vad=True)
+        model.transcribe.assert_not_called()
+
+    def test_faster_load_failure_falls_back(self, monkeypatch):
+        def boom(self, name, force_cpu=False):
+            raise ImportError("no faster_whisper")
+
+        monkeypatch.setattr(_wc.FasterWhisperBackend, "load", boom)
+        monkeypatch.setattr(_wc.StableTsBackend, "load",
+                            lambda self, name, force_cpu=False: "torch-model")
+        backend, model = _wc._load_backend_model(_wc.FasterWhisperBackend(), False)
+        assert backend.name == "stable-ts"
+        assert model == "torch-model"
+
+    def test_model_cache_keyed_by_backend(self, monkeypatch):
+        loads = []
+        monkeypatch.setattr(_wc.StableTsBackend, "load",
+                            lambda self, name, force_cpu=False: loads.append(self.name) or object())
+        monkeypatch.setattr(_wc.FasterWhisperBackend, "load",
+                            lambda self, name, force_cpu=False: loads.append(self.name) or object())
+        monkeypatch.setattr(_wc, "clear_vram", lambda: None)
+        monkeypatch.setattr(_Config, "WHISPER_CACHE_DIR", "/tmp/apollova_test_models")
+        try:
+            monkeypatch.setattr(_Config, "WHISPER_BACKEND", "stable-ts")
+            first = _wc.load_whisper_model()
+            assert _wc.load_whisper_model() is first
+            monkeypatch.setattr(_Config, "WHISPER_BACKEND", "faster-whisper")
+            _wc.load_whisper_model()
+            assert loads == ["stable-ts", "faster-whisper"]
+        finally:
+            _wc.unload_model()
+
+    def test_fallback_model_reused(self, monkeypatch):
+        loads = []
+
+        def boom(self, name, force_cpu=False):
+            loads.append(self.name)
+            raise ImportError("no faster_whisper")
+
+        monkeypatch.setattr(_wc.FasterWhisperBackend, "load", boom)
+        monkeypatch.setattr(_wc.StableTsBackend, "load",
+                            lambda self, name, force_cpu=False: loads.append(self.name) or object())
+        monkeypatch.setattr(_wc, "clear_vram", lambda: None)
+        monkeypatch.setattr(_Config, "WHISPER_CACHE_DIR", "/tmp/apollova_test_models")
+        monkeypatch.setattr(_Config, "WHISPER_BACKEND", "faster-whisper")
+        try:
+            first = _wc.load_whisper_model()
+            assert _wc.load_whisper_model() is first
+            assert loads == ["faster-whisper", "stable-ts"]
+            assert _wc._active_backend().name == "stable-ts"
+        finally:
+            _wc.unload_model()
+
+
+# ===========================================================================
+# Decode-once audio buffer (#36)
+# ===========================================================================
+
+import types as _types
+import numpy as _np
+
+
+def _buffer(samples, sr=16000, path=None):
+    """Stand-in for audio_processing.AudioBuffer (that module is mocked here)."""
+    samples = _np.asarray(samples, dtype=_np.float32)
+    return _types.SimpleNamespace(samples=samples, sample_rate=sr, path=path,
+                                  duration=len(samples) / sr)
+
+
+class TestAudioBufferPlumbing:
+    def test_duration_from_buffer(self):
+        assert _wc.get_audio_duration(_buffer(_np.zeros(16000 * 3))) == 3.0
+
+    def test_audio_input_path_or_samples(self):
+        buf = _buffer(_np.zeros(10))
+        assert _wc._audio_input("clip.wav") == "clip.wav"
+        assert _wc._audio_input(buf) is buf.samples
+
+    def test_instrumental_removed_over_silent_buffer(self):
+        sr = 100
+        loud = _np.full(sr * 4, 0.5)
+        quiet = _np.zeros(sr * 4)
+        buf = _buffer(_np.concatenate([loud, quiet]), sr=sr)
+        items = [
+            {"time": 0.5, "end_time": 2.5, "text": "sung line"},
+            {"time": 5.0, "end_time": 7.0, "text": "ghost line"},
+        ]
+        result = _wc.remove_instrumental_hallucinations(items, "text", buf)
+        assert [m["text"] for m in result] == ["sung line"]
+
+    def test_silence_map_resolves_sub_second_edges(self):
+        # 1.5 s of singing then silence: a 1 s grid would call [1, 2) loud
+        sr = 1000
+        buf = _buffer(_np.concatenate([_np.full(1500, 0.5), _np.zeros(2500)]), sr=sr)
+        silence = _wc._silence_map(buf)
+        assert silence.hop_sec == _Config.SILENCE_HOP_MS / 1000
+        assert silence.silent_ratio(1.5, 4.0) == 1.0
+        assert silence.silent_ratio(1.0, 2.0) == 0.5
+        assert silence.silent_ratio(0.0, 1.5) == 0.0
+
+    def test_silence_map_hops_past_clip_not_silent(self):
+        silence = _wc.SilenceMap(_np.array([False, True, True]), 1.0)
+        assert silence.silent_ratio(1.0, 5.0) == 0.5
+        assert silence.silent_ratio(2.2, 2.2) == 1.0
+
+    def test_silence_map_falsy_without_audio(self):
+        assert not _wc._silence_map(None)
+        assert not _wc._silence_map(_buffer(_np.zeros(100), sr=10))
+
+    def test_in_memory_buffer_skips_worker(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(_Config, "TRANSCRIBE_WORKER", True)
+        monkeypatch.setattr(_wc, "_multi_pass_transcribe_local",
+                            lambda audio, *a, **kw: calls.append(audio) or (None, -1))
+        buf = _buffer(_np.zeros(10), path=None)
+        assert _wc.multi_pass_transcribe(buf, None, None, None) == (None, -1)
+        assert calls == [buf]
+
+
+# ===========================================================================
+# In-process Demucs (#38)
+# ===========================================================================
+
+@pytest.mark.usefixtures("isolated_store")
+class TestSeparateVocals:
+    def _fake_extract(self, calls):
+        def extract(audio_path):
+            calls.append(audio_path)
+            buf = _buffer(_np.zeros(160))
+
+            def write_wav(path):
+                with open(path, "wb") as f:
+                    f.write(b"RIFFvocals")
+                buf.path = path
+                return path
+            buf.write_wav = write_wav
+            return buf
+        return extract
+
+    def test_returns_buffer_and_reuses_store(self, tmp_path, monkeypatch):
+        calls = []
+        monkeypatch.setattr(_wc, "extract_vocals", self._fake_extract(calls))
+        audio = tmp_path / "audio_trimmed.wav"
+        audio.write_bytes(b"mix")
+        job1, job2 = tmp_path / "job_001", tmp_path / "job_002"
+        job1.mkdir()
+        job2.mkdir()
+
+        first = _wc.separate_vocals(str(audio), str(job1))
+        assert first.path == str(job1 / "vocals.wav")
+        assert first.samples.shape == (160,)
+
+        second = _wc.separate_vocals(str(audio), str(job2))
+        assert second == str(job2 / "vocals.wav")
+        assert (job2 / "vocals.wav").read_bytes() == b"RIFFvocals"
+        assert calls == [str(audio)]
+
+    def test_failure_falls_back_to_mix(self, tmp_path, monkeypatch):
+        def boom(audio_path):
+            raise ImportError("no demucs")
+
+        monkeypatch.setattr(_wc, "extract_vocals", boom)
+        audio = tmp_path / "audio_trimmed.wav"
+        audio.write_bytes(b"mix")
+        assert _wc.separate_vocals(str(audio), str(tmp_path)) == str(audio)
+
+
+# ===========================================================================
+# clean_segments — fused cleanup engine (#44)
+# ===========================================================================
+
+class TestCleanSegments:
+    TEXTS = ["hello there", "hello there", "Hello there!", "um", "...", "[Music]",
+             "thank you for watching", "I love you", "привет мир", "", "a",
+             "la la la", "la la la", "la la la", "la la la", "Artist - Song"]
+
+    def _items(self, text_key="text"):
+        time_key = "t" if text_key == "lyric_current" else "time"
+        items = []
+        for i, text in enumerate(self.TEXTS):
+            items.append({text_key: text, time_key: i * 0.6, "end_time": i * 0.6 + 0.5})
+        items[7]["no_speech_prob"] = 0.9
+        return items
+
+    def _chain(self, items, text_key, prompt):
+        items = remove_hallucinations(items, text_key, prompt)
+        items = remove_junk(items, text_key)
+        items = remove_stutter_duplicates(items, text_key)
+        items = remove_repetition_loops(items, text_key)
+        return _wc.remove_instrumental_hallucinations(items, text_key, None)
+
+    @pytest.mark.parametrize("text_key", ["text", "lyric_current"])
+    def test_matches_sequential_chain(self, text_key, capsys):
+        prompt = "Artist - Song."
+        expected = self._chain(self._items(text_key), text_key, prompt)
+        chain_log = capsys.readouterr().out
+        fused = _wc.clean_segments(self._items(text_key), text_key, prompt, None)
+        assert fused == expected
+        assert capsys.readouterr().out == chain_log
+
+    def test_per_stage_counts(self):
+        stages = [_wc.HallucinationStage("Artist - Song."), _wc.JunkStage(),
+                  _wc.StutterStage("text"), _wc.RepetitionStage(),
+                  _wc.InstrumentalStage("text", None)]
+        _wc.run_cleanup(self._items(), "text", stages)
+        assert {st.name: st.removed for st in stages} == {
+            "hallucination": 3, "junk": 4, "stutter": 3, "repetition": 0, "instrumental": 1}
+
+    def test_record_normalised_once(self):
+        rec = _wc.LineRecord({"text": "  Hello, World!  "}, "text")
+        assert rec.alnum == "hello world"
+        assert rec.alnum is rec.alnum
+        assert rec.tokens == {"hello", "world"}
+
+
+# ===========================================================================
+# LyricMatchMatrix — cdist-based duplicate counts (#45)
+# ===========================================================================
+
+class TestLyricMatchMatrix:
+    GENIUS = "[Chorus]\nla la la\nla la la\nhello there my friend (yeah)\n(Verse 1)\ngo home"
+
+    def test_counts_match_loop_rules(self):
+        m = _wc.LyricMatchMatrix(self.GENIUS)
+        assert m.genius_counts(["La la la", "hello there my friend", "nothing", ""]) == [2, 1, 0, 0]
+        texts = ["la la la", "la la la!", "go home", ""]
+        assert m.whisper_counts(texts) == [2, 2, 1, 0]
+
+    def test_genius_rows_shared_between_passes(self, monkeypatch):
+        calls = []
+        real = _wc.process.cdist
+
+        def counting(queries, choices, **kwargs):
+            calls.append(len(choices))
+            return real(queries, choices, **kwargs)
+
+        monkeypatch.setattr(_wc.process, "cdist", counting)
+        markers = [{"text": t} for t in ["la la la", "go home", "la la la", "la la la"]]
+        m = _wc.LyricMatchMatrix(self.GENIUS)
+        kept = remove_genius_confirmed_duplicates(markers, self.GENIUS, matrix=m)
+        assert [k["text"] for k in kept] == ["la la la", "go home", "la la la"]
+        validate_lyrics_quality(kept, self.GENIUS, matrix=m)
+        genius_calls = [n for n in calls if n == len(m.genius_lines)]
+        assert genius_calls == [len(m.genius_lines)]
+
+
+# ===========================================================================
+# GeniusLyricsIndex — parse once, inverted word index (#46)
+# ===========================================================================
+
+class TestGeniusLyricsIndex:
+    GENIUS = "[Verse 1]\nWalking down the street (yeah)\nLights are on tonight\n(Chorus)\nWalking home"
+
+    def test_lines_match_parse(self):
+        idx = _wc.GeniusLyricsIndex(self.GENIUS)
+        assert idx.lines == _wc._parse_genius_lines(self.GENIUS)
+
+    def test_best_overlap(self):
+        idx = _wc.GeniusLyricsIndex(self.GENIUS)
+        assert idx.best_overlap({"walking", "down", "street", "now"}) == 0.75
+        assert idx.best_overlap({"nothing", "shared"}) == 0.0
+        assert idx.best_overlap(set()) == 0.0
+
+    def test_alignment_lines_parsed_once(self):
+        from scripts.lyric_alignment import genius_lyric_lines
+        idx = _wc.GeniusLyricsIndex(self.GENIUS)
+        assert idx.lyric_lines == genius_lyric_lines(self.GENIUS)
+        assert idx.lyric_lines is idx.lyric_lines
+
+    def test_shared_index_used_by_mismatch_filter(self):
+        idx = _wc.GeniusLyricsIndex(self.GENIUS)
+        items = [{"text": "walking down the street"}, {"text": "completely unrelated words here"}]
+        kept = remove_genius_mismatches(items, "text", self.GENIUS, index=idx)
+        assert [k["text"] for k in kept] == ["walking down the street"]
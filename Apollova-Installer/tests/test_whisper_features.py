@@ -0,0 +1,154 @@
+"""
+Tests for assets/scripts/whisper_features.py
+
+Uses numpy arrays and plain fakes in place of torch tensors / CTranslate2
+models, so no ASR engine is needed.
+"""
+import numpy as np
+import pytest
+
+from scripts import whisper_features as wf
+from scripts.whisper_features import FeatureMemo, content_key
+
+
+@pytest.fixture(autouse=True)
+def _fresh_memos():
+    wf.reset()
+    yield
+    wf.reset()
+
+
+class TestContentKey:
+    def test_same_content_same_key(self):
+        a = np.arange(10, dtype=np.float32)
+        assert content_key(a) == content_key(a.copy())
+
+    def test_shape_dtype_and_extra_matter(self):
+        a = np.zeros(6, dtype=np.float32)
+        assert content_key(a) != content_key(a.reshape(2, 3))
+        assert content_key(a) != content_key(a.astype(np.float64))
+        assert content_key(a, 80) != content_key(a, 128)
+
+
+class TestFeatureMemo:
+    def test_computes_once(self):
+        memo = FeatureMemo(max_entries=4)
+        calls = []
+        x = np.ones(5)
+        for _ in range(3):
+            memo.cached(lambda: calls.append(1) or "mel", x)
+        assert calls == [1]
+        assert (memo.hits, memo.misses) == (2, 1)
+
+    def test_lru_bound(self):
+        memo = FeatureMemo(max_entries=2)
+        for i in range(3):
+            memo.cached(lambda i=i: i, np.array([i]))
+        assert len(memo) == 2
+        assert memo.get(content_key(np.array([0]))) is None
+
+    def test_begin_clip_clears_only_on_new_clip(self):
+        memo = FeatureMemo(max_entries=4)
+        memo.begin_clip("a")
+        memo.cached(lambda: "mel", np.ones(3))
+        memo.begin_clip("a")
+        assert len(memo) == 1
+        memo.begin_clip("b")
+        assert len(memo) == 0
+
+
+class TestStableTsMel:
+    def test_memoized_mel_reuses_window(self):
+        calls = []
+
+        def original(audio, n_mels=80, padding=0, device=None):
+            calls.append((n_mels, padding))
+            return np.full((n_mels, 4), padding, dtype=np.float32)
+
+        mel = wf._memoized_mel(original)
+        window = np.random.default_rng(0).standard_normal(1600).astype(np.float32)
+        first = mel(window, 80, padding=100)
+        second = mel(window.copy(), 80, padding=100)
+        assert second is first
+        mel(window, 80, padding=200)
+        assert calls == [(80, 100), (80, 200)]
+
+
+class _FakeExtractor:
+    sampling_rate = 16000
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, waveform, chunk_length=None):
+        self.calls += 1
+        return np.outer(np.ones(3), waveform[:4])
+
+
+class _FakeFasterModel:
+    def __init__(self):
+        self.feature_extractor = _FakeExtractor()
+        self.encodes = 0
+
+    def encode(self, features):
+        self.encodes += 1
+        return features.sum()
+
+
+class TestFasterWhisper:
+    def test_features_and_encoder_shared(self):
+        model = wf.install_faster_whisper(_FakeFasterModel())
+        audio = np.arange(16, dtype=np.float32)
+        for _ in range(3):
+            feats = model.feature_extractor(audio, chunk_length=30)
+            model.encode(feats)
+        assert model.feature_extractor.inner.calls == 1
+        assert model.encodes == 1
+        assert model.feature_extractor.sampling_rate == 16000
+
+    def test_install_is_idempotent(self):
+        model = _FakeFasterModel()
+        wf.install_faster_whisper(model)
+        extractor, encode = model.feature_extractor, model.encode
+        wf.install_faster_whisper(model)
+        assert model.feature_extractor is extractor
+        assert model.encode is encode
+
+    def test_unexpected_encode_signature_left_alone(self):
+        model = _FakeFasterModel()
+        model.encode = lambda mel, extra: None
+        extractor = model.feature_extractor
+        with pytest.raises(wf.FeatureSharingUnsupported):
+            wf.install_faster_whisper(model)
+        assert model.feature_extractor is extractor
+
+
+class _FakeStableModel:
+    def __init__(self):
+        self.encoder = lambda mel: mel
+
+
+class TestStableTsGuards:
+    def test_untested_version_not_patched(self, monkeypatch):
+        monkeypatch.setattr(wf, "_installed_version", lambda name: "3.0.0")
+        model = _FakeStableModel()
+        encoder = model.encoder
+        with pytest.raises(wf.FeatureSharingUnsupported, match="3.0.0"):
+            wf.install_stable_ts(model)
+        assert model.encoder is encoder
+
+    def test_unexpected_mel_signature_not_patched(self, monkeypatch):
+        import sys
+        import types
+        module = types.ModuleType("fake_stable_mel")
+        module.log_mel_spectrogram = lambda audio: audio
+        original = module.log_mel_spectrogram
+        monkeypatch.setitem(sys.modules, "fake_stable_mel", module)
+        monkeypatch.setattr(wf, "_STABLE_TS_MEL_MODULES", ("fake_stable_mel",))
+        monkeypatch.setattr(wf, "_installed_version", lambda name: "2.17.4")
+        model = _FakeStableModel()
+        encoder = model.encoder
+        with pytest.raises(wf.FeatureSharingUnsupported, match="signature"):
+            wf.install_stable_ts(model)
+        assert module.log_mel_spectrogram is original
+        assert model.encoder is encoder
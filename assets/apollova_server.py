@@ -196,6 +196,11 @@ async def status():
         return {"error": "GUI not initialised"}
 
     tunnel_url = _settings.get("tunnel_url")
+    try:
+        from scripts.transcription_worker import worker_status
+        worker = worker_status()
+    except Exception:
+        worker = None
     return {
         "is_processing": getattr(gui, "is_processing", False),
         "cancel_requested": getattr(gui, "cancel_requested", False),
@@ -203,6 +208,7 @@ async def status():
         "tunnel_url": tunnel_url,
         "template": _settings.get("template", "aurora"),
         "mobile_enabled": _settings.get("mobile_enabled", True),
+        "transcription_worker": worker,
     }
 
 
@@ -1,7 +1,6 @@
 """Job Creation tab — Manual Entry, Smart Picker, Discover modes."""
 
 import os
-import tempfile
 import threading
 
 from PyQt6.QtWidgets import (
@@ -638,7 +637,7 @@ def start_discovery(app) -> None:
 
 
 def cancel_discovery(app) -> None:
-    """Set cancel flag — thread checks this between each song."""
+    """Set cancel flag — every discovery worker checks it before its next step."""
     app._discover_cancel_event.set()
     app.discover_cancel_btn.setEnabled(False)
     app.discover_phase_label.setText("Cancelling...")
@@ -646,10 +645,15 @@ def cancel_discovery(app) -> None:
 
 def run_discovery_pipeline(app, source_name: str, limit: int,
                            skip_existing: bool) -> None:
-    """Background thread: fetch Last.fm tracks -> find YouTube -> detect chorus."""
+    """Background thread: fetch Last.fm tracks -> find YouTube -> detect chorus.
+
+    YouTube search, download and chorus detection run concurrently across
+    tracks (scripts.discovery_executor); cancelling stops all of them.
+    """
     from scripts.lastfm_discovery import fetch_tracks
     from scripts.youtube_finder import find_youtube_url
-    from scripts.chorus_detector import detect_chorus, _heuristic_fallback
+    from scripts.chorus_detector import _heuristic_fallback
+    from scripts.discovery_executor import run_discovery
     # Import here to avoid circular — download_audio is set on module level
     from assets.apollova_gui import download_audio
 
@@ -687,43 +691,34 @@ def run_discovery_pipeline(app, source_name: str, limit: int,
             if skip_existing else "No tracks found for this source.")
         return
 
-    for i, track in enumerate(tracks):
-        if app._discover_cancel_event.is_set():
-            break
+    def find_url(track):
+        return find_youtube_url(
+            title=track.title,
+            artist=track.artist,
+            duration_sec=track.duration_sec_safe
+        )
 
-        song_label = track.db_title
-        app.signals.discovery_progress.emit("youtube", i + 1, total, song_label)
+    # Step 2+3: YouTube search + download on a thread pool, chorus detection
+    # in a process pool — results stream back as each song finishes
+    outcomes = run_discovery(
+        tracks, find_url, download_audio, app._discover_cancel_event,
+        progress_cb=lambda step, cur, tot, title:
+            app.signals.discovery_progress.emit(step, cur, tot, title))
 
-        try:
-            yt_result = find_youtube_url(
-                title=track.title,
-                artist=track.artist,
-                duration_sec=track.duration_sec_safe
-            )
-        except Exception:
-            yt_result = None
-
-        if not yt_result:
+    for o in outcomes:
+        if o.status == "no_youtube":
             results.append(DiscoveryResult(
-                track=track, youtube_url=None, youtube_confidence="none",
+                track=o.track, youtube_url=None, youtube_confidence="none",
                 start_mmss="00:00", end_mmss="01:00",
                 chorus_confidence=0.0, status="no_youtube",
             ))
             continue
 
-        app.signals.discovery_progress.emit("chorus", i + 1, total, song_label)
-        chorus = None
-        try:
-            with tempfile.TemporaryDirectory() as tmpdir:
-                audio_path = download_audio(yt_result.url, tmpdir)
-                chorus = detect_chorus(audio_path)
-        except Exception:
-            chorus = _heuristic_fallback(
-                track.duration_sec_safe, 60, "download_failed")
-
+        chorus = o.chorus or _heuristic_fallback(
+            o.track.duration_sec_safe, 60, "download_failed")
         results.append(DiscoveryResult(
-            track=track, youtube_url=yt_result.url,
-            youtube_confidence=yt_result.confidence,
+            track=o.track, youtube_url=o.yt_result.url,
+            youtube_confidence=o.yt_result.confidence,
             start_mmss=chorus.start_mmss, end_mmss=chorus.end_mmss,
             chorus_confidence=chorus.confidence, status="ready",
         ))
@@ -741,7 +736,9 @@ def on_discovery_progress(app, step: str, current: int, total: int,
             pct = 30 + int(current / total * 35)
         else:
             pct = 65 + int(current / total * 35)
-        app.discover_progress_bar.setValue(pct)
+        # Searches and chorus results arrive interleaved — never step back
+        app.discover_progress_bar.setValue(
+            max(pct, app.discover_progress_bar.value()))
 
     phase_map = {
         "lastfm": "Fetching chart data",
@@ -228,6 +228,17 @@ def process_jobs(app) -> None:
             except Exception:
                 pass
 
+        # Start loading the model in the shared worker while audio downloads
+        if Config.TRANSCRIBE_WORKER:
+            try:
+                from scripts.transcription_worker import warm_up
+                if warm_up():
+                    app.signals.log.emit(
+                        f"  \u2699 Transcription worker warming up "
+                        f"{Config.WHISPER_MODEL}")
+            except Exception:
+                pass
+
         if app.use_smart_picker:
             songs = list(app._smart_songs)
             tpl_label = "AUTO (Aurora/Mono/Onyx)" if t == "auto" else t.upper()
@@ -276,6 +287,13 @@ def process_jobs(app) -> None:
                 songs = songs[:remaining]
                 templates_for_jobs = templates_for_jobs[:remaining]
 
+            if Config.WHISPER_BATCH_TRANSCRIBE and len(songs) > 1:
+                pretranscribe_batch(app, [
+                    {"idx": start_idx + i, "title": s['song_title'],
+                     "url": s['youtube_url'], "start": s['start_time'],
+                     "end": s['end_time'], "template": templates_for_jobs[i]}
+                    for i, s in enumerate(songs)])
+
             skipped = []
             for i, s in enumerate(songs):
                 idx = start_idx + i
@@ -325,6 +343,16 @@ def process_jobs(app) -> None:
                 templates_for_jobs = [t] * total
                 outd.mkdir(parents=True, exist_ok=True)
 
+            if Config.WHISPER_BATCH_TRANSCRIBE and total > 1:
+                pretranscribe_batch(app, [
+                    {"idx": idx, "title": job['title'], "url": job['url'],
+                     "start": job['start'], "end": job['end'],
+                     "template": templates_for_jobs[idx - 1]}
+                    for idx, job in enumerate(app._job_queue, 1)
+                    if not (app._resume_mode and (
+                        JOBS_DIRS[templates_for_jobs[idx - 1]]
+                        / f"job_{idx:03}").exists())])
+
             skipped = []
             for idx, job in enumerate(app._job_queue, 1):
                 t_i = templates_for_jobs[idx - 1]
@@ -405,11 +433,23 @@ def process_jobs(app) -> None:
                 total_time=batch_elapsed,
                 device=device_str)
 
-        # Free GPU memory
+        # Free GPU memory held by this process; the transcription worker
+        # keeps its own copy warm until its idle timeout
         try:
-            from scripts.whisper_common import unload_model
+            from scripts.whisper_common import unload_model, clear_pretranscribed
+            clear_pretranscribed()
             unload_model()
-            app.signals.log.emit("  \u267b Whisper model unloaded")
+            if Config.TRANSCRIBE_WORKER:
+                app.signals.log.emit(
+                    "  \u267b Whisper model kept warm in transcription worker")
+            else:
+                app.signals.log.emit("  \u267b Whisper model unloaded")
+        except Exception:
+            pass
+
+        try:
+            from scripts.artifact_store import get_store
+            app.signals.log.emit(f"  \U0001f4e6 {get_store().summary()}")
         except Exception:
             pass
 
@@ -600,6 +640,12 @@ def run_with_ticker(app, fn, *args, **kwargs):
         elapsed += 1
         if app.cancel_requested:
             app.signals.log.emit("  Cancelling transcription\u2026")
+            # Abort the worker request first so the blocked socket read returns
+            try:
+                from scripts.transcription_worker import cancel_active
+                cancel_active()
+            except Exception:
+                pass
             tid = t.ident
             if tid is not None:
                 ctypes.pythonapi.PyThreadState_SetAsyncExc(
@@ -624,10 +670,91 @@ def run_with_ticker(app, fn, *args, **kwargs):
 
 # ── Single song processing ────────────────────────────────────────────────────
 
+def _needs_transcription(app, title: str, template: str,
+                         job_folder: Path) -> bool:
+    """True unless process_single_song would reuse cached lyrics."""
+    if template == 'aurora':
+        cached = app.song_db.get_song(title)
+        return not ((cached and cached.get('transcribed_lyrics'))
+                    or (job_folder / "lyrics.txt").exists())
+    cached = (app.song_db.get_mono_lyrics(title) if template == 'mono'
+              else app.song_db.get_onyx_lyrics(title))
+    if cached and cached.get('total_markers', 0) > 0:
+        return False
+    data_path = job_folder / f"{template}_data.json"
+    try:
+        return json.loads(data_path.read_text(encoding='utf-8')).get(
+            'total_markers', 0) == 0
+    except (OSError, ValueError):
+        return True
+
+
+def pretranscribe_batch(app, jobs) -> None:
+    """Download/trim every job, then transcribe them together pass-major (#42).
+
+    The per-song pipelines then pick the results up instead of running
+    their own passes.  Songs with cached lyrics are left out, and any song
+    that fails here is simply transcribed again inside its own job.
+    """
+    from assets.apollova_gui import Config
+    from scripts import whisper_common
+
+    requests = []
+    for job in jobs:
+        if app.cancel_requested:
+            raise Exception("Cancelled by user")
+        tpl = job['template']
+        job_folder = JOBS_DIRS[tpl] / f"job_{job['idx']:03}"
+        if not _needs_transcription(app, job['title'], tpl, job_folder):
+            continue
+        try:
+            job_folder = process_single_song(
+                app, job['idx'], job['title'], job['url'], job['start'],
+                job['end'], tpl, JOBS_DIRS[tpl], audio_only=True)
+            name = tpl.capitalize()
+            audio_path = str(job_folder / "audio_trimmed.wav")
+            key_params = ({} if name == "Aurora" else {"regroup_passes": list(
+                whisper_common.TEMPLATE_PASS_CONFIG[name]["regroup_passes"])})
+            store_key = whisper_common.whisper_store_key(
+                audio_path, name, **key_params)
+            if whisper_common.load_whisper_cache(str(job_folder), store_key,
+                                                 words=False):
+                continue
+            request = whisper_common.transcription_request(
+                str(job_folder), job['title'], name)
+            request["label"] = job['title'][:30]
+            requests.append(request)
+        except Exception as e:
+            if str(e) == "Cancelled by user":
+                raise
+            app.signals.log.emit(
+                f"  \u26a0 {job['title'][:40]}: {e} \u2014 "
+                "will retry in its own job")
+
+    if not requests:
+        return
+    app.signals.log.emit(
+        f"\n{'='*40}\n\U0001f3a4 Batch transcription: "
+        f"{len(requests)} song(s) ({Config.WHISPER_MODEL})")
+    t0 = time.time()
+    try:
+        done = app._run_with_ticker(whisper_common.pretranscribe, requests)
+        app.signals.log.emit(
+            f"  \u2713 {done}/{len(requests)} transcribed "
+            f"({time.time() - t0:.0f}s)")
+    except Exception as e:
+        if app.cancel_requested:
+            raise Exception("Cancelled by user")
+        app.signals.log.emit(
+            f"  \u26a0 Batch transcription failed ({e}) \u2014 "
+            "transcribing per song")
+
+
 def process_single_song(app, job_number: int, song_title: str,
                         youtube_url: str, start_time: str,
                         end_time: str, template: str,
-                        output_dir: Path, return_data: bool = False):
+                        output_dir: Path, return_data: bool = False,
+                        audio_only: bool = False):
     from assets.apollova_gui import (
         Config, download_audio, trim_audio, detect_beats,
         download_image, extract_colors, transcribe_audio,
@@ -665,10 +792,27 @@ def process_single_song(app, job_number: int, song_title: str,
         if app.cancel_requested:
             raise Exception("Cancelled by user")
 
-    # Audio download
+    # Clip download: only the start\u2192end window, straight to WAV
     chk()
     audio_path = job_folder / "audio_source.mp3"
-    if not audio_path.exists():
+    trimmed = job_folder / "audio_trimmed.wav"
+    if (Config.DOWNLOAD_SECTIONS and not trimmed.exists()
+            and not audio_path.exists()):
+        from scripts.audio_processing import download_audio_clip
+        app.signals.log.emit(
+            f"  Downloading clip ({start_time} \u2192 {end_time})\u2026")
+        try:
+            app._run_step(
+                job_number, "Audio clip download",
+                download_audio_clip, youtube_url, str(job_folder),
+                start_time, end_time)
+        except Exception as clip_err:
+            app.signals.log.emit(
+                f"  \u26a0 Clip download failed ({clip_err}) "
+                f"\u2014 downloading full song")
+
+    # Audio download
+    if not audio_path.exists() and not trimmed.exists():
         app.signals.log.emit("  Downloading audio\u2026")
         app._run_step(
             job_number, "Audio download",
@@ -684,7 +828,6 @@ def process_single_song(app, job_number: int, song_title: str,
 
     # Trim
     chk()
-    trimmed = job_folder / "audio_trimmed.wav"
     if not trimmed.exists():
         app.signals.log.emit(
             f"  Trimming ({start_time} \u2192 {end_time})\u2026")
@@ -699,10 +842,12 @@ def process_single_song(app, job_number: int, song_title: str,
     else:
         app.signals.log.emit("  \u2713 Trimmed audio exists")
 
-    # Verify trimmed audio duration
+    # Verify trimmed audio duration (WAV header only — no decode)
     try:
-        from pydub import AudioSegment as _AS
-        actual_dur = len(_AS.from_file(str(trimmed))) / 1000.0
+        from scripts.audio_processing import wav_duration
+        actual_dur = wav_duration(str(trimmed))
+        if actual_dur is None:
+            raise ValueError(f"unreadable WAV header: {trimmed.name}")
         s_parts = start_time.split(':')
         e_parts = end_time.split(':')
         expected_dur = (
@@ -715,11 +860,19 @@ def process_single_song(app, job_number: int, song_title: str,
             app.signals.log.emit(
                 f"  \u26a0 audio_trimmed.wav too long "
                 f"({actual_dur:.1f}s) \u2014 re-trimming")
-            trimmed.unlink()
-            app._run_step(
-                job_number, "Audio re-trim",
-                trim_audio, str(job_folder), start_time, end_time)
-            actual_dur = len(_AS.from_file(str(trimmed))) / 1000.0
+            # trim_window replaces the clip only once the new one is written
+            if audio_path.exists():
+                app._run_step(
+                    job_number, "Audio re-trim",
+                    trim_audio, str(job_folder), start_time, end_time)
+            else:
+                # Clip download: there is no audio_source.mp3 to cut from
+                from scripts.audio_processing import download_audio_clip
+                app._run_step(
+                    job_number, "Audio clip re-download",
+                    download_audio_clip, youtube_url, str(job_folder),
+                    start_time, end_time)
+            actual_dur = wav_duration(str(trimmed)) or 0.0
             app.signals.log.emit(
                 f"  \u2713 Re-trimmed: {actual_dur:.1f}s")
     except Exception as dur_err:
@@ -734,6 +887,9 @@ def process_single_song(app, job_number: int, song_title: str,
         except Exception:
             pass
 
+    if audio_only:
+        return job_folder
+
     # Log Whisper device
     try:
         from scripts.whisper_common import get_device_info
@@ -756,7 +912,8 @@ def process_single_song(app, job_number: int, song_title: str,
             app.signals.log.emit("  Detecting beats\u2026")
             beats = app._run_step(
                 job_number, "Beat detection",
-                detect_beats, str(job_folder))
+                detect_beats, str(job_folder),
+                youtube_url, start_time, end_time)
             with open(beats_path, 'w', encoding='utf-8') as f:
                 json.dump(beats, f, indent=4)
             app.signals.log.emit(f"  \u2713 {len(beats)} beats")
@@ -767,6 +924,7 @@ def process_single_song(app, job_number: int, song_title: str,
 
     # Transcribe (per-template)
     chk()
+    from scripts.whisper_common import COMPACT_JSON
     lyrics_path = job_folder / "lyrics.txt"
     lyrics_was_transcribed = False
     if template == 'aurora':
@@ -774,7 +932,7 @@ def process_single_song(app, job_number: int, song_title: str,
             with open(lyrics_path, 'w', encoding='utf-8') as f:
                 json.dump(
                     cached['transcribed_lyrics'], f,
-                    indent=4, ensure_ascii=False)
+                    **COMPACT_JSON)
             app.signals.log.emit(
                 f"  \u2713 Cached lyrics "
                 f"({len(cached['transcribed_lyrics'])} segs)")
@@ -809,7 +967,8 @@ def process_single_song(app, job_number: int, song_title: str,
         if cached_mono and cached_mono.get('total_markers', 0) > 0:
             with open(mono_path, 'w', encoding='utf-8') as f:
                 json.dump(
-                    cached_mono, f, indent=4, ensure_ascii=False)
+                    cached_mono, f,
+                    **COMPACT_JSON)
             app.signals.log.emit("  \u2713 Cached mono lyrics")
         elif (not mono_path.exists()
               or json.loads(mono_path.read_text(encoding='utf-8')).get(
@@ -825,7 +984,8 @@ def process_single_song(app, job_number: int, song_title: str,
             if mono_result:
                 with open(mono_path, 'w', encoding='utf-8') as f:
                     json.dump(
-                        mono_result, f, indent=4, ensure_ascii=False)
+                        mono_result, f,
+                        **COMPACT_JSON)
             app.signals.log.emit(
                 f"  \u2713 Transcribed mono ({elapsed:.0f}s)")
             lyrics_was_transcribed = True
@@ -848,7 +1008,8 @@ def process_single_song(app, job_number: int, song_title: str,
         if cached_onyx and cached_onyx.get('total_markers', 0) > 0:
             with open(onyx_path, 'w', encoding='utf-8') as f:
                 json.dump(
-                    cached_onyx, f, indent=4, ensure_ascii=False)
+                    cached_onyx, f,
+                    **COMPACT_JSON)
             app.signals.log.emit("  \u2713 Cached onyx lyrics")
         elif (not onyx_path.exists()
               or json.loads(onyx_path.read_text(encoding='utf-8')).get(
@@ -864,7 +1025,8 @@ def process_single_song(app, job_number: int, song_title: str,
             if onyx_result:
                 with open(onyx_path, 'w', encoding='utf-8') as f:
                     json.dump(
-                        onyx_result, f, indent=4, ensure_ascii=False)
+                        onyx_result, f,
+                        **COMPACT_JSON)
             app.signals.log.emit(
                 f"  \u2713 Transcribed onyx ({elapsed:.0f}s)")
             lyrics_was_transcribed = True
@@ -0,0 +1,193 @@
+"""
+Artifact Store - content-addressed cache for expensive per-song outputs
+Shared across Aurora, Mono, and Onyx templates and across batches
+
+Entries are keyed by the audio hash plus the parameters that produced them
+(model name, pass config, Demucs model, ...), so re-running a song that was
+processed before skips straight to the cheap stages.  Kinds stored today:
+  - vocals   → Demucs vocal stem (.wav)
+  - prepared → normalized (+ denoised) Whisper input samples (.npy)
+  - whisper  → raw Whisper segments (.json, same layout as whisper_raw.json)
+  - pass     → one raw (unregrouped) Whisper pass, shared by every template (.json)
+  - features → full-song beats / tempo / chroma / RMS per YouTube video (.npz)
+
+The store has a disk budget (ARTIFACT_CACHE_MAX_MB); the least recently used
+entries are evicted first.  Files are hardlinked into job folders instead of
+copied, so callers must replace (never rewrite in place) materialised files.
+"""
+import os
+import json
+import shutil
+import hashlib
+import threading
+import tempfile
+
+from scripts.config import Config
+
+
+def file_hash(path):
+    """SHA-256 (first 16 hex chars) of a file's bytes."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            h.update(chunk)
+    return h.hexdigest()[:16]
+
+
+class ArtifactStore:
+    """Disk-budgeted, LRU-evicted cache of files addressed by content + params"""
+
+    def __init__(self, root=None, max_bytes=None):
+        self.root = root or Config.ARTIFACT_CACHE_DIR
+        if max_bytes is None:
+            max_bytes = Config.ARTIFACT_CACHE_MAX_MB * 1024 * 1024
+        self.max_bytes = max_bytes
+        self.hits = {}
+        self.misses = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Keys and paths
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def key(audio_hash, **params):
+        """Stable key for an audio hash plus the parameters that produced an artifact."""
+        blob = json.dumps(params, sort_keys=True, default=str)
+        digest = hashlib.sha256(blob.encode("utf-8")).hexdigest()[:12]
+        return f"{audio_hash}-{digest}"
+
+    def path_for(self, kind, key, ext):
+        return os.path.join(self.root, kind, f"{key}{ext}")
+
+    # ------------------------------------------------------------------
+    # Lookup / insert
+    # ------------------------------------------------------------------
+
+    def get(self, kind, key, ext):
+        """Return the stored path (and mark it recently used), or None on a miss."""
+        path = self.path_for(kind, key, ext)
+        with self._lock:
+            if os.path.exists(path):
+                self.hits[kind] = self.hits.get(kind, 0) + 1
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+                return path
+            self.misses[kind] = self.misses.get(kind, 0) + 1
+            return None
+
+    def put_file(self, kind, key, src_path, ext=None):
+        """Copy src_path into the store (atomically) and return the stored path."""
+        if ext is None:
+            ext = os.path.splitext(src_path)[1]
+        path = self.path_for(kind, key, ext)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copyfile(src_path, tmp)
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self.evict()
+        return path
+
+    def put_bytes(self, kind, key, data, ext):
+        """Store raw bytes (atomically) and return the stored path."""
+        path = self.path_for(kind, key, ext)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self.evict()
+        return path
+
+    @staticmethod
+    def materialize(stored_path, dest_path):
+        """Hardlink a stored artifact into a job folder (copy across volumes)."""
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+        try:
+            os.link(stored_path, dest_path)
+        except OSError:
+            shutil.copy2(stored_path, dest_path)
+        return dest_path
+
+    # ------------------------------------------------------------------
+    # Budget
+    # ------------------------------------------------------------------
+
+    def _entries(self):
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def total_bytes(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Delete least recently used entries until the store fits its budget."""
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            if total <= self.max_bytes:
+                return 0
+            removed = 0
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                    removed += 1
+                except OSError:
+                    pass
+            if removed:
+                print(f"  \U0001f5d1 Artifact store: evicted {removed} entr{'y' if removed == 1 else 'ies'}")
+            return removed
+
+    def stats(self):
+        """Hit/miss counters per kind plus current disk usage."""
+        return {
+            "hits": dict(self.hits),
+            "misses": dict(self.misses),
+            "bytes": self.total_bytes(),
+            "max_bytes": self.max_bytes,
+        }
+
+    def summary(self):
+        hits = sum(self.hits.values())
+        lookups = hits + sum(self.misses.values())
+        return (f"Artifact store: {hits}/{lookups} hits, "
+                f"{self.total_bytes() / (1024 * 1024):.0f} MB of "
+                f"{self.max_bytes / (1024 * 1024):.0f} MB")
+
+
+_store = None
+
+
+def get_store():
+    """Process-wide store rooted at Config.ARTIFACT_CACHE_DIR."""
+    global _store
+    if _store is None or _store.root != Config.ARTIFACT_CACHE_DIR:
+        _store = ArtifactStore()
+    return _store
@@ -3,21 +3,37 @@ Audio Processing - Download, trim, beat detection, and audio preprocessing
 Shared across Aurora, Mono, and Onyx templates
 
 - download_audio: YouTube download via yt-dlp
-- trim_audio: Clip extraction based on MM:SS timestamps
-- detect_beats: Beat detection via librosa (Aurora only)
+- download_audio_clip: download only the clip window (yt-dlp download
+  ranges, native container, no MP3 encode) straight to audio_trimmed.wav
+- trim_audio: Clip extraction based on MM:SS timestamps (seek-based: only
+  the requested window is decoded, via ffmpeg input seeking or soundfile)
+- detect_beats: Beat detection via librosa (Aurora only); sliced from the
+  cached discovery-time song features when available
+- AudioBuffer / load_audio_buffer: decode a clip once to 16 kHz mono float32
 - normalize_audio: Normalize to -20 dBFS for consistent Whisper input
 - reduce_noise: Stationary noise reduction (optional, requires noisereduce)
 """
 import os
-import re
+import sys
+import glob
+import math
 import time
+import shutil
 import subprocess
 import wave
+from dataclasses import dataclass
+
+import numpy as np
 from pydub import AudioSegment
 
-_YT_ID_RE = re.compile(r'(?:youtube\.com/watch\?.*v=|youtu\.be/)([A-Za-z0-9_-]{11})')
+from scripts.youtube_ids import youtube_id
+
 _COOKIE_BROWSERS = ('chrome', 'edge', 'firefox', 'brave', 'chromium')
 
+# Extra audio fetched on each side of a clip window, so a stream-copy cut
+# that lands on a packet boundary still covers the exact trim points
+SECTION_MARGIN_SEC = 2.0
+
 
 def _find_cookies_file():
     """Look for cookies.txt in install root (next to Apollova.exe) or alongside script."""
@@ -50,7 +66,7 @@ def _validate_youtube_url(url):
             "and replace 'unknown' with a real YouTube URL "
             "(e.g. https://www.youtube.com/watch?v=XXXXXXXXXXX)."
         )
-    if not _YT_ID_RE.search(url):
+    if not youtube_id(url):
         raise ValueError(
             f"The URL stored for this song is not a valid YouTube video link:\n"
             f"  '{url}'\n\n"
@@ -60,20 +76,27 @@ def _validate_youtube_url(url):
         )
 
 
-def download_audio(url, job_folder, max_retries=3, use_oauth=True):
-    """Download audio from YouTube URL using yt-dlp"""
+def download_audio(url, job_folder, max_retries=3, use_oauth=True, section=None):
+    """
+    Download audio from YouTube URL using yt-dlp.
+
+    section: optional (start_sec, end_sec) — fetch only that range via
+    yt-dlp download ranges and keep the stream's native container (m4a /
+    webm) instead of transcoding to MP3.  Returns the section file path.
+    """
     import yt_dlp  # Deferred: slow import, only needed on actual download
 
     mp3_path = os.path.join(job_folder, 'audio_source.mp3')
 
-    if os.path.exists(mp3_path):
+    if section is None and os.path.exists(mp3_path):
         print(f"✓ Audio already downloaded")
         return mp3_path
 
     _validate_youtube_url(url)
-    print(f"Downloading audio...")
+    print(f"Downloading audio..." if section is None else
+          f"Downloading audio section {section[0]:.0f}s\u2013{section[1]:.0f}s...")
 
-    temp_base = os.path.join(job_folder, 'yt_temp')
+    temp_base = os.path.join(job_folder, 'yt_temp' if section is None else 'yt_section')
 
     base_opts = {
         'format': 'bestaudio[ext=m4a]/bestaudio/best',
@@ -91,6 +114,18 @@ def download_audio(url, job_folder, max_retries=3, use_oauth=True):
         'remote_components': ['ejs:github'],
     }
 
+    if section is not None:
+        # Left over from an interrupted clip download; the section file is
+        # picked by glob below, so it must be the only one
+        for stale in glob.glob(glob.escape(temp_base) + '.*'):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+        from yt_dlp.utils import download_range_func
+        del base_opts['postprocessors']
+        base_opts['download_ranges'] = download_range_func(None, [tuple(section)])
+
     cookies_file = _find_cookies_file()
     if cookies_file:
         base_opts['cookiefile'] = cookies_file
@@ -99,6 +134,12 @@ def download_audio(url, job_folder, max_retries=3, use_oauth=True):
     def _run(opts):
         with yt_dlp.YoutubeDL(opts) as ydl:
             ydl.download([url])
+        if section is not None:
+            files = [f for f in glob.glob(glob.escape(temp_base) + '.*')
+                     if not f.endswith(('.part', '.ytdl'))]
+            if not files:
+                raise Exception("Audio section not found after download")
+            return files[0]
         temp_mp3 = temp_base + '.mp3'
         if os.path.exists(temp_mp3):
             os.rename(temp_mp3, mp3_path)
@@ -169,6 +210,35 @@ def download_audio(url, job_folder, max_retries=3, use_oauth=True):
     raise last_exc
 
 
+def download_audio_clip(url, job_folder, start_time, end_time, max_retries=3):
+    """
+    Download only start_time–end_time (MM:SS) plus SECTION_MARGIN_SEC on
+    each side, cut audio_trimmed.wav from it and delete the section file.
+    No audio_source.mp3 is produced.  Raises on any failure so the caller
+    can fall back to download_audio + trim_audio.
+    """
+    start_sec = mmss_to_milliseconds(start_time) / 1000
+    end_sec = mmss_to_milliseconds(end_time) / 1000
+    if start_sec >= end_sec:
+        raise ValueError("Start time must be before end time")
+
+    section_start = max(0.0, start_sec - SECTION_MARGIN_SEC)
+    section_path = download_audio(url, job_folder, max_retries=max_retries,
+                                  section=(section_start, end_sec + SECTION_MARGIN_SEC))
+    try:
+        size_mb = os.path.getsize(section_path) / (1024 * 1024)
+        export_path = os.path.join(job_folder, "audio_trimmed.wav")
+        duration = trim_window(section_path, export_path,
+                               start_sec - section_start, end_sec - section_start)
+        print(f"✓ Clip downloaded ({size_mb:.1f} MB section): {duration:.1f}s clip created")
+        return export_path
+    finally:
+        try:
+            os.remove(section_path)
+        except OSError:
+            pass
+
+
 def mmss_to_milliseconds(time_str):
     """Convert MM:SS to milliseconds"""
     try:
@@ -183,6 +253,81 @@ def mmss_to_milliseconds(time_str):
         raise
 
 
+def _ffmpeg_trim(src, dst, start_sec, duration_sec):
+    """
+    Input seeking (-ss/-t before -i): ffmpeg jumps to the window and decodes
+    only it.  Output keeps the source rate/channels as 16-bit PCM, like the
+    pydub export did.  Returns False when ffmpeg is not on PATH.
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        return False
+    flags = getattr(subprocess, "CREATE_NO_WINDOW", 0) if sys.platform == "win32" else 0
+    cmd = [ffmpeg, "-hide_banner", "-loglevel", "error", "-y",
+           "-ss", f"{start_sec:.3f}", "-t", f"{duration_sec:.3f}", "-i", src,
+           "-vn", "-map_metadata", "-1", "-c:a", "pcm_s16le", "-f", "wav", dst]
+    r = subprocess.run(cmd, capture_output=True, text=True, creationflags=flags)
+    if r.returncode != 0:
+        raise RuntimeError(f"ffmpeg exited {r.returncode}: {r.stderr.strip()[-300:]}")
+    return True
+
+
+def _soundfile_trim(src, dst, start_sec, duration_sec):
+    """
+    Frame-accurate seek + read of the window only (libsndfile >= 1.1 reads
+    MP3).  A start past the end writes an empty clip instead of seeking
+    (libsndfile fails that seek), so trim_window reports the short source
+    rather than falling through to a full pydub decode.
+    """
+    import soundfile as sf
+    with sf.SoundFile(src) as f:
+        start = int(round(start_sec * f.samplerate))
+        if start >= f.frames:
+            data = np.zeros((0, f.channels), dtype="int16")
+        else:
+            f.seek(start)
+            data = f.read(int(round(duration_sec * f.samplerate)), dtype="int16")
+        sf.write(dst, data, f.samplerate, subtype="PCM_16", format="WAV")
+    return True
+
+
+def _pydub_trim(src, dst, start_sec, duration_sec):
+    """Last resort: full decode through pydub, then slice."""
+    start_ms = int(start_sec * 1000)
+    clip = AudioSegment.from_file(src)[start_ms:start_ms + int(duration_sec * 1000)]
+    clip.export(dst, format="wav")
+    return True
+
+
+def trim_window(src, dst, start_sec, end_sec):
+    """
+    Write [start_sec, end_sec) of src to dst as WAV, decoding only that
+    window when ffmpeg or soundfile can seek.  The file is written next to
+    dst and renamed into place, so dst never exists half-written.
+    Returns the clip duration read from the written WAV header.
+    """
+    duration_sec = end_sec - start_sec
+    part = dst + ".part"
+    last_exc = None
+    for trim in (_ffmpeg_trim, _soundfile_trim, _pydub_trim):
+        try:
+            if trim(src, part, start_sec, duration_sec) and os.path.exists(part):
+                break
+        except Exception as e:
+            last_exc = e
+        if os.path.exists(part):
+            os.remove(part)
+    else:
+        raise last_exc or RuntimeError("no trimming backend available")
+
+    duration = wav_duration(part)
+    if not duration:
+        os.remove(part)
+        raise ValueError(f"trimmed clip is empty (source shorter than {start_sec:.0f}s?)")
+    os.replace(part, dst)
+    return duration
+
+
 def trim_audio(job_folder, start_time, end_time):
     """Trim audio file to specified timestamps (MM:SS format)"""
     audio_path = os.path.join(job_folder, 'audio_source.mp3')
@@ -192,8 +337,6 @@ def trim_audio(job_folder, start_time, end_time):
         return None
     
     try:
-        song = AudioSegment.from_file(audio_path, format="mp3")
-        
         start_ms = mmss_to_milliseconds(start_time)
         end_ms = mmss_to_milliseconds(end_time)
         
@@ -201,12 +344,8 @@ def trim_audio(job_folder, start_time, end_time):
             print("❌ Start time must be before end time")
             return None
         
-        clip = song[start_ms:end_ms]
-        
         export_path = os.path.join(job_folder, "audio_trimmed.wav")
-        clip.export(export_path, format="wav")
-        
-        duration = (end_ms - start_ms) / 1000
+        duration = trim_window(audio_path, export_path, start_ms / 1000, end_ms / 1000)
         print(f"✓ Trimmed audio: {duration:.1f}s clip created")
         
         return export_path
@@ -216,11 +355,29 @@ def trim_audio(job_folder, start_time, end_time):
         raise
 
 
-def detect_beats(job_folder):
+def detect_beats(job_folder, source_url=None, start_time=None, end_time=None):
     """
     Detect beats in trimmed audio using librosa.
     Used by Aurora for beat-synced effects. Mono/Onyx don't need this.
+
+    When the song was analysed at discovery time (chorus_detector feature
+    cache, keyed by its YouTube URL), the beats of the start_time–end_time
+    window are sliced from the cache and no audio is decoded.
     """
+    if source_url and start_time and end_time:
+        try:
+            from scripts.chorus_detector import load_song_features
+            features = load_song_features(source_url)
+            if features is not None:
+                beats_list = features.beats_in_window(
+                    mmss_to_milliseconds(start_time) / 1000,
+                    mmss_to_milliseconds(end_time) / 1000)
+                print(f"✓ {len(beats_list)} beats from cached song analysis "
+                      f"(tempo ≈ {features.tempo:.1f} BPM)")
+                return beats_list
+        except Exception as e:
+            print(f"⚠️  Cached song analysis unavailable: {e}")
+
     import librosa
     
     audio_path = os.path.join(job_folder, "audio_trimmed.wav")
@@ -251,58 +408,104 @@ def detect_beats(job_folder):
         return []
 
 
-def normalize_audio(audio_path):
+# ============================================================================
+# DECODE-ONCE AUDIO BUFFER
+# ============================================================================
+
+WHISPER_SAMPLE_RATE = 16000
+NORMALIZE_TARGET_DBFS = -20.0
+
+
+@dataclass
+class AudioBuffer:
     """
-    Normalize audio to -20 dBFS for consistent Whisper input levels.
-    Caches result as *_norm.wav to avoid re-processing.
-    Returns (normalized_path, duration_seconds).
+    A clip decoded once to 16 kHz mono float32 (Whisper's native input).
+
+    Threaded through duration checks, normalisation, noise reduction and the
+    silence analysis so none of them re-decode the file.  `path` is the file
+    the samples came from (or were last written to); derived buffers have no
+    path until write_wav() is called for a tool that needs one.
     """
-    base, _ = os.path.splitext(audio_path)
-    norm_path = base + '_norm.wav'
-    if os.path.exists(norm_path):
-        try:
-            with wave.open(norm_path, 'rb') as wf:
-                duration = wf.getnframes() / wf.getframerate()
-            return norm_path, duration
-        except Exception:
-            # Corrupt cache — delete and re-normalize
-            os.remove(norm_path)
+    samples: np.ndarray
+    sample_rate: int = WHISPER_SAMPLE_RATE
+    path: str | None = None
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / float(self.sample_rate)
+
+    @property
+    def dbfs(self) -> float:
+        """Loudness relative to full scale (same definition as pydub's dBFS)."""
+        if not len(self.samples):
+            return float('-inf')
+        rms = float(np.sqrt(np.mean(np.square(self.samples, dtype=np.float64))))
+        return 20.0 * math.log10(rms) if rms > 0 else float('-inf')
+
+    def derive(self, samples) -> "AudioBuffer":
+        """New buffer with processed samples (same rate, not yet on disk)."""
+        return AudioBuffer(np.asarray(samples, dtype=np.float32), self.sample_rate, None)
+
+    def write_wav(self, path) -> str:
+        """Write the samples to a WAV file and remember the path."""
+        import soundfile as sf
+        sf.write(path, self.samples, self.sample_rate)
+        self.path = path
+        return path
+
+
+def load_audio_buffer(audio_path):
+    """Decode audio_path once to a 16 kHz mono AudioBuffer. Returns None on failure."""
+    try:
+        import librosa
+        y, sr = librosa.load(audio_path, sr=WHISPER_SAMPLE_RATE, mono=True)
+        return AudioBuffer(y.astype(np.float32, copy=False), sr, audio_path)
+    except Exception as e:
+        print(f"  \u26a0 Could not decode {os.path.basename(audio_path)}: {e}")
+        return None
+
+
+def wav_duration(wav_path):
+    """Duration of a WAV file from its header (no decode). Returns None on failure."""
     try:
-        audio = AudioSegment.from_file(audio_path)
-        duration = len(audio) / 1000.0
-        if audio.dBFS == float('-inf'):
-            return audio_path, duration
-        change = -20.0 - audio.dBFS
-        normalized = audio.apply_gain(change)
-        normalized.export(norm_path, format='wav')
+        with wave.open(wav_path, 'rb') as wf:
+            return wf.getnframes() / float(wf.getframerate())
+    except Exception:
+        return None
+
+
+def normalize_audio(buffer, target_dbfs=NORMALIZE_TARGET_DBFS):
+    """
+    Normalize an AudioBuffer to -20 dBFS for consistent Whisper input levels.
+    Returns a new in-memory buffer (the input is returned unchanged if silent).
+    """
+    try:
+        level = buffer.dbfs
+        if level == float('-inf'):
+            return buffer
+        gain = 10.0 ** ((target_dbfs - level) / 20.0)
+        normalized = np.clip(buffer.samples * gain, -1.0, 1.0)
         print("  Audio normalized to -20 dBFS")
-        return norm_path, duration
+        return buffer.derive(normalized)
     except Exception as e:
         print(f"  Normalization failed: {e}")
-        return audio_path, None
+        return buffer
 
 
-def reduce_noise(audio_path):
+def reduce_noise(buffer):
     """
     Apply stationary noise reduction to remove reverb tails and recording noise.
-    Caches result as *_clean.wav. Falls back to original if noisereduce unavailable.
+    Works on the in-memory AudioBuffer; returns the input if noisereduce is unavailable.
     """
-    base, _ = os.path.splitext(audio_path)
-    clean_path = base + '_clean.wav'
-    if os.path.exists(clean_path):
-        return clean_path
     try:
         import noisereduce as nr
-        import librosa
-        import soundfile as sf
-        y, sr = librosa.load(audio_path, sr=16000)
-        y_clean = nr.reduce_noise(y=y, sr=sr, stationary=True, prop_decrease=0.75)
-        sf.write(clean_path, y_clean, sr)
+        y_clean = nr.reduce_noise(y=buffer.samples, sr=buffer.sample_rate,
+                                  stationary=True, prop_decrease=0.75)
         print("  Noise reduction applied")
-        return clean_path
+        return buffer.derive(y_clean)
     except ImportError:
         print("  noisereduce not installed, skipping noise reduction")
-        return audio_path
+        return buffer
     except Exception as e:
         print(f"  Noise reduction failed: {e}")
-        return audio_path
+        return buffer
@@ -2,8 +2,14 @@
 chorus_detector.py
 Detects the chorus/hook of a song using librosa's recurrence matrix.
 No external API required — runs entirely on the local audio file.
+
+The song is analysed once (beats, tempo, chroma, RMS) into SongFeatures,
+which are cached in the artifact store per YouTube video.  Aurora's beat
+detection later slices the beats for its trim window from that cache
+instead of decoding the clip again.
 """
 
+import io
 import logging
 import tempfile
 import os
@@ -13,6 +19,8 @@ from typing import Optional, Tuple
 
 import numpy as np
 
+from scripts.youtube_ids import youtube_id
+
 try:
     import librosa
     LIBROSA_AVAILABLE = True
@@ -24,10 +32,22 @@ logger = logging.getLogger(__name__)
 # Analysis parameters
 _SR          = 11025   # Sample rate for analysis (low = fast, sufficient for structure)
 _HOP_LENGTH  = 512     # Frames per hop
+# Beat-tracking hop (~11.6 ms).  Finer than _HOP_LENGTH on purpose: Aurora's
+# detect_beats slices these beats from the cache instead of tracking the clip
+# at its native rate (512 hop at 44.1 kHz, the same grid).  Tracking costs
+# ~4x the old 512-hop pass here, about what the skipped detect_beats pass
+# cost, and the chorus start now snaps to beats on this finer grid.
+_BEAT_HOP    = 128
 _N_STEPS     = 10      # Memory embedding steps
 _DELAY       = 3       # Delay between embedded steps
 _INTRO_SKIP  = 0.15    # Skip first 15% of song (intro avoidance)
 _TARGET_DURATION = 60  # Desired clip length in seconds
+_RECURRENCE_BLOCK = 256  # Frames per block of the chunked cosine-distance search
+_FEATURES_VERSION = 1  # Bump when the analysis parameters change
+
+
+class FeaturesNotCached(LookupError):
+    """No audio was given and the video's SongFeatures are not in the cache."""
 
 
 @dataclass
@@ -46,6 +66,118 @@ class ChorusResult:
         return _sec_to_mmss(self.end_sec)
 
 
+@dataclass
+class SongFeatures:
+    """One analysis pass over a full song, shared by chorus and beat detection."""
+    duration: float
+    tempo: float
+    beat_times: np.ndarray   # seconds from song start
+    chroma: np.ndarray       # (12, frames) at _SR / _HOP_LENGTH
+    rms: np.ndarray          # (frames,) at _SR / _HOP_LENGTH
+    sr: int = _SR
+    hop_length: int = _HOP_LENGTH
+
+    def beats_in_window(self, start_sec: float, end_sec: float) -> list:
+        """Beat times inside [start_sec, end_sec), relative to start_sec."""
+        b = self.beat_times
+        return [float(t) for t in b[(b >= start_sec) & (b < end_sec)] - start_sec]
+
+    def to_bytes(self) -> bytes:
+        buf = io.BytesIO()
+        np.savez_compressed(
+            buf, duration=self.duration, tempo=self.tempo,
+            beat_times=self.beat_times.astype(np.float64),
+            chroma=self.chroma.astype(np.float32), rms=self.rms.astype(np.float32),
+            sr=self.sr, hop_length=self.hop_length)
+        return buf.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SongFeatures":
+        with np.load(io.BytesIO(data)) as z:
+            return cls(duration=float(z["duration"]), tempo=float(z["tempo"]),
+                       beat_times=z["beat_times"], chroma=z["chroma"], rms=z["rms"],
+                       sr=int(z["sr"]), hop_length=int(z["hop_length"]))
+
+
+def analyze_song(audio_path: str) -> SongFeatures:
+    """Decode the song once at _SR and compute every feature the detectors use."""
+    if not LIBROSA_AVAILABLE:
+        raise ImportError("librosa is not installed")
+
+    y, sr = librosa.load(audio_path, sr=_SR, mono=True)
+    duration = librosa.get_duration(y=y, sr=sr)
+    logger.info(f"Loaded {Path(audio_path).name}: {duration:.1f}s at {sr}Hz")
+
+    tempo, beat_frames = librosa.beat.beat_track(y=y, sr=sr, hop_length=_BEAT_HOP)
+    beat_times = librosa.frames_to_time(beat_frames, sr=sr, hop_length=_BEAT_HOP)
+    tempo = np.atleast_1d(tempo)
+    chroma = librosa.feature.chroma_cqt(y=y, sr=sr, hop_length=_HOP_LENGTH, bins_per_octave=36)
+    rms = librosa.feature.rms(y=y, hop_length=_HOP_LENGTH)[0]
+    return SongFeatures(
+        duration=float(duration),
+        tempo=float(tempo[0]) if len(tempo) else 120.0,
+        beat_times=np.asarray(beat_times, dtype=np.float64),
+        chroma=chroma, rms=rms,
+    )
+
+
+def _features_key(source_url: Optional[str]) -> Optional[str]:
+    video_id = youtube_id(source_url)
+    if not video_id:
+        return None
+    from scripts.artifact_store import get_store
+    return get_store().key(f"yt_{video_id}", sr=_SR, hop=_HOP_LENGTH,
+                           beat_hop=_BEAT_HOP, version=_FEATURES_VERSION)
+
+
+def load_song_features(source_url: Optional[str]) -> Optional[SongFeatures]:
+    """Cached SongFeatures of a YouTube video, or None on a miss."""
+    key = _features_key(source_url)
+    if not key:
+        return None
+    try:
+        from scripts.artifact_store import get_store
+        stored = get_store().get("features", key, ".npz")
+        if not stored:
+            return None
+        with open(stored, "rb") as f:
+            return SongFeatures.from_bytes(f.read())
+    except Exception as e:
+        logger.warning(f"Song feature cache unreadable: {e}")
+        return None
+
+
+def has_song_features(source_url: Optional[str]) -> bool:
+    """True when the video was analysed before (no audio download needed)."""
+    key = _features_key(source_url)
+    if not key:
+        return False
+    from scripts.artifact_store import get_store
+    return os.path.exists(get_store().path_for("features", key, ".npz"))
+
+
+def song_features(audio_path: str, source_url: Optional[str] = None) -> SongFeatures:
+    """
+    SongFeatures for audio_path, from the cache when source_url was analysed
+    before.  Raises FeaturesNotCached when audio_path is None and the entry
+    is gone (evicted since has_song_features said otherwise).
+    """
+    features = load_song_features(source_url)
+    if features is not None:
+        return features
+    if audio_path is None:
+        raise FeaturesNotCached(source_url)
+    features = analyze_song(audio_path)
+    key = _features_key(source_url)
+    if key:
+        try:
+            from scripts.artifact_store import get_store
+            get_store().put_bytes("features", key, features.to_bytes(), ".npz")
+        except Exception as e:
+            logger.warning(f"Could not cache song features: {e}")
+    return features
+
+
 def _sec_to_mmss(sec: float) -> str:
     sec = max(0, int(round(sec)))
     return f"{sec // 60:02d}:{sec % 60:02d}"
@@ -60,17 +192,21 @@ def _snap_to_beat(time_sec: float, beat_times: np.ndarray) -> float:
 
 
 def detect_chorus(
-    audio_path: str,
+    audio_path: Optional[str],
     target_duration: int = _TARGET_DURATION,
     intro_skip_ratio: float = _INTRO_SKIP,
+    source_url: Optional[str] = None,
 ) -> ChorusResult:
     """
     Detect the chorus/hook of a song from its audio file.
 
     Args:
-        audio_path: Path to the audio file (mp3, wav, m4a etc.)
+        audio_path: Path to the audio file (mp3, wav, m4a etc.); may be None
+            when source_url's features are already cached
         target_duration: Desired clip length in seconds (default 60)
         intro_skip_ratio: Skip this fraction of the song from the start (default 0.15)
+        source_url: YouTube URL of the song; its SongFeatures are cached
+            under the video id for detect_beats and later runs
 
     Returns:
         ChorusResult with start/end times in seconds and MM:SS format
@@ -78,82 +214,35 @@ def detect_chorus(
     if not LIBROSA_AVAILABLE:
         raise ImportError("librosa is not installed")
 
-    # --- Load audio ---
-    y, sr = librosa.load(audio_path, sr=_SR, mono=True)
-    duration = librosa.get_duration(y=y, sr=sr)
-    logger.info(f"Loaded {Path(audio_path).name}: {duration:.1f}s at {sr}Hz")
+    # --- One analysis pass: beats, chroma, RMS ---
+    features = song_features(audio_path, source_url)
+    duration = features.duration
+    sr = features.sr
+    beat_times = features.beat_times
+    chroma = features.chroma
 
     # Minimum duration check
     if duration < 20:
         return _heuristic_fallback(duration, target_duration, "too_short")
 
-    # --- Beat tracking ---
-    # Run at normal sr for better beat accuracy, then use for snapping
-    tempo, beat_frames = librosa.beat.beat_track(y=y, sr=sr, hop_length=_HOP_LENGTH)
-    beat_times = librosa.frames_to_time(beat_frames, sr=sr, hop_length=_HOP_LENGTH)
-
-    # --- Chroma features ---
-    chroma = librosa.feature.chroma_cqt(y=y, sr=sr, hop_length=_HOP_LENGTH, bins_per_octave=36)
-
     # --- Memory embedding (time-delay embedding for noise reduction) ---
     chroma_stack = librosa.feature.stack_memory(
         chroma, n_steps=_N_STEPS, delay=_DELAY, mode='edge'
     )
 
-    # --- Recurrence matrix ---
-    # Affinity mode gives similarity values 0-1; cosine metric works well for chroma
+    # --- Recurrence row sums = how much does each frame repeat elsewhere? ---
+    # Affinity values 0-1 over cosine distance; k-NN blocks, never the full matrix
     try:
-        R = librosa.segment.recurrence_matrix(
-            chroma_stack,
-            mode='affinity',
-            metric='cosine',
-            sym=True,
-        )
+        row_sums = recurrence_row_sums(chroma_stack)
     except Exception as e:
-        logger.warning(f"Recurrence matrix failed: {e}. Falling back to RMS method.")
-        return _rms_fallback(y, sr, duration, target_duration, beat_times)
-
-    # --- Row-sum score = how much does each frame repeat elsewhere? ---
-    row_sums = np.array(R.sum(axis=1)).flatten()
-
-    # Normalise
-    if row_sums.max() > 0:
-        row_sums = row_sums / row_sums.max()
-
-    # --- RMS energy envelope ---
-    rms = librosa.feature.rms(y=y, hop_length=_HOP_LENGTH)[0]
-    # Align rms to row_sums length
-    if len(rms) > len(row_sums):
-        rms = rms[:len(row_sums)]
-    elif len(rms) < len(row_sums):
-        rms = np.pad(rms, (0, len(row_sums) - len(rms)))
-
-    # Normalise RMS
-    if rms.max() > 0:
-        rms_norm = rms / rms.max()
-    else:
-        rms_norm = rms
+        logger.warning(f"Recurrence scoring failed: {e}. Falling back to RMS method.")
+        return _rms_fallback(features, target_duration)
 
-    # --- Combined score ---
-    # Recurrence score weighted 70%, energy 30%
-    combined = 0.70 * row_sums + 0.30 * rms_norm
-
-    # Smooth with a ~3 second window to avoid single-frame spikes
-    smooth_frames = int(3.0 * sr / _HOP_LENGTH)
-    kernel = np.ones(smooth_frames) / smooth_frames
-    combined_smooth = np.convolve(combined, kernel, mode='same')
-
-    # --- Apply intro skip ---
-    skip_frames = int(intro_skip_ratio * len(combined_smooth))
-    combined_smooth[:skip_frames] = 0.0
-
-    # Also zero out last 15% (outro avoidance)
-    outro_skip = int(0.85 * len(combined_smooth))
-    combined_smooth[outro_skip:] = 0.0
+    combined_smooth = _combined_score(row_sums, features.rms, sr, intro_skip_ratio)
 
     if combined_smooth.max() == 0:
         logger.warning("No usable region found after masking. Using RMS fallback.")
-        return _rms_fallback(y, sr, duration, target_duration, beat_times)
+        return _rms_fallback(features, target_duration)
 
     # --- Find peak ---
     peak_frame = int(np.argmax(combined_smooth))
@@ -189,14 +278,102 @@ def detect_chorus(
     )
 
 
-def _rms_fallback(y, sr, duration, target_duration, beat_times) -> ChorusResult:
+def recurrence_row_sums(data: np.ndarray, block: int = _RECURRENCE_BLOCK) -> np.ndarray:
+    """
+    Row sums of librosa.segment.recurrence_matrix(data, mode='affinity',
+    metric='cosine', sym=True) without materialising the frames x frames
+    matrix, which needs >1 GB for a 10-minute mix.
+
+    Same definition as librosa: each frame links to its k = 2*ceil(sqrt(t-1))
+    nearest other frames by cosine distance, a link survives only if it is
+    mutual, and its affinity is exp(-d / bw) with bw the median over frames
+    of their largest surviving distance.  Distances are computed `block`
+    rows at a time, so memory is O(t*k + block*t) instead of O(t^2).
+    """
+    X = np.asarray(data, dtype=np.float64).T
+    t = X.shape[0]
+    if t < 3:
+        return np.zeros(t)
+    k = min(int(2 * np.ceil(np.sqrt(t - 1))), t - 1)
+
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    X = X / norms
+
+    neighbours = np.empty((t, k), dtype=np.int64)
+    dists = np.empty((t, k))
+    for start in range(0, t, block):
+        stop = min(t, start + block)
+        D = 1.0 - X[start:stop] @ X.T
+        np.clip(D, 0.0, 2.0, out=D)
+        D[np.arange(stop - start), np.arange(start, stop)] = np.inf  # no self links
+        idx = np.argpartition(D, k - 1, axis=1)[:, :k]
+        neighbours[start:stop] = idx
+        dists[start:stop] = np.take_along_axis(D, idx, axis=1)
+
+    # Mutual links: (i, j) is kept when i is also one of j's neighbours
+    order = np.argsort(neighbours, axis=1)
+    neighbours = np.take_along_axis(neighbours, order, axis=1).ravel()
+    dists = np.take_along_axis(dists, order, axis=1).ravel()
+    rows = np.repeat(np.arange(t, dtype=np.int64), k)
+    forward = rows * t + neighbours              # sorted: by row, then column
+    backward = neighbours * t + rows
+    pos = np.minimum(np.searchsorted(forward, backward), len(forward) - 1)
+    keep = (forward[pos] == backward) & (dists > 0)  # zero distances are not links
+    rows, dists = rows[keep], dists[keep]
+    if not len(dists):
+        return np.zeros(t)
+
+    row_max = np.zeros(t)
+    np.maximum.at(row_max, rows, dists)
+    bandwidth = np.median(row_max[row_max > 0])
+    return np.bincount(rows, weights=np.exp(-dists / bandwidth), minlength=t)
+
+
+def _combined_score(row_sums, rms, sr, intro_skip_ratio) -> np.ndarray:
+    """Smoothed 70% recurrence + 30% energy score with intro/outro masked."""
+    # Normalise
+    if row_sums.max() > 0:
+        row_sums = row_sums / row_sums.max()
+
+    # Align rms to row_sums length
+    if len(rms) > len(row_sums):
+        rms = rms[:len(row_sums)]
+    elif len(rms) < len(row_sums):
+        rms = np.pad(rms, (0, len(row_sums) - len(rms)))
+
+    # Normalise RMS
+    if rms.max() > 0:
+        rms_norm = rms / rms.max()
+    else:
+        rms_norm = rms
+
+    # Recurrence score weighted 70%, energy 30%
+    combined = 0.70 * row_sums + 0.30 * rms_norm
+
+    # Smooth with a ~3 second window to avoid single-frame spikes
+    smooth_frames = int(3.0 * sr / _HOP_LENGTH)
+    kernel = np.ones(smooth_frames) / smooth_frames
+    combined_smooth = np.convolve(combined, kernel, mode='same')
+
+    # --- Apply intro skip ---
+    skip_frames = int(intro_skip_ratio * len(combined_smooth))
+    combined_smooth[:skip_frames] = 0.0
+
+    # Also zero out last 15% (outro avoidance)
+    outro_skip = int(0.85 * len(combined_smooth))
+    combined_smooth[outro_skip:] = 0.0
+    return combined_smooth
+
+
+def _rms_fallback(features: SongFeatures, target_duration) -> ChorusResult:
     """
     Fallback when recurrence matrix fails.
     Finds the loudest sustained section using RMS energy.
     This is simpler but still gets the hook right for most pop songs.
     """
-    rms = librosa.feature.rms(y=y, hop_length=_HOP_LENGTH)[0]
-    smooth = np.convolve(rms, np.ones(200) / 200, mode='same')
+    sr, duration, beat_times = features.sr, features.duration, features.beat_times
+    smooth = np.convolve(features.rms, np.ones(200) / 200, mode='same')
 
     skip = int(0.15 * len(smooth))
     outro = int(0.85 * len(smooth))
@@ -230,3 +407,75 @@ def _heuristic_fallback(duration, target_duration, reason) -> ChorusResult:
         confidence=0.2,
         method="heuristic"
     )
+
+
+# ============================================================================
+# BENCHMARK: python -m scripts.chorus_detector --benchmark
+# ============================================================================
+
+def _synthetic_song(minutes: float, seed: int = 0) -> np.ndarray:
+    """Chord-progression audio at _SR: intro, verses and a repeating chorus."""
+    rng = np.random.default_rng(seed)
+    sections = {name: [rng.choice(48, 3, replace=False) + 36 for _ in range(4)]
+                for name in ("intro", "verse", "chorus", "bridge")}
+    form = ["intro"] + ["verse", "chorus"] * 2 + ["bridge", "chorus", "chorus"]
+    bar = int(2.0 * _SR)
+    total = int(minutes * 60 * _SR)
+    t = np.arange(bar) / _SR
+    out, i = [], 0
+    while sum(len(x) for x in out) < total:
+        for chord in sections[form[i % len(form)]]:
+            freqs = 440.0 * 2.0 ** ((chord - 69) / 12.0)
+            out.append(sum(np.sin(2 * np.pi * f * t) for f in freqs) / 3)
+        i += 1
+    y = np.concatenate(out)[:total]
+    return (y + 0.05 * rng.standard_normal(total)).astype(np.float32)
+
+
+def benchmark_recurrence(minutes=(3, 4, 6, 8, 10), dense_max_minutes: float = 6):
+    """
+    Time and peak memory of recurrence_row_sums on synthetic songs of
+    increasing length.  With librosa installed, tracks up to
+    dense_max_minutes are also scored with the dense recurrence_matrix and
+    the chorus peak frames compared.
+    """
+    import time
+    import tracemalloc
+
+    if not LIBROSA_AVAILABLE:
+        raise ImportError("librosa is not installed")
+    print(f"{'min':>4} {'frames':>7} {'knn s':>7} {'knn MB':>7} {'dense s':>8} {'dense MB':>9}  peak")
+    for m in minutes:
+        y = _synthetic_song(m)
+        chroma = librosa.feature.chroma_cqt(y=y, sr=_SR, hop_length=_HOP_LENGTH, bins_per_octave=36)
+        stack = librosa.feature.stack_memory(chroma, n_steps=_N_STEPS, delay=_DELAY, mode='edge')
+        rms = librosa.feature.rms(y=y, hop_length=_HOP_LENGTH)[0]
+
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        row_sums = recurrence_row_sums(stack)
+        knn_s = time.perf_counter() - t0
+        knn_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+        peak = int(np.argmax(_combined_score(row_sums, rms, _SR, _INTRO_SKIP)))
+
+        dense = f"{'-':>8} {'-':>9}  -"
+        if m <= dense_max_minutes:
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            R = librosa.segment.recurrence_matrix(stack, mode='affinity', metric='cosine', sym=True)
+            dense_sums = np.asarray(R.sum(axis=1)).ravel()
+            dense_s = time.perf_counter() - t0
+            dense_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.stop()
+            del R
+            dense_peak = int(np.argmax(_combined_score(dense_sums, rms, _SR, _INTRO_SKIP)))
+            dense = (f"{dense_s:8.2f} {dense_mb:9.0f}  "
+                     f"{'same' if dense_peak == peak else f'{peak} vs {dense_peak}'}")
+        print(f"{m:4} {stack.shape[1]:7} {knn_s:7.2f} {knn_mb:7.0f} {dense}")
+
+
+if __name__ == "__main__":
+    import sys
+    if "--benchmark" in sys.argv:
+        benchmark_recurrence()
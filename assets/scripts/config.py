@@ -27,15 +27,80 @@ class Config:
 
     # Whisper Settings
     WHISPER_MODEL = os.getenv("WHISPER_MODEL", "small")
+    # ASR engine: "stable-ts" (PyTorch), "faster-whisper" (CTranslate2) or
+    # "auto" (faster-whisper on CPU-only hosts when installed, else stable-ts)
+    WHISPER_BACKEND = os.getenv("WHISPER_BACKEND", "auto")
+    WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
+    WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", "0"))  # 0 = all cores
+    # Speculative multi-pass: run all passes at once in a CPU process pool
+    # (CPU-only hosts). WHISPER_POOL_THREADS 0 = cores / processes
+    WHISPER_PARALLEL_PASSES = os.getenv("WHISPER_PARALLEL_PASSES", "0") == "1"
+    WHISPER_POOL_PROCESSES = int(os.getenv("WHISPER_POOL_PROCESSES", "4"))
+    WHISPER_POOL_THREADS = int(os.getenv("WHISPER_POOL_THREADS", "0"))
+    # Chunked mode: cut each clip at VAD silences into up to
+    # WHISPER_POOL_PROCESSES chunks and transcribe them in parallel
+    WHISPER_CHUNKED = os.getenv("WHISPER_CHUNKED", "0") == "1"
+    WHISPER_CHUNK_MIN_SEC = float(os.getenv("WHISPER_CHUNK_MIN_SEC", "10"))
+    # Batch mode: transcribe every song of a GUI batch pass-major before the
+    # per-song pipelines run (one model load, only weak songs get retries)
+    WHISPER_BATCH_TRANSCRIBE = os.getenv("WHISPER_BATCH_TRANSCRIBE", "1") == "1"
+    # Reuse mel/encoder output across passes (hooks into engine internals;
+    # skipped automatically on untested stable-ts versions)
+    WHISPER_SHARE_FEATURES = os.getenv("WHISPER_SHARE_FEATURES", "1") == "1"
+    # 30 s windows whose mel/encoder output is kept for reuse across passes
+    WHISPER_FEATURE_CACHE_WINDOWS = int(os.getenv("WHISPER_FEATURE_CACHE_WINDOWS", "24"))
+    # Adaptive pass planner: start with the pass that last won for this song,
+    # or (after WHISPER_PLANNER_MIN_SONGS songs) the bucket's most frequent winner
+    WHISPER_PASS_PLANNER = os.getenv("WHISPER_PASS_PLANNER", "1") == "1"
+    WHISPER_PLANNER_MIN_SONGS = int(os.getenv("WHISPER_PLANNER_MIN_SONGS", "20"))
+    # Store every finished pass (segments + count) in the artifact store so a
+    # cancelled or crashed job resumes after its last completed pass
+    WHISPER_PASS_CHECKPOINTS = os.getenv("WHISPER_PASS_CHECKPOINTS", "1") == "1"
+    # Frame hop of the RMS silence map used to drop instrumental hallucinations
+    SILENCE_HOP_MS = int(os.getenv("SILENCE_HOP_MS", "100"))
+    # Genius-to-Whisper line matching: "greedy" (cursor search + recovery
+    # pass) or "dp" (banded global alignment over band similarity scores)
+    LYRIC_ALIGN_MODE = os.getenv("LYRIC_ALIGN_MODE", "greedy")
     # Absolute path so models always land in the right place regardless of cwd
     WHISPER_CACHE_DIR = str(_BASE_DIR / "whisper_models")
-    
+
+    # Transcription worker — one long-lived process keeps the model warm
+    # between batches; evicted after TRANSCRIBE_WORKER_IDLE_SEC of no requests
+    TRANSCRIBE_WORKER = os.getenv("TRANSCRIBE_WORKER", "1") == "1"
+    TRANSCRIBE_WORKER_PORT = int(os.getenv("TRANSCRIBE_WORKER_PORT", "7824"))
+    TRANSCRIBE_WORKER_IDLE_SEC = int(os.getenv("TRANSCRIBE_WORKER_IDLE_SEC", str(8 * 3600)))
+    # Per-install secret every worker request must carry (created user-only)
+    TRANSCRIBE_WORKER_TOKEN_PATH = os.getenv(
+        "TRANSCRIBE_WORKER_TOKEN_PATH", str(_BASE_DIR / "cache" / "transcription_worker.token"))
+
+    # Song database shared by the GUI, the scripts and the pass planner
+    SONG_DB_PATH = os.getenv("SONG_DB_PATH", str(_BASE_DIR / "database" / "songs.db"))
+
+    # Artifact store — vocal stems, prepared audio and raw Whisper segments,
+    # keyed by audio hash + params and shared across templates and batches
+    ARTIFACT_CACHE_DIR = os.getenv("ARTIFACT_CACHE_DIR", str(_BASE_DIR / "cache" / "artifacts"))
+    ARTIFACT_CACHE_MAX_MB = int(os.getenv("ARTIFACT_CACHE_MAX_MB", "4096"))
+
+    # Demucs vocal separation (in-process). DEMUCS_SEGMENT 0 = model default
+    # (7.8s for htdemucs); DEMUCS_WORKERS 0 = all cores (CPU only)
+    DEMUCS_SEGMENT = float(os.getenv("DEMUCS_SEGMENT", "0"))
+    DEMUCS_OVERLAP = float(os.getenv("DEMUCS_OVERLAP", "0.25"))
+    DEMUCS_WORKERS = int(os.getenv("DEMUCS_WORKERS", "0"))
+
     # Job Settings
     TOTAL_JOBS = int(os.getenv("TOTAL_JOBS", "4"))
     JOBS_DIR = "jobs"
     
     # Processing Settings
     MAX_CONCURRENT_DOWNLOADS = int(os.getenv("MAX_CONCURRENT_DOWNLOADS", "3"))
+    # Download only the clip window (plus a small margin) in the stream's
+    # native format instead of the whole song transcoded to MP3
+    DOWNLOAD_SECTIONS = os.getenv("DOWNLOAD_SECTIONS", "1") == "1"
+    # Discovery: YouTube search + download run on DISCOVERY_NETWORK_WORKERS
+    # threads; chorus detection on DISCOVERY_CHORUS_PROCESSES processes
+    # (0 = cores - 1, at most 4)
+    DISCOVERY_NETWORK_WORKERS = int(os.getenv("DISCOVERY_NETWORK_WORKERS", "4"))
+    DISCOVERY_CHORUS_PROCESSES = int(os.getenv("DISCOVERY_CHORUS_PROCESSES", "0"))
     
     # Audio Settings
     AUDIO_FORMAT = "mp3"
@@ -54,6 +119,8 @@ class Config:
         'large', 'large-v2', 'large-v3',
     ]
 
+    VALID_WHISPER_BACKENDS = ['auto', 'stable-ts', 'faster-whisper']
+
     @classmethod
     def set_max_line_length(cls, length):
         """Override max line length (Mono uses longer lines than Aurora)."""
@@ -70,4 +137,9 @@ class Config:
             warnings.append(
                 f"Unknown WHISPER_MODEL '{cls.WHISPER_MODEL}'. Falling back to 'small'.")
             cls.WHISPER_MODEL = 'small'
+
+        if cls.WHISPER_BACKEND not in cls.VALID_WHISPER_BACKENDS:
+            warnings.append(
+                f"Unknown WHISPER_BACKEND '{cls.WHISPER_BACKEND}'. Falling back to 'auto'.")
+            cls.WHISPER_BACKEND = 'auto'
         return warnings
@@ -0,0 +1,237 @@
+"""
+Discovery Executor - staged YouTube search, download and chorus detection
+for the Discover tab
+
+Each track's network work (YouTube search, then the audio download) runs on
+a bounded thread pool, and every downloaded song is handed straight to a
+spawn-context process pool for detect_chorus, so librosa analysis of one
+song overlaps the searches and downloads of the next ones.  Outcomes are
+streamed back through progress_cb as they complete and returned in track
+order.
+
+Cancellation: the caller's cancel_event is checked by every network thread
+before each step; once it is set queued network steps and detections are
+dropped and the downloaded temp folders are removed.  A chorus process that
+dies (killed, out of memory) breaks the pool: every detection still owed
+fails with BrokenProcessPool and is reported as chorus_failed, so the run
+never waits on a result that cannot arrive.
+"""
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from scripts.config import Config
+
+
+@dataclass
+class DiscoveryOutcome:
+    index: int                 # position in the tracks list
+    track: object
+    yt_result: object          # YouTubeResult, or None when the search failed
+    chorus: object             # ChorusResult, or None when detection failed
+    status: str                # "ready", "no_youtube" or "chorus_failed"
+
+
+def chorus_processes(tracks: int = 0) -> int:
+    """Process-pool size for chorus detection (0 = run it on the network threads)."""
+    n = Config.DISCOVERY_CHORUS_PROCESSES or min(4, max(1, (os.cpu_count() or 1) - 1))
+    return min(n, tracks) if tracks else n
+
+
+def _init_child(threads):
+    # Set before librosa / numpy are imported in this process
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS",
+                "NUMBA_NUM_THREADS"):
+        os.environ[var] = str(threads)
+
+
+def _chorus_job(audio_path, source_url):
+    """Run in a pool process; returns a picklable ChorusResult."""
+    from scripts.chorus_detector import detect_chorus
+    return detect_chorus(audio_path, source_url=source_url)
+
+
+def run_discovery(
+    tracks: list,
+    find_url: Callable,
+    download: Callable,
+    cancel_event: threading.Event,
+    progress_cb: Optional[Callable[[str, int, int, str], None]] = None,
+    network_workers: Optional[int] = None,
+    processes: Optional[int] = None,
+    has_features: Optional[Callable[[str], bool]] = None,
+) -> list:
+    """
+    Search, download and detect the chorus of every track concurrently.
+
+    Args:
+        tracks:          LastFMTrack objects
+        find_url:        find_url(track) -> YouTubeResult or None
+        download:        download(url, folder) -> audio path
+        cancel_event:    threading.Event; set to abandon the run
+        progress_cb:     Optional callback(step, done, total, song_label) with
+                         step "youtube" (searches done) or "chorus" (tracks done)
+        network_workers: Threads for search + download (default from Config)
+        processes:       Chorus processes; 0 runs detect_chorus on the network
+                         threads (default from Config)
+        has_features:    has_features(url) -> True when the song's analysis is
+                         cached, so its download can be skipped (an entry
+                         evicted before detection is downloaded after all)
+
+    Returns:
+        DiscoveryOutcome per finished track, in track order.  After a cancel
+        only the tracks that finished before it are returned.
+    """
+    total = len(tracks)
+    if total == 0:
+        return []
+    if network_workers is None:
+        network_workers = Config.DISCOVERY_NETWORK_WORKERS
+    if processes is None:
+        processes = chorus_processes(total)
+    if has_features is None:
+        from scripts.chorus_detector import has_song_features as has_features
+
+    events = queue.Queue()
+    lock = threading.Lock()
+    temp_dirs = {}     # track index -> download folder, until its chorus is done
+
+    pool = None
+    if processes > 0:
+        threads = max(1, (os.cpu_count() or 1) // processes)
+        pool = ProcessPoolExecutor(
+            processes, mp_context=mp.get_context("spawn"),
+            initializer=_init_child, initargs=(threads,))
+
+    def finish(i, yt, chorus):
+        events.put(("done", i, yt, chorus))
+
+    def detect(i, yt, audio_path):
+        if pool is None:
+            try:
+                chorus = _chorus_job(audio_path, yt.url)
+            except Exception as e:
+                on_error(i, yt, audio_path, e)
+                return
+            finish(i, yt, chorus)
+            return
+
+        def done(future):
+            if future.cancelled():
+                return
+            e = future.exception()
+            if e is not None:
+                on_error(i, yt, audio_path, e)
+            else:
+                finish(i, yt, future.result())
+
+        try:
+            pool.submit(_chorus_job, audio_path, yt.url).add_done_callback(done)
+        except RuntimeError as e:   # BrokenProcessPool, or shut down by a cancel
+            on_error(i, yt, audio_path, e)
+
+    def on_error(i, yt, audio_path, e):
+        from scripts.chorus_detector import FeaturesNotCached
+        if audio_path is None and isinstance(e, FeaturesNotCached):
+            # Evicted since has_features — download the song after all
+            try:
+                executor.submit(fetch_stage, i, yt, False)
+                return
+            except RuntimeError:   # executor shut down by a cancel
+                pass
+        print(f"  \u26a0 Chorus detection failed for {tracks[i].db_title}: {e}")
+        finish(i, yt, None)
+
+    def network_stage(i, track):
+        if cancel_event.is_set():
+            return
+        try:
+            yt = find_url(track)
+        except Exception:
+            yt = None
+        events.put(("youtube", i, yt, None))
+        if not yt:
+            finish(i, None, None)
+            return
+        fetch_stage(i, yt, has_features(yt.url))
+
+    def fetch_stage(i, yt, cached):
+        track = tracks[i]
+        if cached:
+            # Analysed before — chorus comes from the feature cache
+            audio_path = None
+        else:
+            folder = tempfile.mkdtemp(prefix="apollova_discover_")
+            try:
+                if cancel_event.is_set():
+                    raise InterruptedError()
+                audio_path = download(yt.url, folder)
+            except Exception as e:
+                shutil.rmtree(folder, ignore_errors=True)
+                if not isinstance(e, InterruptedError):
+                    print(f"  \u26a0 Download failed for {track.db_title}: {e}")
+                    finish(i, yt, None)
+                return
+            with lock:
+                if cancel_event.is_set():
+                    shutil.rmtree(folder, ignore_errors=True)
+                    return
+                temp_dirs[i] = folder
+
+        if not cancel_event.is_set():
+            detect(i, yt, audio_path)
+
+    outcomes = {}
+    searched = 0
+    executor = ThreadPoolExecutor(max_workers=max(1, network_workers),
+                                  thread_name_prefix="discovery")
+    try:
+        for i, track in enumerate(tracks):
+            executor.submit(network_stage, i, track)
+
+        while len(outcomes) < total and not cancel_event.is_set():
+            try:
+                kind, i, yt, chorus = events.get(timeout=0.2)
+            except queue.Empty:
+                continue
+
+            label = tracks[i].db_title
+            if kind == "youtube":
+                searched += 1
+                if progress_cb:
+                    progress_cb("youtube", searched, total, label)
+                continue
+
+            with lock:
+                folder = temp_dirs.pop(i, None)
+            if folder:
+                shutil.rmtree(folder, ignore_errors=True)
+
+            if yt is None:
+                status = "no_youtube"
+            elif chorus is None:
+                status = "chorus_failed"
+            else:
+                status = "ready"
+            outcomes[i] = DiscoveryOutcome(i, tracks[i], yt, chorus, status)
+            if progress_cb:
+                progress_cb("chorus", len(outcomes), total, label)
+    finally:
+        cancelled = cancel_event.is_set()
+        # In-flight downloads finish in the background and clean up after
+        # themselves; queued ones are dropped
+        executor.shutdown(wait=not cancelled, cancel_futures=True)
+        if pool is not None:
+            pool.shutdown(wait=not cancelled, cancel_futures=True)
+        with lock:
+            for folder in temp_dirs.values():
+                shutil.rmtree(folder, ignore_errors=True)
+            temp_dirs.clear()
+
+    return [outcomes[i] for i in sorted(outcomes)]
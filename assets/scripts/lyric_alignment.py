@@ -16,16 +16,27 @@ Improvements:
   #5:  Sliding window early termination (score > 95)
   #9:  Two-pass alignment recovery for low-confidence matches
   #10: Returns (segments, match_ratio) for caller validation
+  #46: Accepts a shared GeniusLyricsIndex so the lyrics are parsed once
+  #47: Window search on precomputed clean lines — window text sliced from
+       one joined string, length upper bounds prune candidates, and
+       score_cutoff lets rapidfuzz abandon hopeless ones
+  #48: Optional banded global alignment (LYRIC_ALIGN_MODE=dp) over a cdist
+       similarity matrix instead of the greedy cursor search
 """
 import re
-from rapidfuzz import fuzz
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from scripts.config import Config
 
 
 # ============================================================================
 # PUBLIC API
 # ============================================================================
 
-def align_genius_to_whisper(whisper_segments, genius_text, segment_text_key="lyric_current"):
+def align_genius_to_whisper(whisper_segments, genius_text, segment_text_key="lyric_current",
+                            index=None, mode=None):
     """
     Align Genius lyrics to Whisper transcription segments.
 
@@ -35,20 +46,22 @@ def align_genius_to_whisper(whisper_segments, genius_text, segment_text_key="lyr
 
     #10: Returns (segments, match_ratio) tuple.
     match_ratio is matched/total — callers should revert to Whisper if < 0.3.
+
+    #46: `index` is the song's whisper_common.GeniusLyricsIndex, if the caller
+    already has one; its lyric_lines are reused instead of re-parsing.
+
+    #48: `mode` picks the line matcher ("greedy" or "dp"), default
+    Config.LYRIC_ALIGN_MODE.
     """
     if not genius_text or not whisper_segments:
         return whisper_segments, 0.0
 
-    # Parse genius into lines
-    genius_all_lines = [ln.strip() for ln in genius_text.splitlines() if ln.strip()]
-
-    # Separate actual lyric lines from section headers & annotations
-    genius_lyric_lines = [
-        ln for ln in genius_all_lines
-        if not _is_section_header(ln)
-    ]
+    if index is not None:
+        lyric_lines = index.lyric_lines
+    else:
+        lyric_lines = genius_lyric_lines(genius_text)
 
-    if not genius_lyric_lines:
+    if not lyric_lines:
         print("  \u26a0 No lyric lines found in Genius text")
         return whisper_segments, 0.0
 
@@ -57,18 +70,24 @@ def align_genius_to_whisper(whisper_segments, genius_text, segment_text_key="lyr
     if not active_segments:
         return whisper_segments, 0.0
 
-    print(f"  Aligning {len(active_segments)} Whisper segments against {len(genius_lyric_lines)} Genius lines...")
+    print(f"  Aligning {len(active_segments)} Whisper segments against {len(lyric_lines)} Genius lines...")
+
+    # Clean every Genius line once for both steps (#47)
+    genius_clean = [_clean_for_match(ln) for ln in lyric_lines]
 
     # Step 1: Find the best matching window in the full lyrics
-    window_start = _find_lyrics_window(active_segments, genius_lyric_lines, segment_text_key)
+    window_start = _find_lyrics_window(active_segments, lyric_lines, segment_text_key,
+                                       genius_clean)
 
     if window_start is None:
         print("  \u26a0 Could not find matching window in Genius lyrics, using Whisper text")
         return whisper_segments, 0.0
 
-    # Step 2: Line-by-line alignment within the window (with two-pass recovery)
-    whisper_segments, matched, total = _align_within_window(
-        whisper_segments, genius_lyric_lines, window_start, segment_text_key
+    # Step 2: Line-by-line alignment within the window
+    # (greedy with two-pass recovery, or banded DP #48)
+    align = _align_banded_dp if (mode or Config.LYRIC_ALIGN_MODE) == "dp" else _align_within_window
+    whisper_segments, matched, total = align(
+        whisper_segments, lyric_lines, window_start, segment_text_key, genius_clean
     )
 
     # Step 3: Remove only Whisper artifacts (NOT legitimate repeats)
@@ -81,16 +100,25 @@ def align_genius_to_whisper(whisper_segments, genius_text, segment_text_key="lyr
     return whisper_segments, match_ratio
 
 
+def genius_lyric_lines(genius_text):
+    """Non-empty Genius lines with section headers & annotations removed."""
+    genius_all_lines = [ln.strip() for ln in genius_text.splitlines() if ln.strip()]
+    return [ln for ln in genius_all_lines if not _is_section_header(ln)]
+
+
 # ============================================================================
 # STEP 1: SLIDING WINDOW -- Find where the clip falls in the full lyrics
 # ============================================================================
 
-def _find_lyrics_window(active_segments, genius_lines, segment_text_key):
+def _find_lyrics_window(active_segments, genius_lines, segment_text_key, genius_clean=None):
     """
     Find the starting index in genius_lines where the Whisper transcription
     best matches, using a sliding window approach.
 
     #5: Early termination when combined score > 95.
+    #47: Same candidates and order as a full scan, but a candidate is skipped
+    as soon as an upper bound on its combined score cannot beat the best so
+    far (lengths first, then each scorer's score_cutoff).
     """
     # Build Whisper text block
     whisper_block = " ".join(
@@ -101,12 +129,35 @@ def _find_lyrics_window(active_segments, genius_lines, segment_text_key):
     if not whisper_block.strip():
         return None
 
+    if genius_clean is None:
+        genius_clean = [_clean_for_match(ln) for ln in genius_lines]
+
     num_segs = len(active_segments)
     num_genius = len(genius_lines)
 
     min_window = max(1, num_segs - 4)
     max_window = min(num_genius, num_segs + 8)
 
+    # Window text is a slice of one joined string (same bytes as joining the window)
+    joined = " ".join(genius_clean)
+    offsets = []
+    pos = 0
+    for line in genius_clean:
+        offsets.append(pos)
+        pos += len(line) + 1
+
+    # Prefix sums of token characters/counts -> token_sort string lengths
+    tok_chars = [0]
+    tok_count = [0]
+    for line in genius_clean:
+        tokens = line.split()
+        tok_chars.append(tok_chars[-1] + sum(len(t) for t in tokens))
+        tok_count.append(tok_count[-1] + len(tokens))
+
+    whisper_tokens = whisper_block.split()
+    whisper_len = len(whisper_block)
+    whisper_sorted_len = sum(len(t) for t in whisper_tokens) + len(whisper_tokens) - 1
+
     best_score = -1
     best_start = 0
     best_ws = 0
@@ -117,17 +168,33 @@ def _find_lyrics_window(active_segments, genius_lines, segment_text_key):
             if end > num_genius:
                 break
 
-            genius_block = " ".join(
-                _clean_for_match(genius_lines[i])
-                for i in range(start, end)
-            )
+            genius_block = joined[offsets[start]:offsets[end - 1] + len(genius_clean[end - 1])]
 
             if not genius_block:
                 continue
 
-            score = fuzz.ratio(whisper_block, genius_block)
-            sort_score = fuzz.token_sort_ratio(whisper_block, genius_block)
-            partial_score = fuzz.partial_ratio(whisper_block, genius_block)
+            # Cheap filter: ratio-type scores are bounded by the length mismatch
+            n_tok = tok_count[end] - tok_count[start]
+            sorted_len = tok_chars[end] - tok_chars[start] + n_tok - 1 if n_tok else 0
+            max_sort = _length_bound(whisper_sorted_len, sorted_len)
+            if 0.5 * _length_bound(whisper_len, len(genius_block)) + 0.25 * max_sort + 25 \
+                    + _BOUND_EPS <= best_score:
+                continue
+
+            cutoff = 2 * (best_score - 0.25 * max_sort - 25) - _BOUND_EPS
+            score = fuzz.ratio(whisper_block, genius_block, score_cutoff=max(0, cutoff))
+            if cutoff > 0 and not score:
+                continue
+            cutoff = 4 * (best_score - 0.5 * score - 25) - _BOUND_EPS
+            sort_score = fuzz.token_sort_ratio(whisper_block, genius_block,
+                                               score_cutoff=max(0, cutoff))
+            if cutoff > 0 and not sort_score:
+                continue
+            cutoff = 4 * (best_score - 0.5 * score - 0.25 * sort_score) - _BOUND_EPS
+            partial_score = fuzz.partial_ratio(whisper_block, genius_block,
+                                               score_cutoff=max(0, cutoff))
+            if cutoff > 0 and not partial_score:
+                continue
 
             combined = (score * 0.5) + (sort_score * 0.25) + (partial_score * 0.25)
 
@@ -149,11 +216,23 @@ def _find_lyrics_window(active_segments, genius_lines, segment_text_key):
     return best_start
 
 
+# Slack so float rounding in the bounds never prunes a candidate that could win
+_BOUND_EPS = 1e-6
+
+
+def _length_bound(len_a, len_b):
+    """Upper bound of fuzz.ratio for strings of these lengths."""
+    if not len_a and not len_b:
+        return 100
+    return 200 * min(len_a, len_b) / (len_a + len_b)
+
+
 # ============================================================================
 # STEP 2: LINE-BY-LINE ALIGNMENT within the found window
 # ============================================================================
 
-def _align_within_window(whisper_segments, genius_lines, window_start, segment_text_key):
+def _align_within_window(whisper_segments, genius_lines, window_start, segment_text_key,
+                         genius_clean=None):
     """
     Line-by-line alignment between Whisper segments and Genius lines.
 
@@ -164,7 +243,8 @@ def _align_within_window(whisper_segments, genius_lines, window_start, segment_t
     """
     min_score = 50
 
-    genius_clean = [_clean_for_match(ln) for ln in genius_lines]
+    if genius_clean is None:
+        genius_clean = [_clean_for_match(ln) for ln in genius_lines]
 
     genius_cursor = window_start
 
@@ -312,6 +392,178 @@ def _match_score(whisper_clean, genius_clean):
     return max(ratio, partial * 0.95, token_sort * 0.9)
 
 
+# ============================================================================
+# STEP 2 (alt): BANDED GLOBAL ALIGNMENT (#48)
+# ============================================================================
+
+# Lines either side of the window diagonal the alignment may wander
+DP_BAND = 12
+# Cost of each Genius line skipped between two matched segments
+DP_LINE_SKIP_PENALTY = 2
+# Segments left unmatched may reuse their best line at this score
+# (choruses Genius writes out only once)
+DP_REPEAT_SCORE = 75
+
+
+def _pair_similarity(whisper_clean, genius_clean, min_score=0):
+    """
+    _match_score for each (whisper_clean[k], genius_clean[k]) pair — one
+    cpdist call per scorer.  Pairs that cannot reach min_score may come
+    back as any lower value.
+    """
+    if not whisper_clean:
+        return np.zeros(0)
+
+    def scores(scorer, weight):
+        cutoff = max(0, min_score / weight - 1e-6)
+        return process.cpdist(whisper_clean, genius_clean, scorer=scorer, dtype=np.float64,
+                              score_cutoff=cutoff, workers=-1) * weight
+
+    sim = np.maximum(scores(fuzz.ratio, 1.0),
+                     np.maximum(scores(fuzz.partial_ratio, 0.95),
+                                scores(fuzz.token_sort_ratio, 0.9)))
+    sim[[k for k, ln in enumerate(genius_clean) if not ln]] = 0
+    return sim
+
+
+def _align_banded_dp(whisper_segments, genius_lines, window_start, segment_text_key,
+                     genius_clean=None):
+    """
+    Needleman-Wunsch style alignment of Whisper segments to Genius lines.
+
+    Segments map to strictly increasing lines; a segment may stay Whisper
+    text for free, skipped lines between matches cost DP_LINE_SKIP_PENALTY
+    and a match scores its similarity above the 50 threshold.  Only cells
+    within DP_BAND lines of the window diagonal are stored and filled, so
+    the globally best path costs O(segments * band) time and memory instead
+    of one greedy cursor that can drift and never recover.  The similarity
+    scores (one cpdist per scorer over just the band cells) are reused by
+    the chorus-repeat lookup for segments the path leaves unmatched; only
+    their lines outside the band are scored again.
+
+    Returns (segments, matched_count, total_count) like _align_within_window.
+    """
+    min_score = 50
+
+    if genius_clean is None:
+        genius_clean = [_clean_for_match(ln) for ln in genius_lines]
+
+    total = 0
+    rows = []   # (seg_idx, clean text) of segments that can be matched
+    for seg_idx, seg in enumerate(whisper_segments):
+        seg_text = seg.get(segment_text_key, "").strip()
+        if not seg_text:
+            continue
+        total += 1
+        whisper_clean = _clean_for_match(seg_text)
+        if whisper_clean:
+            rows.append((seg_idx, whisper_clean))
+
+    num_genius = len(genius_clean)
+    if not rows or not num_genius:
+        print(f"  Aligned: 0 matched, {total} kept as Whisper text")
+        return whisper_segments, 0, total
+
+    n = len(rows)
+    texts = [text for _, text in rows]
+    # Band of row i: lines band_lo[i]..band_hi[i] around the window diagonal.
+    # Row 0 is the free start (leading lines cost nothing).
+    band_lo, band_hi = [0] * (n + 1), [0] * (n + 1)
+    for i in range(1, n + 1):
+        center = min(window_start + i, num_genius)
+        band_lo[i] = max(1, center - DP_BAND)
+        band_hi[i] = min(num_genius, center + DP_BAND)
+    band_lo[0], band_hi[0] = band_lo[1] - 1, band_hi[1]
+
+    # Similarity of exactly the band cells (segment i-1, line j-1)
+    cell_rows, cell_lines, row_start = [], [], [0] * (n + 1)
+    for i in range(1, n + 1):
+        row_start[i] = len(cell_rows)
+        cell_rows.extend([i - 1] * (band_hi[i] - band_lo[i] + 1))
+        cell_lines.extend(range(band_lo[i] - 1, band_hi[i]))
+    band_sim = _pair_similarity([texts[r] for r in cell_rows],
+                                [genius_clean[j] for j in cell_lines], min_score)
+    # +1 so even a match at exactly min_score beats leaving the segment
+    gain = np.where(band_sim >= min_score, band_sim - min_score + 1, 0).tolist()
+
+    # scores[i][j - band_lo[i]]: best path over the first i segments and
+    # first j lines; moves likewise (0 keep, 1 skip line, 2 match)
+    neg = float("-inf")
+    scores = [[0.0] * (band_hi[0] - band_lo[0] + 1)] + [None] * n
+    moves = [None] * (n + 1)
+    for i in range(1, n + 1):
+        a, b = band_lo[i], band_hi[i]
+        p_lo, p_hi, prev = band_lo[i - 1], band_hi[i - 1], scores[i - 1]
+        gains = gain[row_start[i]:row_start[i] + b - a + 1]
+        row, steps = [neg] * (b - a + 1), [0] * (b - a + 1)
+        for j in range(a, b + 1):
+            best, step = (prev[j - p_lo] if j <= p_hi else neg), 0
+            if j > a:
+                skip = row[j - 1 - a] - DP_LINE_SKIP_PENALTY
+                if skip > best:
+                    best, step = skip, 1
+            g = gains[j - a]
+            if g > 0 and j - 1 >= p_lo and prev[j - 1 - p_lo] + g > best:
+                best, step = prev[j - 1 - p_lo] + g, 2
+            row[j - a] = best
+            steps[j - a] = step
+        scores[i], moves[i] = row, steps
+
+    # Trace back from the best final cell (trailing lines are free)
+    pairs = {}
+    i = n
+    last = scores[n]
+    j = band_lo[n] + max(range(len(last)), key=last.__getitem__)
+    while i > 0:
+        step = moves[i][j - band_lo[i]]
+        if step == 2:
+            pairs[i - 1] = j - 1
+            i, j = i - 1, j - 1
+        elif step == 1:
+            j -= 1
+        else:
+            i -= 1
+
+    # Chorus repeats may sit anywhere in the song: an unmatched segment
+    # reuses its band scores and only its lines outside the band are scored
+    repeat_sim = {}
+    outside_rows, outside_lines = [], []
+    for r in range(n):
+        if r in pairs:
+            continue
+        full = np.zeros(num_genius)
+        a, b = band_lo[r + 1], band_hi[r + 1]
+        full[a - 1:b] = band_sim[row_start[r + 1]:row_start[r + 1] + b - a + 1]
+        repeat_sim[r] = full
+        for line in list(range(a - 1)) + list(range(b, num_genius)):
+            outside_rows.append(r)
+            outside_lines.append(line)
+    if outside_rows:
+        outside_sim = _pair_similarity([texts[r] for r in outside_rows],
+                                       [genius_clean[j] for j in outside_lines],
+                                       DP_REPEAT_SCORE)
+        for r, line, value in zip(outside_rows, outside_lines, outside_sim):
+            repeat_sim[r][line] = value
+
+    matched = 0
+    repeats = 0
+    for r, (seg_idx, whisper_clean) in enumerate(rows):
+        j = pairs.get(r)
+        if j is None:
+            line_scores = repeat_sim[r]
+            j = int(np.argmax(line_scores))
+            if line_scores[j] < DP_REPEAT_SCORE:
+                continue
+            repeats += 1
+        whisper_segments[seg_idx][segment_text_key] = genius_lines[j]
+        matched += 1
+
+    if repeats:
+        print(f"  \u267b Repeat lines reused: {repeats}")
+    print(f"  Aligned: {matched} matched, {total - matched} kept as Whisper text")
+    return whisper_segments, matched, total
+
+
 # ============================================================================
 # STEP 3: ARTIFACT REMOVAL (NOT blanket duplicate removal)
 # ============================================================================
@@ -361,13 +613,17 @@ def _remove_whisper_artifacts(segments, segment_text_key):
 # UTILITY FUNCTIONS
 # ============================================================================
 
+_NON_ALNUM_RE = re.compile(r"[^a-zA-Z0-9\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
 def _clean_for_match(text):
     """Normalize text for fuzzy matching"""
     if not text:
         return ""
-    text = re.sub(r"[^a-zA-Z0-9\s]", "", text)
+    text = _NON_ALNUM_RE.sub("", text)
     text = text.lower().strip()
-    text = re.sub(r"\s+", " ", text)
+    text = _WHITESPACE_RE.sub(" ", text)
     return text
 
 
@@ -31,7 +31,9 @@ def transcribe_audio(job_folder, song_title=None):
         return None
 
     try:
-        audio_duration = whisper_common.get_audio_duration(audio_path)
+        # Decode once — reused for duration, Whisper input and silence map
+        audio = whisper_common.load_audio(audio_path)
+        audio_duration = whisper_common.get_audio_duration(audio)
         if audio_duration is not None:
             print(f"  Audio duration: {audio_duration:.1f}s")
         else:
@@ -43,7 +45,8 @@ def transcribe_audio(job_folder, song_title=None):
         # ============================================================
         # CHECK WHISPER CACHE (#11)
         # ============================================================
-        cached = whisper_common.load_whisper_cache(job_folder)
+        store_key = whisper_common.whisper_store_key(audio_path, "Aurora")
+        cached = whisper_common.load_whisper_cache(job_folder, store_key, words=False)
         if cached:
             segments = []
             for seg in cached:
@@ -62,11 +65,9 @@ def transcribe_audio(job_folder, song_title=None):
             # ============================================================
             # VOCAL SEPARATION (Demucs) + MULTI-PASS TRANSCRIPTION
             # ============================================================
-            transcribe_path = whisper_common.separate_vocals(audio_path, job_folder)
-            result, pass_idx = whisper_common.multi_pass_transcribe(
-                transcribe_path, initial_prompt, audio_duration, language,
-                word_timestamps=True,
-            )
+            request = whisper_common.transcription_request(
+                job_folder, song_title, "Aurora", audio=audio)
+            result, pass_idx = whisper_common.multi_pass_transcribe(**request)
 
             if not result or not result.segments:
                 print("\u274c Whisper returned no segments after all attempts")
@@ -87,7 +88,7 @@ def transcribe_audio(job_folder, song_title=None):
                 })
 
             if segments:
-                whisper_common.save_whisper_cache(job_folder, segments)
+                whisper_common.save_whisper_cache(job_folder, segments, store_key)
 
         if not segments:
             print("\u274c No valid segments after extraction")
@@ -98,12 +99,8 @@ def transcribe_audio(job_folder, song_title=None):
         # ============================================================
         # CLEANUP PIPELINE
         # ============================================================
-        segments = whisper_common.remove_hallucinations(segments, "lyric_current", initial_prompt)
-        segments = whisper_common.remove_junk(segments, "lyric_current")
-        segments = whisper_common.remove_stutter_duplicates(segments, "lyric_current")
-        segments = whisper_common.remove_repetition_loops(segments, "lyric_current")
-        segments = whisper_common.remove_instrumental_hallucinations(
-            segments, "lyric_current", audio_path
+        segments = whisper_common.clean_segments(
+            segments, "lyric_current", initial_prompt, audio
         )
 
         if not segments:
@@ -124,9 +121,12 @@ def transcribe_audio(job_folder, song_title=None):
                 with open(genius_path, "w", encoding="utf-8") as f:
                     f.write(genius_text)
 
+                # #46: parse the lyrics once for every Genius-aware helper
+                lyrics_index = whisper_common.GeniusLyricsIndex(genius_text)
+
                 # #33: Remove hallucinated segments that don't match Genius
                 segments = whisper_common.remove_genius_mismatches(
-                    segments, "lyric_current", genius_text
+                    segments, "lyric_current", genius_text, index=lyrics_index
                 )
 
                 # Re-detect language with Genius text for better accuracy
@@ -135,7 +135,8 @@ def transcribe_audio(job_folder, song_title=None):
                 print("\u270e Aligning lyrics (sliding window)...")
                 segments_backup = copy.deepcopy(segments)
                 segments, match_ratio = align_genius_to_whisper(
-                    segments, genius_text, segment_text_key="lyric_current"
+                    segments, genius_text, segment_text_key="lyric_current",
+                    index=lyrics_index
                 )
 
                 if match_ratio < 0.3:
@@ -165,7 +166,7 @@ def transcribe_audio(job_folder, song_title=None):
 
         lyrics_path = os.path.join(job_folder, "lyrics.txt")
         with open(lyrics_path, "w", encoding="utf-8") as f:
-            json.dump(segments, f, indent=4, ensure_ascii=False)
+            json.dump(segments, f, **whisper_common.COMPACT_JSON)
 
         print(f"\u2713 Transcription complete: {len(segments)} segments")
         return lyrics_path
@@ -4,7 +4,7 @@ Pipeline Common - Shared helpers for Aurora, Mono, and Onyx main.py files.
 Eliminates triplication of:
   - check_job_progress() — job state detection from files
   - run_audio_pipeline() — download + trim with caching
-  - run_batch() — Config.validate + loop + stats
+  - run_batch() — Config.validate + loop + stats (+ transcription worker warm-up)
 """
 import os
 import json
@@ -127,6 +127,12 @@ def run_batch(template_name, process_fn, console, song_db, banner, color="cyan")
         console.print(f"[dim]📊 Database: {stats['total_songs']} songs, "
                       f"{stats.get('cached_lyrics', 0)} with cached lyrics[/dim]\n")
 
+    # Start loading the model in the shared worker while the first job downloads
+    if Config.TRANSCRIBE_WORKER:
+        from scripts.transcription_worker import warm_up
+        if warm_up():
+            console.print(f"[dim]⚙ Transcription worker warming up {Config.WHISPER_MODEL}[/dim]")
+
     for job_id in range(1, Config.TOTAL_JOBS + 1):
         success = process_fn(job_id)
         if not success:
@@ -136,3 +142,8 @@ def run_batch(template_name, process_fn, console, song_db, banner, color="cyan")
     stats = song_db.get_stats()
     console.print(f"\n[{color}]📊 Database: {stats['total_songs']} songs, "
                   f"{stats.get('cached_lyrics', 0)} cached, {stats['total_uses']} total uses[/{color}]")
+    try:
+        from scripts.artifact_store import get_store
+        console.print(f"[dim]📦 {get_store().summary()}[/dim]")
+    except Exception:
+        pass
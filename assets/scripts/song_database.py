@@ -6,6 +6,10 @@ Each template has its own lyrics column:
   - transcribed_lyrics  → Aurora (line-by-line segments)
   - mono_lyrics         → Mono (word-level markers)
   - onyx_lyrics         → Onyx (word-level markers + colors)
+
+The pass_history table records every Whisper pass run per song (audio
+content hash) and bucket (model / language / Demucs), so the adaptive pass
+planner can start with the pass most likely to win.
 """
 import sqlite3
 import json
@@ -64,6 +68,23 @@ class SongDatabase:
             except sqlite3.OperationalError:
                 pass  # already exists
 
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS pass_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    song_key TEXT NOT NULL,
+                    bucket TEXT NOT NULL,
+                    pass_idx INTEGER NOT NULL,
+                    segments INTEGER NOT NULL DEFAULT 0,
+                    seconds REAL,
+                    won INTEGER NOT NULL DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_pass_history_song
+                ON pass_history (song_key, bucket)
+            """)
+
             conn.commit()
 
     # ========================================================================
@@ -188,7 +209,8 @@ class SongDatabase:
 
     def update_mono_lyrics(self, song_title, mono_lyrics):
         """Update Mono-format lyrics"""
-        lyrics_json = json.dumps(mono_lyrics) if mono_lyrics is not None else None
+        lyrics_json = (json.dumps(mono_lyrics, separators=(",", ":"))
+                       if mono_lyrics is not None else None)
 
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
@@ -227,7 +249,8 @@ class SongDatabase:
 
     def update_onyx_lyrics(self, song_title, onyx_lyrics):
         """Update Onyx-format lyrics"""
-        lyrics_json = json.dumps(onyx_lyrics) if onyx_lyrics is not None else None
+        lyrics_json = (json.dumps(onyx_lyrics, separators=(",", ":"))
+                       if onyx_lyrics is not None else None)
 
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
@@ -380,3 +403,60 @@ class SongDatabase:
             }
         finally:
             conn.close()
+
+    # ========================================================================
+    # WHISPER PASS HISTORY
+    # ========================================================================
+
+    def record_pass_history(self, song_key, bucket, attempts, winner):
+        """
+        Replace the stored pass outcomes of one song in one bucket.
+        attempts: [(pass_idx, segments, seconds), ...]; seconds may be None
+        (pass restored from a checkpoint).  winner: returned pass index or -1.
+        """
+        rows = [(song_key, bucket, idx, segments, seconds, int(idx == winner))
+                for idx, segments, seconds in attempts]
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "DELETE FROM pass_history WHERE song_key = ? AND bucket = ?",
+                (song_key, bucket))
+            conn.executemany("""
+                INSERT INTO pass_history (song_key, bucket, pass_idx, segments, seconds, won)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, rows)
+            conn.commit()
+
+    def get_winning_pass(self, song_key, bucket):
+        """Pass index that won the last run of this song in this bucket, or None."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT pass_idx FROM pass_history WHERE song_key = ? AND bucket = ? AND won = 1",
+                (song_key, bucket))
+            row = cursor.fetchone()
+            return row[0] if row else None
+        finally:
+            conn.close()
+
+    def get_pass_stats(self, bucket):
+        """
+        Per-pass outcome totals for a bucket:
+        {pass_idx: {"runs", "wins", "avg_segments", "avg_seconds"}}.
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT pass_idx, COUNT(*), SUM(won), AVG(segments), AVG(seconds)
+                FROM pass_history
+                WHERE bucket = ?
+                GROUP BY pass_idx
+            """, (bucket,))
+            return {
+                idx: {"runs": runs, "wins": wins or 0,
+                      "avg_segments": avg_segments, "avg_seconds": avg_seconds}
+                for idx, runs, wins, avg_segments, avg_seconds in cursor.fetchall()
+            }
+        finally:
+            conn.close()
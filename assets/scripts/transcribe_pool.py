@@ -0,0 +1,124 @@
+"""
+Transcribe Pool - CPU process pool for concurrent Whisper passes (#40),
+the chunks of a VAD-split clip (#41) and one pass over many songs (#42)
+
+On CPU-only hosts one Whisper pass cannot use more than a handful of cores
+(torch intra-op parallelism flattens out), so the multi-pass attempts are
+run speculatively side by side instead of one after another.  Each pool
+process keeps its own warm model and a bounded number of torch threads.
+
+Cancellation is cooperative: every task carries the generation it was
+submitted under, and the stable-ts progress callback aborts the pass as soon
+as the parent bumps the shared generation counter (cancel_all).
+"""
+import os
+import time
+import multiprocessing as mp
+
+from scripts.config import Config
+
+
+class PassCancelled(Exception):
+    """Raised inside a pool process to abandon a pass that is no longer needed."""
+
+
+# Parent-side state
+_pool = None
+_pool_size = 0
+_generation = None
+
+# Child-side state (set by _init_child)
+_child_generation = None
+
+
+def pool_threads(processes):
+    """torch intra-op threads per pool process."""
+    return Config.WHISPER_POOL_THREADS or max(1, (os.cpu_count() or 1) // processes)
+
+
+def _init_child(generation, threads):
+    global _child_generation
+    _child_generation = generation
+    try:
+        import torch
+        torch.set_num_threads(threads)
+        torch.set_num_interop_threads(1)
+    except Exception:
+        pass
+    # Pool processes transcribe in-process, on CPU, with their own model
+    Config.TRANSCRIBE_WORKER = False
+    Config.WHISPER_PARALLEL_PASSES = False
+    Config.WHISPER_CPU_THREADS = threads
+
+
+def _run_pass(generation, samples, params):
+    """Run one pass in a pool process; returns a picklable summary or None if cancelled."""
+    from scripts import whisper_common
+
+    def check_cancelled(*_args, **_kwargs):
+        if _child_generation is not None and _child_generation.value != generation:
+            raise PassCancelled()
+
+    start = time.time()
+    try:
+        check_cancelled()
+        model = whisper_common.load_whisper_model(force_cpu=True)
+        result = whisper_common._active_backend().transcribe(
+            model, samples, progress_callback=check_cancelled, **params)
+    except PassCancelled:
+        return None
+
+    # Raw pass: the parent regroups, refines and counts per template (#43)
+    elapsed = time.time() - start
+    if not result or not result.segments:
+        return {"result": None, "time": elapsed}
+    return {"result": result.to_dict(), "time": elapsed}
+
+
+def get_pool(processes):
+    """Persistent spawn-context pool (models stay loaded between songs)."""
+    global _pool, _pool_size, _generation
+    if _pool is not None and _pool_size == processes:
+        return _pool
+    shutdown()
+    ctx = mp.get_context("spawn")
+    _generation = ctx.Value("i", 0, lock=False)
+    _pool = ctx.Pool(processes, initializer=_init_child,
+                     initargs=(_generation, pool_threads(processes)))
+    _pool_size = processes
+    return _pool
+
+
+def submit(tasks):
+    """Start (samples, params) tasks at once; returns AsyncResults in order."""
+    pool = get_pool(Config.WHISPER_POOL_PROCESSES or len(tasks))
+    cancel_all()  # abandon anything still running from the previous song
+    gen = _generation.value
+    return [pool.apply_async(_run_pass, (gen, samples, params)) for samples, params in tasks]
+
+
+def submit_passes(samples, param_sets):
+    """Every pass of one clip at once, in priority order (#40)."""
+    return submit([(samples, params) for params in param_sets])
+
+
+def submit_chunks(chunks, params):
+    """Run one pass over several slices of a clip at once (#41)."""
+    return submit([(chunk, params) for chunk in chunks])
+
+
+def cancel_all():
+    """Ask every in-flight pass to stop at its next 30 s window."""
+    if _generation is not None:
+        _generation.value += 1
+
+
+def shutdown():
+    global _pool, _pool_size, _generation
+    if _pool is not None:
+        cancel_all()
+        _pool.terminate()
+        _pool.join()
+    _pool = None
+    _pool_size = 0
+    _generation = None
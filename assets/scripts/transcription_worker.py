@@ -0,0 +1,634 @@
+"""
+Transcription Worker - Long-lived local process that owns the Whisper model.
+
+The GUI (job_processing), the CLI batch runner (pipeline_common.run_batch)
+and the mobile server all transcribe through whisper_common.  Without a
+worker, each process loads the model itself and process_jobs unloads it at
+the end of every batch, so every batch pays the full model load again
+(20-40 s for `medium` on CPU).
+
+The worker is a tiny localhost HTTP server (stdlib only, works on Windows):
+  GET  /health      -> {"status", "model", "loaded", "busy", "idle_sec"}
+  POST /warmup      -> load the model in the background
+  POST /transcribe  -> whisper_common.multi_pass_transcribe(...)
+  POST /transcribe_batch -> whisper_common.batch_transcribe(...)  (#42)
+  POST /align       -> whisper_common.align_genius_to_audio(...)
+  POST /job         -> {"status": "running"} or the finished request's reply
+  POST /cancel      -> abort the request currently running
+
+The three model requests answer 202 {"job": id} at once and run in the
+background; the client long-polls /job (JOB_POLL_SEC per poll) until the
+reply is ready, so a batch may run for hours without any one HTTP request
+timing out.
+  POST /shutdown
+
+Every request must carry the per-install token from
+Config.TRANSCRIBE_WORKER_TOKEN_PATH (a user-only file) in the X-Apollova-Token
+header, and POST bodies must be application/json — other local processes and
+web pages (no-cors fetch cannot set either) get 403 / 415.
+
+Requests are serialised — one model, one transcription at a time.  After
+Config.TRANSCRIBE_WORKER_IDLE_SEC without a request the model is evicted
+and the process exits; the next client request spawns a fresh worker.
+
+Client helpers (ensure_worker, remote_transcribe, remote_align, warm_up)
+raise WorkerUnavailable when the worker cannot be reached or started, so
+callers can fall back to in-process transcription.  A request the worker
+accepted and lost (cancelled: 409, failed: 500, worker gone while polling,
+reply timed out) raises WorkerCancelled / WorkerFailed instead — re-running
+it in-process would ignore the user's cancel, pay for the failed work twice
+or run it alongside the worker that is still computing it.
+"""
+import os
+import io
+import sys
+import hmac
+import json
+import time
+import ctypes
+import secrets
+import threading
+import subprocess
+import contextlib
+import urllib.request
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+if __name__ == "__main__":
+    # Launched as a script — make `scripts.*` importable (assets/ on sys.path)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.config import Config
+
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+WORKER_HOST = "127.0.0.1"
+WORKER_START_TIMEOUT_SEC = 30
+WORKER_RETRY_AFTER_SEC = 600    # after a failed start, stay in-process this long
+HEALTH_TIMEOUT_SEC = 1.0
+SUBMIT_TIMEOUT_SEC = 30
+JOB_POLL_SEC = 30               # longest a /job poll waits for the result
+IDLE_POLL_SEC = 30
+TOKEN_HEADER = "X-Apollova-Token"
+
+_LOG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "logs", "transcription_worker.log",
+)
+
+
+# time.time() until which ensure_worker does not try to start a worker again
+_unavailable_until = 0.0
+_token_cache = (None, None)   # (token path, token)
+
+
+class WorkerUnavailable(Exception):
+    """The worker could not be reached or started."""
+
+
+class WorkerFailed(Exception):
+    """The worker ran the request and it raised."""
+
+
+class WorkerCancelled(WorkerFailed):
+    """The worker's request was aborted by POST /cancel."""
+
+
+class _Cancelled(Exception):
+    """Raised inside the busy handler thread by POST /cancel."""
+
+
+# ============================================================================
+# CLIENT SIDE
+# ============================================================================
+
+def _token():
+    """The per-install worker token, created (owner read/write only) on first use."""
+    global _token_cache
+    path = Config.TRANSCRIBE_WORKER_TOKEN_PATH
+    if _token_cache[0] == path:
+        return _token_cache[1]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            token = f.read().strip()
+    except FileNotFoundError:
+        token = ""
+    if not token:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        token = secrets.token_hex(32)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(token)
+        except FileExistsError:
+            # The worker or another client created it first — use theirs
+            with open(path, "r", encoding="utf-8") as f:
+                token = f.read().strip()
+    _token_cache = (path, token)
+    return token
+
+
+def _url(path, port=None):
+    return f"http://{WORKER_HOST}:{port or Config.TRANSCRIBE_WORKER_PORT}{path}"
+
+
+def _request(path, payload=None, timeout=SUBMIT_TIMEOUT_SEC, port=None):
+    """
+    Send a JSON request to the worker and return the decoded reply.
+
+    urlopen wraps connect errors in URLError (WorkerUnavailable); an OSError
+    raised while reading the reply means the worker took the request and
+    then timed out or dropped the connection (WorkerFailed).
+    """
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    req = urllib.request.Request(
+        _url(path, port), data=data,
+        headers={"Content-Type": "application/json", TOKEN_HEADER: _token()},
+        method="POST" if data is not None else "GET",
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return json.loads(resp.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        try:
+            detail = json.loads(e.read().decode("utf-8")).get("error", str(e))
+        except Exception:
+            detail = str(e)
+        if e.code == 409:
+            raise WorkerCancelled(detail) from None
+        if e.code == 500:
+            raise WorkerFailed(detail) from None
+        raise WorkerUnavailable(detail) from None
+    except (urllib.error.URLError, ValueError) as e:
+        raise WorkerUnavailable(str(e)) from None
+    except OSError as e:
+        raise WorkerFailed(f"no reply from worker: {e}") from None
+
+
+def worker_status(port=None):
+    """Return the worker's /health dict, or None if it is not running."""
+    try:
+        return _request("/health", timeout=HEALTH_TIMEOUT_SEC, port=port)
+    except (WorkerUnavailable, WorkerFailed):
+        return None
+
+
+def ensure_worker(port=None):
+    """
+    Return True once a worker answers on the port, spawning one if needed.
+
+    A failed start (port held by another program, worker crashing on
+    import) is remembered for WORKER_RETRY_AFTER_SEC: until then every call
+    returns False at once, so callers go straight to in-process instead of
+    waiting WORKER_START_TIMEOUT_SEC per song.
+    """
+    global _unavailable_until
+    if time.time() < _unavailable_until:
+        return False
+    port = port or Config.TRANSCRIBE_WORKER_PORT
+    if worker_status(port) is not None:
+        return True
+
+    os.makedirs(os.path.dirname(_LOG_PATH), exist_ok=True)
+    cmd = [sys.executable, os.path.abspath(__file__),
+           "--port", str(port),
+           "--idle", str(Config.TRANSCRIBE_WORKER_IDLE_SEC)]
+    kwargs = {}
+    if sys.platform == "win32":
+        kwargs["creationflags"] = (getattr(subprocess, "CREATE_NO_WINDOW", 0)
+                                   | getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0))
+    else:
+        kwargs["start_new_session"] = True
+    try:
+        with open(_LOG_PATH, "a", encoding="utf-8") as log:
+            subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=log,
+                             stderr=subprocess.STDOUT, **kwargs)
+    except OSError as e:
+        print(f"  ⚠ Could not start transcription worker: {e}")
+        _unavailable_until = time.time() + WORKER_RETRY_AFTER_SEC
+        return False
+
+    deadline = time.time() + WORKER_START_TIMEOUT_SEC
+    while time.time() < deadline:
+        if worker_status(port) is not None:
+            print(f"  ⚙ Transcription worker started on port {port}")
+            return True
+        time.sleep(0.25)
+    print("  ⚠ Transcription worker did not come up in time — "
+          f"transcribing in-process for the next {WORKER_RETRY_AFTER_SEC // 60} min")
+    _unavailable_until = time.time() + WORKER_RETRY_AFTER_SEC
+    return False
+
+
+def warm_up(force_cpu=False):
+    """Start the worker (if needed) and begin loading the model in the background.
+
+    Called at the start of a batch so the model load overlaps with the
+    download/trim stages.  Never raises — returns True on success.
+    """
+    if not ensure_worker():
+        return False
+    try:
+        _request("/warmup", {"model": Config.WHISPER_MODEL,
+                             "backend": Config.WHISPER_BACKEND,
+                             "force_cpu": force_cpu},
+                 timeout=HEALTH_TIMEOUT_SEC * 5)
+        return True
+    except (WorkerUnavailable, WorkerFailed):
+        return False
+
+
+def cancel_active():
+    """Ask the worker to abort whatever request it is running (best effort)."""
+    try:
+        _request("/cancel", {}, timeout=HEALTH_TIMEOUT_SEC * 5)
+    except (WorkerUnavailable, WorkerFailed):
+        pass
+
+
+def _run_job(path, payload):
+    """
+    Submit a model request and poll /job until its reply is ready.
+
+    Only the submit may raise WorkerUnavailable (nothing was started yet).
+    Once the worker holds the job, losing it is WorkerFailed so the caller
+    does not re-run it in-process.
+    """
+    job = _request(path, payload)["job"]
+    while True:
+        try:
+            reply = _request("/job", {"job": job, "wait": JOB_POLL_SEC},
+                             timeout=JOB_POLL_SEC + SUBMIT_TIMEOUT_SEC)
+        except WorkerUnavailable as e:
+            raise WorkerFailed(f"worker lost job {job}: {e}") from None
+        if reply.get("status") != "running":
+            return reply
+
+
+def _replay_log(reply):
+    """Re-print the worker's captured output so progress shows in the caller's log."""
+    log = reply.get("log") or ""
+    for line in log.splitlines():
+        if line.strip():
+            print(line)
+
+
+def _to_whisper_result(data):
+    if not data:
+        return None
+    from stable_whisper import WhisperResult
+    return WhisperResult(data)
+
+
+def remote_transcribe(audio_path, prompt, duration, language,
+                      word_timestamps=True, regroup_passes=None,
+                      from_demucs=False):
+    """multi_pass_transcribe() through the worker. Returns (result, pass_index)."""
+    if not ensure_worker():
+        raise WorkerUnavailable("worker not running")
+    reply = _run_job("/transcribe", {
+        "model": Config.WHISPER_MODEL,
+        "backend": Config.WHISPER_BACKEND,
+        "audio_path": os.path.abspath(audio_path),
+        "prompt": prompt,
+        "duration": duration,
+        "language": language,
+        "word_timestamps": word_timestamps,
+        "regroup_passes": regroup_passes,
+        "from_demucs": from_demucs,
+    })
+    _replay_log(reply)
+    return _to_whisper_result(reply.get("result")), reply.get("pass_idx", -1)
+
+
+def remote_transcribe_batch(requests):
+    """batch_transcribe() through the worker. Returns [(result, pass_index), ...]."""
+    if not ensure_worker():
+        raise WorkerUnavailable("worker not running")
+    reply = _run_job("/transcribe_batch", {
+        "model": Config.WHISPER_MODEL,
+        "backend": Config.WHISPER_BACKEND,
+        "songs": [{
+            "audio_path": os.path.abspath(getattr(r["audio"], "path", None) or r["audio"]),
+            "label": r.get("label"),
+            "prompt": r.get("prompt"),
+            "duration": r.get("duration"),
+            "language": r.get("language"),
+            "word_timestamps": r.get("word_timestamps", True),
+            "regroup_passes": r.get("regroup_passes"),
+            "from_demucs": r.get("from_demucs", False),
+        } for r in requests],
+    })
+    _replay_log(reply)
+    return [(_to_whisper_result(item.get("result")), item.get("pass_idx", -1))
+            for item in reply.get("results", [])]
+
+
+def remote_align(audio_path, genius_text, language=None):
+    """align_genius_to_audio() through the worker. Returns a result or None."""
+    if not ensure_worker():
+        raise WorkerUnavailable("worker not running")
+    reply = _run_job("/align", {
+        "model": Config.WHISPER_MODEL,
+        "backend": Config.WHISPER_BACKEND,
+        "audio_path": os.path.abspath(audio_path),
+        "genius_text": genius_text,
+        "language": language,
+    })
+    _replay_log(reply)
+    return _to_whisper_result(reply.get("result"))
+
+
+# ============================================================================
+# SERVER SIDE
+# ============================================================================
+
+class _WorkerState:
+    """Shared between handler threads and the idle watcher."""
+
+    def __init__(self, idle_sec, token):
+        self.idle_sec = idle_sec
+        self.token = token
+        self.model_lock = threading.Lock()
+        self.state_lock = threading.Lock()
+        self.last_activity = time.time()
+        self.busy_thread = None
+        self.jobs = {}   # job id -> {"done": Event, "code": int, "payload": dict}
+
+    def touch(self):
+        with self.state_lock:
+            self.last_activity = time.time()
+
+    def idle_for(self):
+        with self.state_lock:
+            return time.time() - self.last_activity
+
+
+def _set_model(req):
+    """Adopt the client's model/backend; load_whisper_model reloads on a change."""
+    name = req.get("model")
+    if name and name in Config.VALID_WHISPER_MODELS:
+        Config.WHISPER_MODEL = name
+    backend = req.get("backend")
+    if backend and backend in Config.VALID_WHISPER_BACKENDS:
+        Config.WHISPER_BACKEND = backend
+
+
+def _run_exclusive(state, fn):
+    """
+    Run fn() holding the model lock, capturing its stdout for the client.
+
+    _cancel_busy clears busy_thread and posts _Cancelled under state_lock,
+    so finding busy_thread already cleared here means a cancel was sent:
+    any still-pending _Cancelled is withdrawn and raised explicitly, and a
+    cancel that lands after fn() returned still reports as cancelled.
+    """
+    tid = threading.get_ident()
+    with state.model_lock:
+        with state.state_lock:
+            state.busy_thread = tid
+        buf = io.StringIO()
+        cancelled = False
+        try:
+            with contextlib.redirect_stdout(buf):
+                payload = fn()
+        finally:
+            with state.state_lock:
+                if state.busy_thread is None:
+                    cancelled = True
+                    ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(tid), None)
+                state.busy_thread = None
+                state.last_activity = time.time()
+        if cancelled:
+            raise _Cancelled()
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+        payload["log"] = buf.getvalue()
+        return payload
+
+
+def _handle_transcribe(req):
+    from scripts import whisper_common
+    _set_model(req)
+    result, idx = whisper_common.multi_pass_transcribe(
+        req["audio_path"], req.get("prompt"), req.get("duration"), req.get("language"),
+        word_timestamps=req.get("word_timestamps", True),
+        regroup_passes=req.get("regroup_passes"),
+        from_demucs=req.get("from_demucs", False),
+    )
+    return {"result": result.to_dict() if result else None, "pass_idx": idx}
+
+
+def _handle_transcribe_batch(req):
+    from scripts import whisper_common
+    _set_model(req)
+    songs = [dict(song, audio=song.pop("audio_path")) for song in req.get("songs", [])]
+    outcomes = whisper_common.batch_transcribe(songs)
+    return {"results": [{"result": result.to_dict() if result else None, "pass_idx": idx}
+                        for result, idx in outcomes]}
+
+
+def _handle_align(req):
+    from scripts import whisper_common
+    _set_model(req)
+    result = whisper_common.align_genius_to_audio(
+        req["audio_path"], req.get("genius_text"), req.get("language"))
+    return {"result": result.to_dict() if result else None}
+
+
+def _make_handler(state):
+    class _Handler(BaseHTTPRequestHandler):
+        def log_message(self, fmt, *args):
+            pass
+
+        def _send(self, code, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _authorised(self):
+            if hmac.compare_digest(self.headers.get(TOKEN_HEADER, ""), state.token):
+                return True
+            self._send(403, {"error": "forbidden"})
+            return False
+
+        def do_GET(self):
+            if not self._authorised():
+                return
+            if self.path != "/health":
+                self._send(404, {"error": "not found"})
+                return
+            from scripts import whisper_common
+            with state.state_lock:
+                busy = state.busy_thread is not None
+            self._send(200, {
+                "status": "ok",
+                "pid": os.getpid(),
+                "model": Config.WHISPER_MODEL,
+                "backend": Config.WHISPER_BACKEND,
+                "loaded": whisper_common.is_model_loaded(),
+                "busy": busy,
+                "idle_sec": round(state.idle_for(), 1),
+            })
+
+        def do_POST(self):
+            if not self._authorised():
+                return
+            if self.headers.get_content_type() != "application/json":
+                self._send(415, {"error": "expected application/json"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                req = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                self._send(400, {"error": "invalid JSON"})
+                return
+            state.touch()
+
+            if self.path == "/warmup":
+                threading.Thread(target=self._warmup, args=(req,), daemon=True).start()
+                self._send(202, {"status": "loading"})
+            elif self.path == "/transcribe":
+                self._send(202, {"job": _start_job(state, lambda: _handle_transcribe(req))})
+            elif self.path == "/transcribe_batch":
+                self._send(202, {"job": _start_job(state, lambda: _handle_transcribe_batch(req))})
+            elif self.path == "/align":
+                self._send(202, {"job": _start_job(state, lambda: _handle_align(req))})
+            elif self.path == "/job":
+                self._poll_job(req)
+            elif self.path == "/cancel":
+                self._send(200, {"cancelled": _cancel_busy(state)})
+            elif self.path == "/shutdown":
+                self._send(200, {"status": "stopping"})
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            else:
+                self._send(404, {"error": "not found"})
+
+        def _warmup(self, req):
+            from scripts import whisper_common
+
+            def _load():
+                _set_model(req)
+                whisper_common.load_whisper_model(force_cpu=bool(req.get("force_cpu")))
+                return {}
+            try:
+                _run_exclusive(state, _load)
+            except Exception as e:
+                print(f"  ⚠ Warm-up failed: {e}")
+
+        def _poll_job(self, req):
+            with state.state_lock:
+                job = state.jobs.get(req.get("job"))
+            if job is None:
+                self._send(404, {"error": "unknown job"})
+                return
+            try:
+                wait = min(max(float(req.get("wait", 0)), 0.0), JOB_POLL_SEC)
+            except (TypeError, ValueError):
+                wait = 0.0
+            if not job["done"].wait(wait):
+                self._send(200, {"status": "running"})
+                return
+            with state.state_lock:
+                state.jobs.pop(req.get("job"), None)
+            self._send(job["code"], job["payload"])
+
+    return _Handler
+
+
+def _start_job(state, fn):
+    """Run fn() via _run_exclusive on a background thread; return its job id."""
+    job_id = secrets.token_hex(8)
+    job = {"done": threading.Event(), "code": None, "payload": None}
+
+    def _run():
+        try:
+            job["payload"] = dict(_run_exclusive(state, fn), status="done")
+            job["code"] = 200
+        except _Cancelled:
+            job["code"], job["payload"] = 409, {"error": "cancelled"}
+        except Exception as e:
+            job["code"], job["payload"] = 500, {"error": f"{type(e).__name__}: {e}"}
+        finally:
+            job["done"].set()
+
+    with state.state_lock:
+        state.jobs[job_id] = job
+    threading.Thread(target=_run, daemon=True).start()
+    return job_id
+
+
+def _cancel_busy(state):
+    """
+    Raise _Cancelled inside the busy handler thread (same trick as
+    run_with_ticker).  busy_thread is cleared in the same critical section,
+    so the worker never stays "busy" if the exception lands in
+    _run_exclusive's cleanup.
+    """
+    with state.state_lock:
+        tid = state.busy_thread
+        if tid is None:
+            return False
+        state.busy_thread = None
+        ctypes.pythonapi.PyThreadState_SetAsyncExc(
+            ctypes.c_ulong(tid), ctypes.py_object(_Cancelled))
+    return True
+
+
+def _idle_watcher(server, state):
+    """Evict the model and stop the server after state.idle_sec of inactivity."""
+    while True:
+        time.sleep(min(IDLE_POLL_SEC, max(state.idle_sec, 1)))
+        with state.state_lock:
+            busy = state.busy_thread is not None
+        if busy or state.idle_for() < state.idle_sec:
+            continue
+        print(f"  ⏱ Idle for {state.idle_for():.0f}s — evicting model and exiting")
+        try:
+            from scripts import whisper_common
+            with state.model_lock:
+                whisper_common.unload_model()
+        except Exception:
+            pass
+        server.shutdown()
+        return
+
+
+def serve(port=None, idle_sec=None):
+    """Run the worker in the foreground until idle timeout or /shutdown."""
+    port = port or Config.TRANSCRIBE_WORKER_PORT
+    idle_sec = idle_sec if idle_sec is not None else Config.TRANSCRIBE_WORKER_IDLE_SEC
+    # Requests that reach this process must run locally, never bounce back here
+    Config.TRANSCRIBE_WORKER = False
+
+    state = _WorkerState(idle_sec, _token())
+    try:
+        server = ThreadingHTTPServer((WORKER_HOST, port), _make_handler(state))
+    except OSError as e:
+        # Another worker already owns the port — nothing to do
+        print(f"  Transcription worker not started (port {port}): {e}")
+        return
+    server.daemon_threads = True
+    threading.Thread(target=_idle_watcher, args=(server, state), daemon=True).start()
+    print(f"  ⚙ Transcription worker listening on {WORKER_HOST}:{port} "
+          f"(pid {os.getpid()}, idle timeout {idle_sec}s)")
+    sys.stdout.flush()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Apollova transcription worker")
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--idle", type=int, default=None)
+    args = parser.parse_args()
+    serve(port=args.port, idle_sec=args.idle)
@@ -25,21 +25,53 @@ Improvements applied:
   #28: Forced Genius alignment via model.align() for precise word timestamps
   #29: Automatic language detection via langdetect on Genius text
   #30: Noise reduction via noisereduce (stationary noise removal)
+  #34: Persistent transcription worker (model stays warm across batches)
+  #35: Pluggable ASR backend (stable-ts or faster-whisper int8, WHISPER_BACKEND)
+  #36: Decode-once AudioBuffer (16 kHz mono float32) shared by duration,
+       normalization, noise reduction, Whisper input and the silence map
+  #37: Content-addressed artifact store (vocal stems, prepared audio, raw
+       Whisper segments) with a disk budget, LRU eviction and hardlinks
+  #38: In-process Demucs (persistent model, apply_model with configurable
+       segment/overlap/num_workers) returning the vocal stem as a buffer
+  #39: Mel + encoder output computed once per clip and shared by every
+       pass, temperature fallback and the forced alignment (whisper_features)
+  #40: Optional speculative passes in a CPU process pool (transcribe_pool),
+       same weighted-score / early-accept selection as the sequential loop
+  #41: Optional VAD-split chunked transcription — the clip is cut at silence
+       boundaries and chunks run in parallel, stitched at absolute offsets
+  #42: Cross-song batch transcription — pass 1 for every song in a batch,
+       later passes only for songs below min_expected (pretranscribe)
+  #43: Raw Whisper passes decoded once per (input, model, pass) and shared
+       by every template; each template regroups and refines its own copy
+  #44: Fused cleanup — each segment normalised once (LineRecord), patterns
+       compiled at import, filters chained as streaming stages (clean_segments)
+  #45: Genius/Whisper duplicate counts from rapidfuzz cdist score matrices,
+       shared by duplicate removal and quality validation (LyricMatchMatrix)
+  #46: Genius lyrics parsed once per song into a GeniusLyricsIndex (lines +
+       word -> line inverted index) shared by every Genius-aware helper
+  #49: Marker post-processing on a structure-of-arrays MarkerTable —
+       vectorised gap fix / cluster detection, array snapshots instead of
+       deepcopy, one conversion back to marker dicts
+  #50: Silence map as a NumPy RMS envelope on a 100 ms hop with a prefix
+       sum, so each segment's silent ratio is an O(1) lookup
+  #51: Whisper cache v2 — versioned header, columnar word timings, compact
+       JSON; word dicts only built for callers that need them
+  #52: Per-pass checkpoints in the artifact store — a resumed job skips
+       the passes an earlier run already finished
+  #53: Adaptive pass planner — pass history per song and per (model,
+       language, Demucs) bucket in songs.db; the likely winner runs first
 """
 import os
 import json
 import re
 import gc
-import copy
 import time as _time
-import subprocess
-import sys
-import tempfile
-import shutil
+from functools import cached_property
 
+import numpy as np
 from pydub import AudioSegment
 from stable_whisper import load_model
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 
 try:
     import torch
@@ -48,7 +80,13 @@ except ImportError:
     HAS_TORCH = False
 
 from scripts.config import Config
-from scripts.audio_processing import normalize_audio, reduce_noise
+from scripts.audio_processing import (
+    normalize_audio, reduce_noise, load_audio_buffer, AudioBuffer,
+    NORMALIZE_TARGET_DBFS, WHISPER_SAMPLE_RATE,
+)
+from scripts.artifact_store import get_store, file_hash
+from scripts import whisper_features
+from scripts import transcribe_pool
 
 
 # ============================================================================
@@ -61,6 +99,7 @@ NO_SPEECH_PROB_THRESHOLD = 0.7
 SILENCE_RATIO_THRESHOLD = 0.7
 SILENCE_ENERGY_RATIO = 0.1
 PASS_TIME_CAP_SEC = 180
+DEMUCS_MODEL = "htdemucs"
 MAX_SEGMENT_DURATION_SEC = 30
 NON_LATIN_RATIO_THRESHOLD = 0.4
 HALLUCINATION_SIMILARITY = 85
@@ -73,12 +112,100 @@ LYRICS_MAX_LINE_LENGTH = 80
 LYRICS_MIN_LINE_LENGTH = 2
 
 
+# ============================================================================
+# ASR BACKENDS (#35: stable-ts PyTorch or faster-whisper/CTranslate2 int8)
+# ============================================================================
+
+class StableTsBackend:
+    """openai-whisper (PyTorch, fp32 on CPU) driven by stable-ts — the original engine."""
+
+    name = "stable-ts"
+
+    def load(self, model_name, force_cpu=False):
+        return load_model(
+            model_name,
+            download_root=Config.WHISPER_CACHE_DIR,
+            in_memory=False,
+        )
+
+    def transcribe(self, model, audio_path, **params):
+        return model.transcribe(audio_path, **params)
+
+    def align(self, model, audio_path, text, **params):
+        return model.align(audio_path, text, **params)
+
+    def share_features(self, model):
+        """#39: memoize mel + encoder output per 30 s window."""
+        whisper_features.install_stable_ts(model)
+
+
+class FasterWhisperBackend(StableTsBackend):
+    """
+    CTranslate2 engine (int8 on CPU) through stable-ts' faster-whisper wrapper.
+
+    The wrapper returns the same stable-ts WhisperResult objects as the
+    PyTorch engine, so build_markers_from_segments, remove_hallucinations
+    and quality_gate see identical segment/word structures.
+    """
+
+    name = "faster-whisper"
+
+    def load(self, model_name, force_cpu=False):
+        from stable_whisper import load_faster_whisper
+        on_gpu = not force_cpu and HAS_TORCH and torch.cuda.is_available()
+        return load_faster_whisper(
+            model_name,
+            device="cuda" if on_gpu else "cpu",
+            compute_type="int8_float16" if on_gpu else Config.WHISPER_COMPUTE_TYPE,
+            cpu_threads=Config.WHISPER_CPU_THREADS or (os.cpu_count() or 4),
+            download_root=Config.WHISPER_CACHE_DIR,
+        )
+
+    def transcribe(self, model, audio_path, **params):
+        # Older stable-ts exposes the word-level path as transcribe_stable
+        fn = getattr(model, "transcribe_stable", None) or model.transcribe
+        return fn(audio_path, **params)
+
+    def share_features(self, model):
+        whisper_features.install_faster_whisper(model)
+
+
+_BACKENDS = {
+    StableTsBackend.name: StableTsBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+
+def _faster_whisper_installed():
+    import importlib.util
+    return importlib.util.find_spec("faster_whisper") is not None
+
+
+def get_backend(force_cpu=False):
+    """
+    Resolve Config.WHISPER_BACKEND to a backend instance.
+    'auto' picks faster-whisper on CPU-only hosts (when installed) and
+    stable-ts when a CUDA GPU is available.
+    """
+    name = Config.WHISPER_BACKEND
+    if name == "auto":
+        on_gpu = not force_cpu and HAS_TORCH and torch.cuda.is_available()
+        if not on_gpu and _faster_whisper_installed():
+            name = FasterWhisperBackend.name
+        else:
+            name = StableTsBackend.name
+    return _BACKENDS.get(name, StableTsBackend)()
+
+
 # ============================================================================
 # MODEL CACHING (#2)
 # ============================================================================
 
 _cached_model = None
 _cached_on_cpu = None
+_cached_model_name = None
+_cached_backend = None
+_cached_requested = None   # backend asked for (differs from _cached_backend after a fallback)
 
 
 def get_device_info():
@@ -89,11 +216,30 @@ def get_device_info():
     return "CPU"
 
 
+def _load_backend_model(backend, force_cpu):
+    """Load via backend; fall back to stable-ts if the alternative engine fails."""
+    try:
+        return backend, backend.load(Config.WHISPER_MODEL, force_cpu=force_cpu)
+    except Exception as e:
+        if backend.name == StableTsBackend.name:
+            raise
+        print(f"  \u26a0 {backend.name} backend unavailable ({e}) \u2014 using stable-ts")
+        backend = StableTsBackend()
+        return backend, backend.load(Config.WHISPER_MODEL, force_cpu=force_cpu)
+
+
 def load_whisper_model(force_cpu=False):
     """Load Whisper model with caching — skip reload if same config."""
-    global _cached_model, _cached_on_cpu
-
-    if _cached_model is not None and _cached_on_cpu == force_cpu:
+    global _cached_model, _cached_on_cpu, _cached_model_name, _cached_backend
+    global _cached_requested
+
+    backend = get_backend(force_cpu)
+    requested = backend.name
+    # Keyed on the requested engine so a fallback model is reused instead of
+    # retrying the failing engine on every call
+    if (_cached_model is not None and _cached_on_cpu == force_cpu
+            and _cached_model_name == Config.WHISPER_MODEL
+            and _cached_requested == requested):
         print(f"  \u267b Reusing cached {Config.WHISPER_MODEL} model")
         return _cached_model
 
@@ -109,36 +255,54 @@ def load_whisper_model(force_cpu=False):
         original_visible = os.environ.get("CUDA_VISIBLE_DEVICES")
         os.environ["CUDA_VISIBLE_DEVICES"] = ""
         try:
-            print(f"  Loading {Config.WHISPER_MODEL} on CPU (forced)...")
-            _cached_model = load_model(
-                Config.WHISPER_MODEL,
-                download_root=Config.WHISPER_CACHE_DIR,
-                in_memory=False,
-            )
+            print(f"  Loading {Config.WHISPER_MODEL} ({backend.name}) on CPU (forced)...")
+            backend, _cached_model = _load_backend_model(backend, force_cpu)
         finally:
             if original_visible is not None:
                 os.environ["CUDA_VISIBLE_DEVICES"] = original_visible
             else:
                 os.environ.pop("CUDA_VISIBLE_DEVICES", None)
     else:
-        print(f"  Loading {Config.WHISPER_MODEL} on {device}...")
-        _cached_model = load_model(
-            Config.WHISPER_MODEL,
-            download_root=Config.WHISPER_CACHE_DIR,
-            in_memory=False,
-        )
+        print(f"  Loading {Config.WHISPER_MODEL} ({backend.name}) on {device}...")
+        backend, _cached_model = _load_backend_model(backend, force_cpu)
+
+    if Config.WHISPER_SHARE_FEATURES:
+        try:
+            backend.share_features(_cached_model)
+        except Exception as e:
+            print(f"  \u26a0 Feature sharing unavailable: {e}")
 
     _cached_on_cpu = force_cpu
+    _cached_model_name = Config.WHISPER_MODEL
+    _cached_backend = backend
+    _cached_requested = requested
     return _cached_model
 
 
+def _active_backend():
+    """Backend that loaded the cached model (stable-ts if none loaded yet)."""
+    return _cached_backend or StableTsBackend()
+
+
+def is_model_loaded():
+    """True if a Whisper model is cached in this process."""
+    return _cached_model is not None
+
+
 def unload_model():
-    """Explicit cleanup when truly done."""
-    global _cached_model, _cached_on_cpu
+    """Explicit cleanup when truly done (also drops the Demucs model, #38)."""
+    global _cached_model, _cached_on_cpu, _cached_model_name, _cached_backend
+    global _cached_requested
+    unload_demucs()
+    whisper_features.reset()
+    transcribe_pool.shutdown()
     if _cached_model is not None:
         del _cached_model
         _cached_model = None
         _cached_on_cpu = None
+        _cached_model_name = None
+        _cached_backend = None
+        _cached_requested = None
         clear_vram()
 
 
@@ -159,10 +323,23 @@ def _refine_result(result):
         print(f"  Warning: post-transcription refinement failed: {e}")
 
 
-def _snap_to_silence(result, audio_path):
+def count_segments(result):
+    """Segments with real text — the multi-pass acceptance metric."""
+    return sum(
+        1 for s in result.segments
+        if s.text.strip() and len(s.text.strip()) > 1
+    )
+
+
+def _result_from_dict(data):
+    from stable_whisper import WhisperResult
+    return WhisperResult(data) if data else None
+
+
+def _snap_to_silence(result, audio):
     """Snap word timestamps to speech boundaries using VAD."""
     try:
-        result.adjust_by_silence(audio_path, vad=True)
+        result.adjust_by_silence(_audio_input(audio), vad=True)
     except Exception as e:
         print(f"  Warning: silence adjustment failed: {e}")
 
@@ -171,33 +348,163 @@ def _snap_to_silence(result, audio_path):
 # AUDIO HELPERS
 # ============================================================================
 
-def get_audio_duration(audio_path):
-    """Get duration of audio file in seconds. Returns None on failure (#13)."""
+def _is_path(audio):
+    return isinstance(audio, (str, os.PathLike))
+
+
+def load_audio(audio_path):
+    """
+    Decode audio_path once into an AudioBuffer (#36).
+    Falls back to the path itself if decoding fails, so every helper below
+    accepts either form.
+    """
+    buffer = load_audio_buffer(audio_path)
+    return buffer if buffer is not None else audio_path
+
+
+def _source_path(audio):
+    """File behind a path or AudioBuffer (None for purely in-memory audio)."""
+    return audio if _is_path(audio) else audio.path
+
+
+def _audio_input(audio):
+    """What to hand stable-ts / faster-whisper: a file path or 16 kHz samples."""
+    return audio if _is_path(audio) else audio.samples
+
+
+def _prepare_audio(audio, from_demucs):
+    """
+    Normalize (and, unless the input is a Demucs stem, denoise) a buffer.
+    #37: The prepared samples are cached in the artifact store keyed by the
+    source file's hash, so re-runs skip noisereduce entirely.
+    """
+    store, store_key = get_store(), None
+    if audio.path and os.path.exists(audio.path):
+        try:
+            store_key = store.key(file_hash(audio.path), sr=audio.sample_rate,
+                                  normalize_dbfs=NORMALIZE_TARGET_DBFS,
+                                  denoise=not from_demucs)
+            cached = store.get("prepared", store_key, ".npy")
+            if cached:
+                print("  \u267b Reusing prepared audio from artifact store")
+                return AudioBuffer(np.load(cached), audio.sample_rate, audio.path)
+        except Exception as e:
+            print(f"  \u26a0 Artifact store lookup failed: {e}")
+            store_key = None
+
+    prepared = normalize_audio(audio)
+    # Skip noise reduction for Demucs output — vocals stem is already clean
+    if not from_demucs:
+        prepared = reduce_noise(prepared)
+    prepared.path = audio.path
+
+    if store_key:
+        try:
+            import io
+            raw = io.BytesIO()
+            np.save(raw, prepared.samples)
+            store.put_bytes("prepared", store_key, raw.getvalue(), ".npy")
+        except Exception as e:
+            print(f"  \u26a0 Failed to store prepared audio: {e}")
+    return prepared
+
+
+def _clip_id(audio):
+    """Identity of the Whisper input for the feature cache (#39)."""
+    return audio if _is_path(audio) else whisper_features.content_key(audio.samples)
+
+
+def get_audio_duration(audio):
+    """Get duration of an audio file or AudioBuffer in seconds. Returns None on failure (#13)."""
     try:
-        audio = AudioSegment.from_file(audio_path)
-        return len(audio) / 1000.0
+        if not _is_path(audio):
+            return audio.duration
+        segment = AudioSegment.from_file(audio)
+        return len(segment) / 1000.0
     except Exception:
         return None
 
 
 def _get_audio_hash(audio_path):
     """Compute SHA-256 hash of an audio file for cross-template caching."""
-    import hashlib
-    h = hashlib.sha256()
-    with open(audio_path, "rb") as f:
-        for chunk in iter(lambda: f.read(65536), b""):
-            h.update(chunk)
-    return h.hexdigest()[:16]
+    return file_hash(audio_path)
+
+
+_demucs_model = None
+_demucs_device = None
+
+
+def _load_demucs():
+    """Load the Demucs model once per process and keep it for later songs (#38)."""
+    global _demucs_model, _demucs_device
+    if _demucs_model is None:
+        from demucs.pretrained import get_model
+        _demucs_device = "cuda" if HAS_TORCH and torch.cuda.is_available() else "cpu"
+        print(f"  Loading Demucs {DEMUCS_MODEL} on {_demucs_device}...")
+        model = get_model(DEMUCS_MODEL)
+        model.to(_demucs_device)
+        model.eval()
+        _demucs_model = model
+    return _demucs_model
+
+
+def unload_demucs():
+    """Drop the cached Demucs model (frees its VRAM)."""
+    global _demucs_model, _demucs_device
+    if _demucs_model is not None:
+        _demucs_model = None
+        _demucs_device = None
+        clear_vram()
+
+
+def extract_vocals(audio_path):
+    """
+    Separate the vocal stem in-process and return it as a 16 kHz AudioBuffer.
+
+    #38: Uses demucs.apply.apply_model on the already-trimmed clip with the
+    cached model — no subprocess, no torch re-import, no stem files on disk.
+    Segment length, overlap and CPU worker threads come from Config.
+    """
+    import librosa
+    from demucs.apply import apply_model
+
+    model = _load_demucs()
+    wav, _ = librosa.load(audio_path, sr=model.samplerate, mono=False)
+    if wav.ndim == 1:
+        wav = np.stack([wav] * model.audio_channels)
+
+    # Same input normalisation as the demucs CLI
+    ref = wav.mean(0)
+    mean, std = float(ref.mean()), float(ref.std()) or 1.0
+    mix = torch.from_numpy((wav - mean) / std)[None]
+
+    num_workers = Config.DEMUCS_WORKERS or (os.cpu_count() or 1)
+    with torch.no_grad():
+        sources = apply_model(
+            model, mix, device=_demucs_device, split=True,
+            segment=Config.DEMUCS_SEGMENT or None,
+            overlap=Config.DEMUCS_OVERLAP,
+            num_workers=num_workers if _demucs_device == "cpu" else 0,
+            progress=False,
+        )[0]
+
+    vocals = sources[model.sources.index("vocals")] * std + mean
+    vocals = vocals.mean(0).cpu().numpy()
+    vocals = librosa.resample(vocals, orig_sr=model.samplerate, target_sr=WHISPER_SAMPLE_RATE)
+    return AudioBuffer(vocals.astype(np.float32), WHISPER_SAMPLE_RATE, None)
 
 
 def separate_vocals(audio_path, job_folder):
     """
     Use Demucs to extract vocals from audio for cleaner Whisper input.
 
-    Saves vocals.wav in the job folder.  Returns the vocals path if
-    successful, or the original audio_path as fallback.
-    Uses a shared cache so the same audio doesn't run Demucs multiple times
-    across Aurora/Mono/Onyx.
+    Returns the vocal stem (an AudioBuffer backed by vocals.wav in the job
+    folder, or the vocals.wav path when cached), or the original audio_path
+    as fallback.
+    #37: Stems live in the artifact store (keyed by audio hash + Demucs
+    model) and are hardlinked into the job folder, so the same audio never
+    runs Demucs twice across Aurora/Mono/Onyx or across batches.
+    #38: Separation runs in-process with a persistent model (extract_vocals).
     """
     # Validate audio_path is within expected directory
     resolved = os.path.realpath(audio_path)
@@ -212,48 +519,36 @@ def separate_vocals(audio_path, job_folder):
         print("  Reusing cached vocals.wav")
         return vocals_path
 
-    # Check shared cross-template cache
-    cache_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(job_folder))), "cache", "vocals")
+    # Check shared artifact store
+    store = get_store()
     try:
-        audio_hash = _get_audio_hash(audio_path)
-        os.makedirs(cache_dir, exist_ok=True)
-        cached_vocals = os.path.join(cache_dir, f"{audio_hash}.wav")
-        if os.path.exists(cached_vocals):
-            shutil.copy2(cached_vocals, vocals_path)
-            print(f"  Reusing shared vocals cache ({audio_hash})")
+        store_key = store.key(_get_audio_hash(audio_path),
+                              demucs_model=DEMUCS_MODEL, stem="vocals",
+                              sr=WHISPER_SAMPLE_RATE,
+                              segment=Config.DEMUCS_SEGMENT,
+                              overlap=Config.DEMUCS_OVERLAP)
+        cached_vocals = store.get("vocals", store_key, ".wav")
+        if cached_vocals:
+            store.materialize(cached_vocals, vocals_path)
+            print(f"  Reusing shared vocals cache ({store_key})")
             return vocals_path
     except Exception:
-        audio_hash = None
-        cached_vocals = None
+        store_key = None
 
     try:
         print("  Separating vocals (Demucs)...")
-        with tempfile.TemporaryDirectory() as tmpdir:
-            r = subprocess.run(
-                [sys.executable, "-m", "demucs", "-n", "htdemucs",
-                 "--two-stems", "vocals", "-o", tmpdir, audio_path],
-                capture_output=True, text=True, timeout=300,
-                creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
-            )
-            if r.returncode != 0:
-                print(f"  Demucs failed: {r.stderr[:200]}")
-                return audio_path
-
-            stem = os.path.splitext(os.path.basename(audio_path))[0]
-            src = os.path.join(tmpdir, "htdemucs", stem, "vocals.wav")
-            if os.path.exists(src):
-                shutil.copy2(src, vocals_path)
-                # Save to shared cache for other templates
-                if cached_vocals:
-                    try:
-                        shutil.copy2(src, cached_vocals)
-                    except Exception:
-                        pass
-                print("  Vocals separated successfully")
-                return vocals_path
-            else:
-                print("  Demucs output not found, using raw audio")
-                return audio_path
+        sep_start = _time.time()
+        vocals = extract_vocals(audio_path)
+        # Whisper reads the samples directly; the file is for the store
+        # and for the transcription worker
+        vocals.write_wav(vocals_path)
+        if store_key:
+            try:
+                store.put_file("vocals", store_key, vocals_path, ".wav")
+            except Exception:
+                pass
+        print(f"  Vocals separated successfully ({_time.time() - sep_start:.0f}s)")
+        return vocals
 
     except ImportError:
         print("  Demucs not installed, using raw audio")
@@ -320,29 +615,46 @@ def detect_language(song_title, genius_text=None):
 
 
 # ============================================================================
-# SCRIPT FILTERING
+# CLEANUP ENGINE (#44)
 # ============================================================================
 
-def remove_non_target_script(items, text_key, song_title=None):
-    """Remove items with non-Latin script (translation leaks)."""
-    if not items:
-        return items
+_ALNUM_STRIP_RE = re.compile(r"[^a-zA-Z0-9\s]")
+_ALPHA_STRIP_RE = re.compile(r"[^a-zA-Z]")
+_WORD_STRIP_RE = re.compile(r"[^\w\s]")
+_PAREN_ADLIB_RE = re.compile(r"\s*\([^)]*\)\s*")
 
-    lang = detect_language(song_title) if song_title else None
-    latin_languages = {"en", "es", "fr", "pt", "it", "de", "so", "ig", None}
-    if lang not in latin_languages:
-        return items
 
-    filtered = []
-    removed = 0
+class LineRecord:
+    """A segment plus its normalised forms, each computed once on first use."""
 
-    for item in items:
-        text = item.get(text_key, "").strip()
-        if not text:
-            continue
+    def __init__(self, item, text_key):
+        self.item = item
+        self.raw = item.get(text_key, "")
+        self.text = self.raw.strip()
+
+    @cached_property
+    def alnum(self):
+        """Lowercase letters, digits and spaces — the fuzzy-compare form."""
+        return _ALNUM_STRIP_RE.sub("", self.raw).lower().strip()
+
+    @cached_property
+    def alpha_len(self):
+        return len(_ALPHA_STRIP_RE.sub("", self.text))
+
+    @cached_property
+    def lower(self):
+        return self.text.lower().strip()
+
+    @cached_property
+    def tokens(self):
+        return set(_WORD_STRIP_RE.sub("", self.text.lower()).split())
+
+    @cached_property
+    def non_latin_ratio(self):
+        """Share of letters outside Latin/Latin Extended (None if no letters)."""
         latin_count = 0
         non_latin_count = 0
-        for char in text:
+        for char in self.text:
             if char.isalpha():
                 cp = ord(char)
                 if cp < 0x0250 or (0x1E00 <= cp <= 0x1EFF):
@@ -350,73 +662,138 @@ def remove_non_target_script(items, text_key, song_title=None):
                 else:
                     non_latin_count += 1
         total = latin_count + non_latin_count
-        if total > 0 and non_latin_count / total > NON_LATIN_RATIO_THRESHOLD:
-            print(f"   \U0001f5d1 Non-Latin script: '{text[:50]}'")
-            removed += 1
+        return non_latin_count / total if total else None
+
+
+class CleanupStage:
+    """
+    Streaming filter.  keep() sees the records that survived the earlier
+    stages, in order; removal messages are buffered and printed by report()
+    so the log reads the same as running the filters one after another.
+    """
+    name = "stage"
+    summary = ""
+
+    def __init__(self):
+        self.removed = 0
+        self.log = []
+
+    def keep(self, rec):
+        return True
+
+    def drop(self, message=None):
+        self.removed += 1
+        if message:
+            self.log.append(message)
+        return False
+
+    def report(self):
+        for line in self.log:
+            print(line)
+        if self.removed and self.summary:
+            print(self.summary.format(n=self.removed))
+
+
+def run_cleanup(items, text_key, stages):
+    """
+    Run `stages` over `items` in a single traversal.  Returns the kept items
+    (a new list); each stage's removal count stays on stage.removed.
+    """
+    kept = []
+    for item in items:
+        rec = LineRecord(item, text_key)
+        for stage in stages:
+            if not stage.keep(rec):
+                break
         else:
-            filtered.append(item)
+            kept.append(item)
 
-    if removed:
-        print(f"   Removed {removed} non-target script segment(s)")
-    return filtered
+    for stage in stages:
+        stage.report()
+    return kept
 
 
 # ============================================================================
-# HALLUCINATION REMOVAL (#6: Removed "you" pattern)
+# SCRIPT FILTERING
 # ============================================================================
 
-def remove_hallucinations(items, text_key, initial_prompt):
-    """
-    Remove segments where Whisper hallucinated.
-    #6: Removed the "you" pattern — "you" is a common lyric word.
-    """
-    patterns = [
-        r"^thank\s*you\s+(for\s+)?(watching|listening)\s*\.?$",
-        r"^(please\s+)?subscribe\b",
-        r"^\s*music\s*\.?$",
-        r"^\s*\[?\s*music\s*\]?\s*$",
-        r"^\s*\u266a+\s*$",
-        r"^subtitles?\s+by\b",
-        r"^captions?\s+by\b",
-        r"^copyright\b",
-        r"^all\s+rights?\s+reserved",
-        r"^\s*\.\.\.\s*$",
-    ]
+class ScriptStage(CleanupStage):
+    name = "non_latin"
+    summary = "   Removed {n} non-target script segment(s)"
 
-    filtered = []
-    removed = 0
+    def keep(self, rec):
+        if not rec.text:
+            return False
+        ratio = rec.non_latin_ratio
+        if ratio is not None and ratio > NON_LATIN_RATIO_THRESHOLD:
+            return self.drop(f"   \U0001f5d1 Non-Latin script: '{rec.text[:50]}'")
+        return True
 
-    for item in items:
-        text = item.get(text_key, "").strip()
-        if not text:
-            continue
 
-        text_clean = re.sub(r"[^a-zA-Z0-9\s]", "", text).lower().strip()
+def remove_non_target_script(items, text_key, song_title=None):
+    """Remove items with non-Latin script (translation leaks)."""
+    if not items:
+        return items
+
+    lang = detect_language(song_title) if song_title else None
+    latin_languages = {"en", "es", "fr", "pt", "it", "de", "so", "ig", None}
+    if lang not in latin_languages:
+        return items
+
+    return run_cleanup(items, text_key, [ScriptStage()])
 
-        is_hallucination = False
-        for pattern in patterns:
-            try:
-                if re.search(pattern, text_clean, re.IGNORECASE):
-                    is_hallucination = True
-                    break
-            except re.error:
-                continue
 
-        if not is_hallucination and initial_prompt:
-            prompt_clean = re.sub(r"[^a-zA-Z0-9\s]", "", initial_prompt).lower().strip()
-            similarity = fuzz.ratio(text_clean, prompt_clean)
-            if similarity > HALLUCINATION_SIMILARITY and len(text_clean.split()) <= len(prompt_clean.split()) + 2:
+# ============================================================================
+# HALLUCINATION REMOVAL (#6: Removed "you" pattern)
+# ============================================================================
+
+_HALLUCINATION_RES = [re.compile(p, re.IGNORECASE) for p in (
+    r"^thank\s*you\s+(for\s+)?(watching|listening)\s*\.?$",
+    r"^(please\s+)?subscribe\b",
+    r"^\s*music\s*\.?$",
+    r"^\s*\[?\s*music\s*\]?\s*$",
+    r"^\s*\u266a+\s*$",
+    r"^subtitles?\s+by\b",
+    r"^captions?\s+by\b",
+    r"^copyright\b",
+    r"^all\s+rights?\s+reserved",
+    r"^\s*\.\.\.\s*$",
+)]
+
+
+class HallucinationStage(CleanupStage):
+    name = "hallucination"
+    summary = "   Removed {n} hallucinated segment(s)"
+
+    def __init__(self, initial_prompt):
+        super().__init__()
+        self.has_prompt = bool(initial_prompt)
+        self.prompt_clean = (_ALNUM_STRIP_RE.sub("", initial_prompt).lower().strip()
+                             if initial_prompt else "")
+        self.prompt_words = len(self.prompt_clean.split())
+
+    def keep(self, rec):
+        if not rec.text:
+            return False
+        text_clean = rec.alnum
+        is_hallucination = any(p.search(text_clean) for p in _HALLUCINATION_RES)
+
+        if not is_hallucination and self.has_prompt:
+            similarity = fuzz.ratio(text_clean, self.prompt_clean)
+            if similarity > HALLUCINATION_SIMILARITY and len(text_clean.split()) <= self.prompt_words + 2:
                 is_hallucination = True
 
         if is_hallucination:
-            print(f"   \U0001f5d1 Hallucination: '{text[:60]}'")
-            removed += 1
-        else:
-            filtered.append(item)
+            return self.drop(f"   \U0001f5d1 Hallucination: '{rec.text[:60]}'")
+        return True
+
 
-    if removed:
-        print(f"   Removed {removed} hallucinated segment(s)")
-    return filtered
+def remove_hallucinations(items, text_key, initial_prompt):
+    """
+    Remove segments where Whisper hallucinated.
+    #6: Removed the "you" pattern — "you" is a common lyric word.
+    """
+    return run_cleanup(items, text_key, [HallucinationStage(initial_prompt)])
 
 
 # ============================================================================
@@ -425,11 +802,71 @@ def remove_hallucinations(items, text_key, initial_prompt):
 
 GENIUS_MISMATCH_THRESHOLD = 0.20
 
+class GeniusLyricsIndex:
+    """
+    #46: A song's Genius lyrics parsed once — matching lines (see
+    _parse_genius_lines), the alignment lyric lines, and a word -> line-ids
+    inverted index.  Pass the same instance to every Genius-aware helper.
+    """
+
+    def __init__(self, genius_text):
+        self.text = genius_text or ""
+        self.lines = _parse_genius_lines(self.text) if self.text.strip() else []
+        self._postings = {}
+        for line_id, line in enumerate(self.lines):
+            for word in set(line.split()):
+                self._postings.setdefault(word, []).append(line_id)
+
+    def best_overlap(self, words):
+        """Max share of `words` found in a single line (only lines sharing a word are visited)."""
+        if not words:
+            return 0.0
+        hits = {}
+        for word in words:
+            for line_id in self._postings.get(word, ()):
+                hits[line_id] = hits.get(line_id, 0) + 1
+        return max(hits.values()) / len(words) if hits else 0.0
+
+    @cached_property
+    def lyric_lines(self):
+        """Lines used by lyric_alignment (original case, section headers dropped)."""
+        from scripts.lyric_alignment import genius_lyric_lines
+        return genius_lyric_lines(self.text)
+
+
+def genius_index(genius_text, index=None):
+    """`index` if given, else a fresh GeniusLyricsIndex for genius_text."""
+    return index if index is not None else GeniusLyricsIndex(genius_text)
+
+
+class GeniusMismatchStage(CleanupStage):
+    name = "genius_mismatch"
+    summary = "   Removed {n} Genius-mismatched segment(s)"
+
+    def __init__(self, index, threshold):
+        super().__init__()
+        self.index = index
+        self.threshold = threshold
+
+    def keep(self, rec):
+        if not rec.text:
+            return False
+        words = rec.tokens
+        if len(words) <= 2:
+            return True
+
+        best_overlap = self.index.best_overlap(words)
+        if best_overlap < self.threshold:
+            return self.drop(f"   \U0001f5d1 Genius mismatch ({best_overlap:.0%}): '{rec.text[:60]}'")
+        return True
+
+
 def remove_genius_mismatches(
     items: list[dict],
     text_key: str,
     genius_text: str,
     threshold: float = GENIUS_MISMATCH_THRESHOLD,
+    index: GeniusLyricsIndex | None = None,
 ) -> list[dict]:
     """
     Remove segments that don't match ANY line in the Genius lyrics.
@@ -443,83 +880,67 @@ def remove_genius_mismatches(
     if not items or not genius_text or not genius_text.strip():
         return list(items)
 
-    genius_lines = _parse_genius_lines(genius_text)
-    if not genius_lines:
+    index = genius_index(genius_text, index)
+    if not index.lines:
         return list(items)
 
-    genius_word_sets = [set(gl.split()) for gl in genius_lines]
+    return run_cleanup(items, text_key, [GeniusMismatchStage(index, threshold)])
 
-    filtered = []
-    removed = 0
-    for item in items:
-        text = item.get(text_key, "").strip()
-        if not text:
-            continue
 
-        words = set(re.sub(r"[^\w\s]", "", text.lower()).split())
-        if len(words) <= 2:
-            filtered.append(item)
-            continue
+# ============================================================================
+# JUNK REMOVAL
+# ============================================================================
 
-        best_overlap = 0.0
-        for gws in genius_word_sets:
-            if not gws:
-                continue
-            overlap = len(words & gws) / len(words)
-            if overlap > best_overlap:
-                best_overlap = overlap
+_JUNK_RES = [re.compile(p) for p in (
+    r"^[\W\s]+$",
+    r"^(um|uh|hmm|ah|oh|ha|huh)+\s*$",
+    r"^\.*$",
+    r"^-+$",
+)]
 
-        if best_overlap < threshold:
-            print(f"   \U0001f5d1 Genius mismatch ({best_overlap:.0%}): '{text[:60]}'")
-            removed += 1
-        else:
-            filtered.append(item)
 
-    if removed:
-        print(f"   Removed {removed} Genius-mismatched segment(s)")
-    return filtered
+class JunkStage(CleanupStage):
+    name = "junk"
+    summary = "   Removed {n} junk segment(s)"
 
+    def keep(self, rec):
+        if rec.alpha_len < 2:
+            return self.drop()
+        if any(p.search(rec.lower) for p in _JUNK_RES):
+            return self.drop()
+        return True
 
-# ============================================================================
-# JUNK REMOVAL
-# ============================================================================
 
 def remove_junk(items, text_key):
     """Remove items that are clearly not lyrics."""
-    junk_patterns = [
-        r"^[\W\s]+$",
-        r"^(um|uh|hmm|ah|oh|ha|huh)+\s*$",
-        r"^\.*$",
-        r"^-+$",
-    ]
+    return run_cleanup(items, text_key, [JunkStage()])
 
-    filtered = []
-    removed = 0
 
-    for item in items:
-        text = item.get(text_key, "").strip()
-        text_alpha = re.sub(r"[^a-zA-Z]", "", text)
-
-        if len(text_alpha) < 2:
-            removed += 1
-            continue
+# ============================================================================
+# REPETITION LOOP DETECTION (#18)
+# ============================================================================
 
-        text_lower = text.lower().strip()
-        is_junk = any(re.search(p, text_lower) for p in junk_patterns)
+class RepetitionStage(CleanupStage):
+    """Streak of near-identical neighbours in the stage's input; keep two."""
+    name = "repetition"
+    summary = "   Removed {n} repetition loop segment(s)"
 
-        if is_junk:
-            removed += 1
-        else:
-            filtered.append(item)
+    def __init__(self):
+        super().__init__()
+        self.prev = None
+        self.streak = 1
 
-    if removed:
-        print(f"   Removed {removed} junk segment(s)")
-    return filtered
+    def keep(self, rec):
+        curr = rec.alnum
+        prev = self.prev.alnum if self.prev is not None else ""
+        self.prev = rec
 
+        if curr and prev and fuzz.ratio(curr, prev) > REPETITION_SIMILARITY:
+            self.streak += 1
+        else:
+            self.streak = 1
+        return True if self.streak <= 2 else self.drop()
 
-# ============================================================================
-# REPETITION LOOP DETECTION (#18)
-# ============================================================================
 
 def remove_repetition_loops(items, text_key):
     """
@@ -529,34 +950,34 @@ def remove_repetition_loops(items, text_key):
     """
     if len(items) < 3:
         return items
+    return run_cleanup(items, text_key, [RepetitionStage()])
 
-    clean_re = re.compile(r"[^a-zA-Z0-9\s]")
-    removed = 0
-    result = []
-    streak = 1
-
-    for i, item in enumerate(items):
-        curr = clean_re.sub("", item.get(text_key, "")).lower().strip()
-        prev = clean_re.sub("", items[i - 1].get(text_key, "")).lower().strip() if i > 0 else ""
 
-        if curr and prev and fuzz.ratio(curr, prev) > REPETITION_SIMILARITY:
-            streak += 1
-        else:
-            streak = 1
+# ============================================================================
+# STUTTER DUPLICATE REMOVAL (#8: Fuzzy matching)
+# ============================================================================
 
-        if streak <= 2:
-            result.append(item)
-        else:
-            removed += 1
+class StutterStage(CleanupStage):
+    """Near-identical to the last kept item and starting < 0.5 s after it."""
+    name = "stutter"
+    summary = "   Removed {n} stutter duplicate(s)"
 
-    if removed:
-        print(f"   Removed {removed} repetition loop segment(s)")
-    return result
+    def __init__(self, text_key):
+        super().__init__()
+        self.time_key = "t" if text_key == "lyric_current" else "time"
+        self.last = None
 
+    def keep(self, rec):
+        last = self.last
+        if (last is not None and rec.alnum and last.alnum
+                and fuzz.ratio(rec.alnum, last.alnum) > STUTTER_SIMILARITY):
+            curr_time = rec.item.get(self.time_key, 0)
+            prev_end = last.item.get("end_time", last.item.get(self.time_key, 0) + 2)
+            if curr_time - prev_end < 0.5:
+                return self.drop()
+        self.last = rec
+        return True
 
-# ============================================================================
-# STUTTER DUPLICATE REMOVAL (#8: Fuzzy matching)
-# ============================================================================
 
 def remove_stutter_duplicates(items, text_key):
     """
@@ -565,72 +986,64 @@ def remove_stutter_duplicates(items, text_key):
     """
     if len(items) < 2:
         return list(items)
-
-    clean_re = re.compile(r"[^a-zA-Z0-9\s]")
-    time_key = "t" if text_key == "lyric_current" else "time"
-
-    filtered = [items[0]]
-    removed = 0
-
-    for i in range(1, len(items)):
-        curr = clean_re.sub("", items[i].get(text_key, "")).lower().strip()
-        prev = clean_re.sub("", filtered[-1].get(text_key, "")).lower().strip()
-
-        if curr and prev and fuzz.ratio(curr, prev) > STUTTER_SIMILARITY:
-            curr_time = items[i].get(time_key, 0)
-            prev_end = filtered[-1].get("end_time", filtered[-1].get(time_key, 0) + 2)
-            gap = curr_time - prev_end
-
-            if gap < 0.5:
-                removed += 1
-                continue
-
-        filtered.append(items[i])
-
-    if removed:
-        print(f"   Removed {removed} stutter duplicate(s)")
-    return filtered
+    return run_cleanup(items, text_key, [StutterStage(text_key)])
 
 
 # ============================================================================
 # MULTI-PASS TRANSCRIPTION (#3, #7, #13)
 # ============================================================================
 
-def multi_pass_transcribe(audio_path, prompt, duration, language,
+def multi_pass_transcribe(audio, prompt, duration, language,
                           word_timestamps=True, regroup_passes=None,
                           from_demucs=False):
     """
     Try multiple Whisper configurations, return (best_result, pass_index).
 
-    #3:  Weighted scoring — earlier passes get higher weight.
-         Accept pass 1 at 70% of min_expected.
-    #7:  Omit language param when None.
-    #13: min_expected=2 when duration is None.
-    """
-    if regroup_passes is None:
-        regroup_passes = [True, True, True, True]
+    `audio` is a file path or an already-decoded AudioBuffer (#36).
 
-    # Normalize audio levels (also returns duration, avoiding a redundant decode)
-    audio_path, norm_dur = normalize_audio(audio_path)
+    #34: Runs in the persistent transcription worker when
+         Config.TRANSCRIBE_WORKER is set, so the model stays loaded between
+         batches.  Falls back to in-process transcription if the worker
+         cannot be reached.
+    """
+    if _pretranscribed:
+        key = transcription_key(audio, prompt, language, regroup_passes,
+                                from_demucs, word_timestamps)
+        if key in _pretranscribed:
+            result, idx = _pretranscribed.pop(key)
+            print(f"  \u267b Using batch transcription (pass {idx + 1})")
+            return result, idx
+
+    audio_path = _source_path(audio)
+    if Config.TRANSCRIBE_WORKER and audio_path:
+        from scripts import transcription_worker
+        try:
+            return transcription_worker.remote_transcribe(
+                audio_path, prompt, duration, language,
+                word_timestamps=word_timestamps,
+                regroup_passes=regroup_passes,
+                from_demucs=from_demucs,
+            )
+        except transcription_worker.WorkerUnavailable as e:
+            print(f"  \u26a0 Transcription worker unavailable ({e}) \u2014 transcribing in-process")
+
+    return _multi_pass_transcribe_local(
+        audio, prompt, duration, language,
+        word_timestamps=word_timestamps,
+        regroup_passes=regroup_passes,
+        from_demucs=from_demucs,
+    )
 
-    # Skip noise reduction for Demucs output — vocals stem is already clean
-    if not from_demucs:
-        audio_path = reduce_noise(audio_path)
 
-    # Use duration from normalization pass to avoid re-decoding the file
-    actual_dur = norm_dur if norm_dur is not None else get_audio_duration(audio_path)
-    print(f"  🔍 Whisper input: {audio_path}")
-    if actual_dur:
-        print(f"  🔍 File duration: {actual_dur:.1f}s (caller reported: {duration}s)")
-    if actual_dur is not None and duration is not None and actual_dur > duration + 10:
-        print(f"  ⚠ WARNING: audio file ({actual_dur:.1f}s) much longer than expected ({duration}s)!")
-
-    # #13: Graceful when duration is unknown
+def _min_expected(duration):
+    """#13: Graceful when duration is unknown."""
     if duration is not None:
-        min_expected = max(2, int(duration / 3.5))
-    else:
-        min_expected = 2
+        return max(2, int(duration / 3.5))
+    return 2
 
+
+def _build_passes(prompt, language, word_timestamps, regroup_passes):
+    """The four Whisper configurations, in priority order (#3 weights)."""
     # #7: Only include language if known
     lang_params = {"language": language} if language else {}
 
@@ -642,7 +1055,7 @@ def multi_pass_transcribe(audio_path, prompt, duration, language,
             "weight": 1.0,
             "params": dict(
                 vad=True, vad_threshold=0.25,
-                suppress_silence=True, regroup=regroup_passes[0],
+                suppress_silence=True, regroup=False,
                 temperature=0, initial_prompt=prompt,
                 condition_on_previous_text=False,
                 only_voice_freq=True, min_word_dur=MIN_WORD_DUR,
@@ -655,7 +1068,7 @@ def multi_pass_transcribe(audio_path, prompt, duration, language,
             "weight": 0.9,
             "params": dict(
                 vad=True, vad_threshold=0.2,
-                suppress_silence=False, regroup=regroup_passes[1],
+                suppress_silence=False, regroup=False,
                 temperature=0.2, initial_prompt=prompt,
                 condition_on_previous_text=False,
                 only_voice_freq=True, min_word_dur=MIN_WORD_DUR,
@@ -668,7 +1081,7 @@ def multi_pass_transcribe(audio_path, prompt, duration, language,
             "weight": 0.75,
             "params": dict(
                 vad=False, suppress_silence=False,
-                regroup=regroup_passes[2], temperature=0.4,
+                regroup=False, temperature=0.4,
                 initial_prompt=prompt,
                 condition_on_previous_text=False,
                 only_voice_freq=True, min_word_dur=MIN_WORD_DUR,
@@ -681,7 +1094,7 @@ def multi_pass_transcribe(audio_path, prompt, duration, language,
             "weight": 0.6,
             "params": dict(
                 vad=False, suppress_silence=False,
-                regroup=regroup_passes[3], temperature=0.6,
+                regroup=False, temperature=0.6,
                 initial_prompt=None,
                 condition_on_previous_text=True,
                 only_voice_freq=True, min_word_dur=MIN_WORD_DUR,
@@ -691,6 +1104,218 @@ def multi_pass_transcribe(audio_path, prompt, duration, language,
             )
         },
     ]
+    for i, p in enumerate(passes):
+        p["index"] = i  # stays the reported pass index when the planner reorders (#53)
+        # #43: Whisper decodes unregrouped; each template regroups its own copy
+        p["regroup"] = bool(regroup_passes[i])
+    return passes
+
+
+# ============================================================================
+# PASS CHECKPOINTS (#52)
+# ============================================================================
+
+def pass_checkpoint_key(audio, params, chunked=False):
+    """
+    Artifact-store key of one raw pass over one prepared Whisper input, or
+    None when checkpoints are off or the input is not decoded.  Regrouping
+    is not part of the params, so every template shares the entry (#43).
+    """
+    if not Config.WHISPER_PASS_CHECKPOINTS or _is_path(audio):
+        return None
+    return get_store().key(
+        _clip_id(audio),
+        model=Config.WHISPER_MODEL,
+        backend=Config.WHISPER_BACKEND,
+        chunked=bool(chunked),
+        stage="raw",
+        params=params,
+    )
+
+
+def load_pass_checkpoint(key):
+    """{"result": raw dict or None} of a finished pass, or None if not run yet."""
+    if not key:
+        return None
+    try:
+        stored = get_store().get("pass", key, ".json")
+        if not stored:
+            return None
+        with open(stored, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return {"result": data["result"]}
+    except Exception as e:
+        print(f"    \u26a0 Pass checkpoint unreadable: {e}")
+        return None
+
+
+def save_pass_checkpoint(key, raw):
+    """Record a finished raw pass (also one with no segments) so a resume skips it."""
+    if not key:
+        return
+    try:
+        get_store().put_bytes("pass", key,
+                              json.dumps({"result": raw}, ensure_ascii=False).encode("utf-8"),
+                              ".json")
+    except Exception as e:
+        print(f"    \u26a0 Could not checkpoint pass: {e}")
+
+
+def _run_pass(model, audio, params, chunks=None):
+    """One raw pass; returns the result dict, or None if it found no segments."""
+    if chunks:
+        result = transcribe_chunked(audio, chunks, params)
+    else:
+        result = _active_backend().transcribe(model, _audio_input(audio), **params)
+    if not result or not result.segments:
+        return None
+    return result.to_dict()
+
+
+def _template_pass(raw, regroup):
+    """
+    A raw pass as one template sees it: a fresh result, regrouped when the
+    template regroups this pass, then refined.  Returns (result or None,
+    segment count) — the count the template's acceptance rules use.
+    """
+    if not raw:
+        return None, 0
+    result = _result_from_dict(raw)
+    if regroup:
+        try:
+            result.regroup()
+        except Exception as e:
+            print(f"  Warning: regrouping failed: {e}")
+    _refine_result(result)
+    if not result.segments:
+        return None, 0
+    return result, count_segments(result)
+
+
+# ============================================================================
+# ADAPTIVE PASS PLANNER (#53)
+# ============================================================================
+
+def pass_bucket(language, from_demucs):
+    """History bucket of a transcription: model / language / Demucs input."""
+    return f"{Config.WHISPER_MODEL}/{language or 'auto'}/{'demucs' if from_demucs else 'mix'}"
+
+
+_history_db = None   # (SONG_DB_PATH, SongDatabase) — init_database runs once per path
+
+
+def _pass_history_db():
+    global _history_db
+    if _history_db is None or _history_db[0] != Config.SONG_DB_PATH:
+        from scripts.song_database import SongDatabase
+        _history_db = (Config.SONG_DB_PATH, SongDatabase(db_path=Config.SONG_DB_PATH))
+    return _history_db[1]
+
+
+def plan_passes(passes, song_key, bucket):
+    """
+    Move the pass most likely to win to the front: the pass that won the
+    last run of this song, else the bucket's most frequent winner once
+    WHISPER_PLANNER_MIN_SONGS songs are recorded.  The remaining passes keep
+    their order, so a wrong guess costs at most one extra pass.
+    """
+    if not Config.WHISPER_PASS_PLANNER or len(passes) < 2:
+        return passes
+    try:
+        db = _pass_history_db()
+        winner = db.get_winning_pass(song_key, bucket)
+        source = "last run of this song"
+        if winner is None:
+            stats = db.get_pass_stats(bucket)
+            songs = sum(s["wins"] for s in stats.values())
+            if songs < Config.WHISPER_PLANNER_MIN_SONGS:
+                return passes
+            winner = max(stats, key=lambda i: (stats[i]["wins"], -i))
+            source = f"{stats[winner]['wins']}/{songs} songs"
+    except Exception as e:
+        print(f"  \u26a0 Pass planner unavailable: {e}")
+        return passes
+
+    first = next((p for p in passes if p["index"] == winner), None)
+    if first is None or first is passes[0]:
+        return passes
+    print(f"  \U0001f9ed Planner: starting with {first['name']} ({source})")
+    return [first] + [p for p in passes if p is not first]
+
+
+def record_pass_history(song_key, bucket, attempts, winner):
+    """Persist (pass_idx, segments, seconds) per attempted pass and the winner."""
+    if not Config.WHISPER_PASS_PLANNER or not attempts:
+        return
+    try:
+        _pass_history_db().record_pass_history(song_key, bucket, attempts, winner)
+    except Exception as e:
+        print(f"  \u26a0 Could not record pass history: {e}")
+
+
+def _multi_pass_transcribe_local(audio, prompt, duration, language,
+                                 word_timestamps=True, regroup_passes=None,
+                                 from_demucs=False):
+    """
+    In-process multi-pass transcription (what the worker itself runs).
+
+    #3:  Weighted scoring — earlier passes get higher weight.
+         Accept pass 1 at 70% of min_expected.
+    #7:  Omit language param when None.
+    #13: min_expected=2 when duration is None.
+    #36: Audio is decoded once; normalization and noise reduction run on the
+         in-memory buffer and every pass reuses the same samples.
+    #52: Each finished pass is checkpointed in the artifact store, so a
+         cancelled or crashed run resumes after the last completed pass.
+    #53: Passes run in the planner's order; the outcome of every pass is
+         recorded in the song database for the next plan.
+    """
+    if regroup_passes is None:
+        regroup_passes = [True, True, True, True]
+
+    source = _source_path(audio)
+    if _is_path(audio):
+        audio = load_audio(audio)
+
+    if not _is_path(audio):
+        audio = _prepare_audio(audio, from_demucs)
+    whisper_features.begin_clip(_clip_id(audio))
+
+    actual_dur = get_audio_duration(audio)
+    print(f"  🔍 Whisper input: {source or 'in-memory audio'}")
+    if actual_dur:
+        print(f"  🔍 File duration: {actual_dur:.1f}s (caller reported: {duration}s)")
+    if actual_dur is not None and duration is not None and actual_dur > duration + 10:
+        print(f"  ⚠ WARNING: audio file ({actual_dur:.1f}s) much longer than expected ({duration}s)!")
+
+    min_expected = _min_expected(duration)
+    passes = _build_passes(prompt, language, word_timestamps, regroup_passes)
+
+    # #41: chunked mode — VAD once, then every pass runs over parallel chunks
+    chunks = None
+    if (Config.WHISPER_CHUNKED and not _is_path(audio)
+            and get_device_info() == "CPU"):
+        chunks = plan_audio_chunks(audio)
+        if len(chunks) < 2:
+            chunks = None
+
+    song_key = _clip_id(audio)
+    bucket = pass_bucket(language, from_demucs)
+    passes = plan_passes(passes, song_key, bucket)
+
+    # #40: the chunk jobs already fill the pool, so parallel passes only run
+    # when the clip was not split
+    if (Config.WHISPER_PARALLEL_PASSES and chunks is None and not _is_path(audio)
+            and get_device_info() == "CPU"):
+        return _multi_pass_parallel(audio, passes, min_expected, song_key, bucket)
+
+    attempts = []
+
+    def finish(result, idx):
+        if result is not None:
+            _snap_to_silence(result, audio)
+        record_pass_history(song_key, bucket, attempts, idx)
+        return result, idx
 
     best_result = None
     best_score = 0
@@ -699,37 +1324,42 @@ def multi_pass_transcribe(audio_path, prompt, duration, language,
     used_cpu_fallback = False
 
     try:
-        model = load_whisper_model()
         device = get_device_info()
         print(f"  🖥 Device: {device}")
         batch_start = _time.time()
 
-        for idx, p in enumerate(passes):
+        for p in passes:
+            idx = p["index"]
             # Time cap: if we already have a result and spent > 180s, stop
             elapsed_total = _time.time() - batch_start
             if best_result is not None and elapsed_total > PASS_TIME_CAP_SEC:
                 print(f"  ⏱ Time cap reached ({elapsed_total:.0f}s) — using best result from pass {best_pass_idx + 1}")
-                _snap_to_silence(best_result, audio_path)
-                return best_result, best_pass_idx
+                return finish(best_result, best_pass_idx)
+
+            # #52: a pass finished by an earlier run is restored, not re-run
+            ckpt_key = pass_checkpoint_key(audio, p["params"], chunked=bool(chunks))
+            restored = load_pass_checkpoint(ckpt_key)
+            if restored is None and model is None and not chunks:
+                model = load_whisper_model()
 
             try:
                 clear_vram()
                 pass_start = _time.time()
                 print(f"  {p['name']}...")
-                result = model.transcribe(audio_path, **p["params"])
+                if restored is not None:
+                    raw = restored["result"]
+                    print("    \u267b Restored from checkpoint")
+                else:
+                    raw = _run_pass(model, audio, p["params"], chunks)
+                    save_pass_checkpoint(ckpt_key, raw)
+                result, count = _template_pass(raw, p["regroup"])
                 pass_time = _time.time() - pass_start
+                attempts.append((idx, count, None if restored is not None else round(pass_time, 2)))
 
-                if not result or not result.segments:
+                if result is None:
                     print(f"    \u2192 0 segments ({pass_time:.0f}s)")
                     continue
 
-                # Post-transcription refinement
-                _refine_result(result)
-
-                count = sum(
-                    1 for s in result.segments
-                    if s.text.strip() and len(s.text.strip()) > 1
-                )
                 print(f"    \u2192 {count} segments ({pass_time:.0f}s)")
 
                 # #3: Weighted score
@@ -742,23 +1372,22 @@ def multi_pass_transcribe(audio_path, prompt, duration, language,
                 # Accept early only if we have genuinely good results
                 if count >= min_expected:
                     print(f"    \u2713 Sufficient ({count} \u2265 {min_expected} expected)")
-                    _snap_to_silence(result, audio_path)
-                    return result, idx
+                    return finish(result, idx)
 
             except RuntimeError as e:
-                if "CUDA out of memory" in str(e) and not used_cpu_fallback:
+                # torch says "CUDA out of memory", CTranslate2 "CUDA failed ... out of memory"
+                if "out of memory" in str(e) and not used_cpu_fallback:
                     print(f"    \u26a0 GPU OOM \u2014 switching to CPU...")
                     unload_model()
                     model = load_whisper_model(force_cpu=True)
                     used_cpu_fallback = True
                     try:
-                        result = model.transcribe(audio_path, **p["params"])
-                        if result and result.segments:
-                            _refine_result(result)
-                            count = sum(
-                                1 for s in result.segments
-                                if s.text.strip() and len(s.text.strip()) > 1
-                            )
+                        cpu_start = _time.time()
+                        raw = _run_pass(model, audio, p["params"])
+                        save_pass_checkpoint(ckpt_key, raw)
+                        result, count = _template_pass(raw, p["regroup"])
+                        attempts.append((idx, count, round(_time.time() - cpu_start, 2)))
+                        if result is not None:
                             print(f"    \u2192 {count} segments (CPU)")
                             weighted = count * p["weight"]
                             if weighted > best_score:
@@ -767,8 +1396,7 @@ def multi_pass_transcribe(audio_path, prompt, duration, language,
                                 best_pass_idx = idx
                             threshold = int(min_expected * 0.7) if idx == 0 else min_expected
                             if count >= threshold:
-                                _snap_to_silence(result, audio_path)
-                                return result, idx
+                                return finish(result, idx)
                     except Exception as cpu_e:
                         print(f"    \u2192 CPU fallback failed: {cpu_e}")
                 else:
@@ -781,9 +1409,8 @@ def multi_pass_transcribe(audio_path, prompt, duration, language,
 
         if best_result:
             print(f"  \u26a0 Best: weighted {best_score:.1f} (wanted {min_expected}+)")
-            _snap_to_silence(best_result, audio_path)
 
-        return best_result, best_pass_idx
+        return finish(best_result, best_pass_idx)
 
     finally:
         # Don't unload — model is cached for next job (#2)
@@ -791,6 +1418,445 @@ def multi_pass_transcribe(audio_path, prompt, duration, language,
         clear_vram()
 
 
+def _multi_pass_parallel(audio, passes, min_expected, song_key=None, bucket=None):
+    """
+    #40: Start every pass at once in the CPU process pool, then walk the
+    results in priority order applying exactly the sequential rules:
+    weighted best score, early accept at min_expected, time cap once a best
+    result exists.  Passes still running after a decision are cancelled.
+    #52: Passes checkpointed by an earlier run are restored instead of
+    submitted, and every pass that comes back is checkpointed.
+    #53: passes arrive in the planner's order; the passes walked before the
+    decision are recorded in the song database when song_key is given.
+    """
+    import multiprocessing as mp
+
+    attempts = []
+
+    def finish(result, idx):
+        if result is not None:
+            _snap_to_silence(result, audio)
+        if song_key is not None:
+            record_pass_history(song_key, bucket, attempts, idx)
+        return result, idx
+
+    best_result = None
+    best_score = 0
+    best_pass_idx = -1
+    ckpt_keys = [pass_checkpoint_key(audio, p["params"]) for p in passes]
+    restored = [load_pass_checkpoint(key) for key in ckpt_keys]
+    todo = [p for p, done in zip(passes, restored) if done is None]
+    if todo:
+        print(f"  \U0001f500 Running {len(todo)} passes in parallel "
+              f"({transcribe_pool.pool_threads(len(todo))} threads each)")
+    batch_start = _time.time()
+
+    try:
+        pending = iter(transcribe_pool.submit_passes(
+            audio.samples, [p["params"] for p in todo]) if todo else [])
+
+        for p, ckpt_key, done in zip(passes, ckpt_keys, restored):
+            idx = p["index"]
+            if done is not None:
+                print(f"  {p['name']}...\n    \u267b Restored from checkpoint")
+                result, count = _template_pass(done["result"], p["regroup"])
+                attempts.append((idx, count, None))
+                if result is None:
+                    continue
+            else:
+                job = next(pending)
+                timeout = None
+                if best_result is not None:
+                    timeout = PASS_TIME_CAP_SEC - (_time.time() - batch_start)
+                try:
+                    if timeout is not None and timeout <= 0:
+                        raise mp.TimeoutError()
+                    out = job.get(timeout)
+                except mp.TimeoutError:
+                    elapsed_total = _time.time() - batch_start
+                    print(f"  ⏱ Time cap reached ({elapsed_total:.0f}s) — using best result from pass {best_pass_idx + 1}")
+                    return finish(best_result, best_pass_idx)
+                except Exception as e:
+                    print(f"  {p['name']}...\n    \u2192 Error: {e}")
+                    continue
+
+                print(f"  {p['name']}...")
+                if out:
+                    save_pass_checkpoint(ckpt_key, out["result"])
+                result, count = _template_pass(out and out["result"], p["regroup"])
+                if out:
+                    attempts.append((idx, count, round(out["time"], 2)))
+                if result is None:
+                    print(f"    \u2192 0 segments ({out['time'] if out else 0:.0f}s)")
+                    continue
+                print(f"    \u2192 {count} segments ({out['time']:.0f}s)")
+
+            # #3: Weighted score
+            weighted = count * p["weight"]
+            if weighted > best_score:
+                best_score = weighted
+                best_result = result
+                best_pass_idx = idx
+
+            if count >= min_expected:
+                print(f"    \u2713 Sufficient ({count} \u2265 {min_expected} expected)")
+                return finish(result, idx)
+
+        if best_result:
+            print(f"  \u26a0 Best: weighted {best_score:.1f} (wanted {min_expected}+)")
+
+        return finish(best_result, best_pass_idx)
+
+    finally:
+        transcribe_pool.cancel_all()
+
+
+# ============================================================================
+# CROSS-SONG BATCH TRANSCRIPTION (#42)
+# ============================================================================
+
+# Per-template pass setup shared by the per-song pipelines and pretranscribe
+TEMPLATE_PASS_CONFIG = {
+    # Aurora has always denoised the Demucs stem as well (from_demucs unset)
+    "Aurora": {"regroup_passes": [True, True, True, True], "flag_demucs": False},
+    "Mono": {"regroup_passes": [True, True, True, True], "flag_demucs": True},
+    "Onyx": {"regroup_passes": [False, False, False, True], "flag_demucs": True},
+}
+
+# transcription_key -> (result, pass_idx), filled by pretranscribe and
+# consumed by multi_pass_transcribe
+_pretranscribed = {}
+
+
+def transcription_key(audio, prompt, language, regroup_passes=None,
+                      from_demucs=False, word_timestamps=True):
+    """Identity of a multi_pass_transcribe call (input content + settings)."""
+    path = _source_path(audio)
+    if path and os.path.exists(path):
+        ident = file_hash(path)
+    else:
+        ident = whisper_features.content_key(audio.samples)
+    return (ident, prompt, language, tuple(regroup_passes or [True] * 4),
+            bool(from_demucs), bool(word_timestamps),
+            Config.WHISPER_MODEL, Config.WHISPER_BACKEND)
+
+
+def transcription_request(job_folder, song_title, template_name,
+                          audio=None, regroup_passes=None):
+    """
+    multi_pass_transcribe() keyword arguments for a job folder: Whisper input
+    (Demucs vocals when available), prompt, duration, language and passes.
+    """
+    cfg = TEMPLATE_PASS_CONFIG.get(template_name, TEMPLATE_PASS_CONFIG["Mono"])
+    audio_path = os.path.join(job_folder, "audio_trimmed.wav")
+    if audio is None:
+        audio = load_audio(audio_path)
+    vocals = separate_vocals(audio_path, job_folder)
+    used_demucs = vocals != audio_path
+    return {
+        "audio": vocals if used_demucs else audio,
+        "prompt": build_initial_prompt(song_title),
+        "duration": get_audio_duration(audio),
+        "language": detect_language(song_title),
+        "word_timestamps": True,
+        "regroup_passes": list(regroup_passes or cfg["regroup_passes"]),
+        "from_demucs": used_demucs and cfg["flag_demucs"],
+    }
+
+
+def batch_transcribe(requests):
+    """
+    #42: Transcribe several songs at once, pass-major.  `requests` are
+    multi_pass_transcribe keyword dicts (optionally with a "label").
+    Returns [(result, pass_idx), ...] in the same order.
+    """
+    if not requests:
+        return []
+    if Config.TRANSCRIBE_WORKER and all(_source_path(r["audio"]) for r in requests):
+        from scripts import transcription_worker
+        try:
+            return transcription_worker.remote_transcribe_batch(requests)
+        except transcription_worker.WorkerUnavailable as e:
+            print(f"  \u26a0 Transcription worker unavailable ({e}) \u2014 transcribing in-process")
+    return _batch_transcribe_local(requests)
+
+
+def _batch_transcribe_local(requests):
+    """
+    Pass 1 for every song, then pass 2 only for the songs still below their
+    min_expected, and so on.  Per song the rules match the sequential loop
+    (weighted best, early accept, time cap).  The model is loaded once and
+    VRAM is cleared once per pass, not once per song; on CPU hosts with the
+    process pool enabled each pass runs all songs concurrently.  Passes
+    checkpointed by an earlier run (#52) are restored instead of re-run.
+    Each song follows its own planned pass order (#53), so round N runs
+    every unfinished song's N-th planned pass.  Songs whose round-N pass is
+    the same raw pass (one song queued for several templates) run it once
+    and each applies its own regrouping and acceptance count (#43).
+    """
+    states = []
+    for i, req in enumerate(requests):
+        audio = req["audio"]
+        if _is_path(audio):
+            audio = load_audio(audio)
+        if not _is_path(audio):
+            audio = _prepare_audio(audio, req.get("from_demucs", False))
+        song_key = _clip_id(audio)
+        bucket = pass_bucket(req.get("language"), req.get("from_demucs", False))
+        passes = _build_passes(req.get("prompt"), req.get("language"),
+                               req.get("word_timestamps", True),
+                               req.get("regroup_passes") or [True] * 4)
+        states.append({
+            "label": req.get("label") or f"Song {i + 1}",
+            "audio": audio,
+            "song_key": song_key, "bucket": bucket,
+            "passes": plan_passes(passes, song_key, bucket),
+            "min_expected": _min_expected(req.get("duration")),
+            "best": None, "score": 0, "idx": -1, "elapsed": 0.0, "done": False,
+            "attempts": [],
+        })
+
+    use_pool = ((Config.WHISPER_PARALLEL_PASSES or Config.WHISPER_CHUNKED)
+                and get_device_info() == "CPU"
+                and not any(_is_path(st["audio"]) for st in states))
+    model = None
+
+    try:
+        for pass_idx in range(len(states[0]["passes"])):
+            active = [st for st in states if not st["done"]]
+            if not active:
+                break
+            names = {st["passes"][pass_idx]["name"] for st in active}
+            label = names.pop() if len(names) == 1 else f"Round {pass_idx + 1}"
+            print(f"  {label} \u2014 {len(active)} song(s)...")
+            clear_vram()
+
+            # id(st) -> (raw pass or None, seconds or None when not run here)
+            outcomes = {}
+            runs = {}   # #43: songs sharing a raw pass (same input, same params) run it once
+            for st in active:
+                st["ckpt"] = pass_checkpoint_key(st["audio"], st["passes"][pass_idx]["params"])
+                restored = load_pass_checkpoint(st["ckpt"])
+                if restored is not None:
+                    print(f"    \u267b {st['label']}: restored from checkpoint")
+                    outcomes[id(st)] = (restored["result"], None)
+                else:
+                    runs.setdefault(st["ckpt"] or id(st), []).append(st)
+            pending = [group[0] for group in runs.values()]
+
+            if pending and use_pool:
+                jobs = transcribe_pool.submit(
+                    [(st["audio"].samples, st["passes"][pass_idx]["params"]) for st in pending])
+                for st, job in zip(pending, jobs):
+                    try:
+                        out = job.get()
+                    except Exception as e:
+                        print(f"    \u2192 {st['label']}: error: {e}")
+                        out = None
+                    outcomes[id(st)] = (out and out["result"], out["time"] if out else 0.0)
+                    if out:
+                        save_pass_checkpoint(st["ckpt"], out["result"])
+            elif pending:
+                if model is None:
+                    model = load_whisper_model()
+                for st in pending:
+                    pass_start = _time.time()
+                    try:
+                        raw = _run_pass(model, st["audio"], st["passes"][pass_idx]["params"])
+                        save_pass_checkpoint(st["ckpt"], raw)
+                    except Exception as e:
+                        print(f"    \u2192 {st['label']}: error: {e}")
+                        raw = None
+                    outcomes[id(st)] = (raw, _time.time() - pass_start)
+            for group in runs.values():
+                for st in group[1:]:
+                    print(f"    \u267b {st['label']}: same pass as {group[0]['label']}")
+                    outcomes[id(st)] = (outcomes[id(group[0])][0], None)
+
+            for st in active:
+                raw, took = outcomes[id(st)]
+                p = st["passes"][pass_idx]
+                result, count = _template_pass(raw, p["regroup"])
+                st["attempts"].append((p["index"], count, None if took is None else round(took, 2)))
+                took = took or 0.0
+                st["elapsed"] += took
+                print(f"    \u2192 {st['label']}: {count} segments ({took:.0f}s)")
+                if result is not None:
+                    weighted = count * p["weight"]
+                    if weighted > st["score"]:
+                        st["score"], st["best"], st["idx"] = weighted, result, p["index"]
+                    if count >= st["min_expected"]:
+                        st["best"], st["idx"], st["done"] = result, p["index"], True
+                        continue
+                if st["best"] is not None and st["elapsed"] > PASS_TIME_CAP_SEC:
+                    print(f"  \u23f1 {st['label']}: time cap reached \u2014 using pass {st['idx'] + 1}")
+                    st["done"] = True
+    finally:
+        if use_pool:
+            transcribe_pool.cancel_all()
+        clear_vram()
+
+    outcomes = []
+    for st in states:
+        if st["best"] is not None:
+            _snap_to_silence(st["best"], st["audio"])
+        record_pass_history(st["song_key"], st["bucket"], st["attempts"], st["idx"])
+        outcomes.append((st["best"], st["idx"]))
+    return outcomes
+
+
+def pretranscribe(requests):
+    """
+    Batch-transcribe ahead of the per-song pipelines; multi_pass_transcribe
+    then returns the parked result for a matching call.  Returns the number
+    of songs with a result.
+    """
+    # A song queued twice with the same settings is transcribed once; the
+    # same song for different templates shares its raw passes (#43)
+    unique = {}
+    for r in requests:
+        unique.setdefault(_request_key(r), r)
+    keys, requests = list(unique), list(unique.values())
+    done = 0
+    for key, outcome in zip(keys, batch_transcribe(requests)):
+        if outcome[0] is not None:
+            _pretranscribed[key] = outcome
+            done += 1
+    return done
+
+
+def clear_pretranscribed():
+    """Drop batch results nobody consumed (end of batch)."""
+    _pretranscribed.clear()
+
+
+def _request_key(request):
+    return transcription_key(request["audio"], request.get("prompt"),
+                             request.get("language"), request.get("regroup_passes"),
+                             request.get("from_demucs", False),
+                             request.get("word_timestamps", True))
+
+
+# ============================================================================
+# CHUNKED TRANSCRIPTION (#41)
+# ============================================================================
+
+def detect_silences(audio):
+    """
+    Silent spans [(start, end), ...] in seconds, from stable-ts' Silero VAD.
+    Falls back to a 100 ms RMS energy gate if VAD is unavailable.
+    """
+    try:
+        from stable_whisper.stabilization import get_vad_silence_func
+        starts, ends = get_vad_silence_func()(
+            audio.samples, speech_threshold=0.35, sr=audio.sample_rate)
+        return [(float(a), float(b)) for a, b in zip(starts, ends)]
+    except Exception as e:
+        print(f"  \u26a0 VAD unavailable ({e}) \u2014 using energy gate")
+
+    hop = max(1, audio.sample_rate // 10)
+    n = len(audio.samples) // hop
+    if n == 0:
+        return []
+    frames = audio.samples[:n * hop].reshape(n, hop).astype(np.float64)
+    rms = np.sqrt(np.mean(np.square(frames), axis=1))
+    quiet = rms < max(float(rms.max()) * SILENCE_ENERGY_RATIO, 1e-6)
+    silences, start = [], None
+    for i, q in enumerate(quiet):
+        if q and start is None:
+            start = i
+        elif not q and start is not None:
+            silences.append((start * hop / audio.sample_rate, i * hop / audio.sample_rate))
+            start = None
+    if start is not None:
+        silences.append((start * hop / audio.sample_rate, n * hop / audio.sample_rate))
+    return silences
+
+
+def plan_chunks(duration, silences, n_chunks, min_chunk_sec):
+    """
+    Split [0, duration] into up to n_chunks spans, cutting only in the middle
+    of silent gaps, as close as possible to equal-length targets.
+    Returns [(start, end), ...] covering the whole clip.
+    """
+    if n_chunks < 2 or duration < 2 * min_chunk_sec:
+        return [(0.0, duration)]
+    midpoints = sorted((a + b) / 2.0 for a, b in silences if 0 < (a + b) / 2.0 < duration)
+    cuts = []
+    for k in range(1, n_chunks):
+        target = duration * k / n_chunks
+        prev = cuts[-1] if cuts else 0.0
+        candidates = [m for m in midpoints
+                      if m - prev >= min_chunk_sec and duration - m >= min_chunk_sec]
+        if not candidates:
+            break
+        best = min(candidates, key=lambda m: abs(m - target))
+        if abs(best - target) > duration / (2 * n_chunks):
+            continue
+        cuts.append(best)
+    bounds = [0.0] + cuts + [duration]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def plan_audio_chunks(audio):
+    """VAD once and plan the chunks shared by every pass."""
+    spans = plan_chunks(audio.duration, detect_silences(audio),
+                        Config.WHISPER_POOL_PROCESSES, Config.WHISPER_CHUNK_MIN_SEC)
+    if len(spans) > 1:
+        print(f"  \u2702 {len(spans)} chunks at silence boundaries: "
+              + ", ".join(f"{a:.1f}-{b:.1f}s" for a, b in spans))
+    return spans
+
+
+def stitch_chunk_results(chunk_dicts, offsets):
+    """
+    Merge per-chunk WhisperResult dicts into one, shifting segment, word and
+    non-speech timings by each chunk's absolute offset.
+    """
+    segments, texts, nonspeech = [], [], []
+    language = None
+    for data, offset in zip(chunk_dicts, offsets):
+        if not data:
+            continue
+        language = language or data.get("language")
+        for seg in data.get("segments", []):
+            seg = dict(seg)
+            seg["start"] = round(seg["start"] + offset, 3)
+            seg["end"] = round(seg["end"] + offset, 3)
+            if seg.get("words"):
+                seg["words"] = [
+                    dict(w, start=round(w["start"] + offset, 3),
+                         end=round(w["end"] + offset, 3))
+                    for w in seg["words"]
+                ]
+            seg["id"] = len(segments)
+            segments.append(seg)
+            texts.append(seg.get("text", ""))
+        for ns in data.get("nonspeech_sections", []) or []:
+            nonspeech.append(dict(ns, start=ns["start"] + offset, end=ns["end"] + offset))
+    merged = {"text": "".join(texts), "segments": segments, "language": language}
+    if nonspeech:
+        merged["nonspeech_sections"] = nonspeech
+    return merged
+
+
+def transcribe_chunked(audio, spans, params):
+    """Transcribe the planned chunks in the process pool and stitch the result."""
+    sr = audio.sample_rate
+    slices = [audio.samples[int(a * sr):int(b * sr)] for a, b in spans]
+    try:
+        jobs = transcribe_pool.submit_chunks(slices, params)
+        outs = [job.get() for job in jobs]
+    finally:
+        transcribe_pool.cancel_all()
+    if not any(out and out["result"] for out in outs):
+        return None
+    merged = stitch_chunk_results(
+        [out["result"] if out else None for out in outs],
+        [a for a, _ in spans])
+    return _result_from_dict(merged)
+
+
 # ============================================================================
 # MARKER BUILDING (Mono/Onyx shared)
 # ============================================================================
@@ -976,25 +2042,43 @@ def _strip_genius_section_tags(text: str) -> str:
 # FORCED ALIGNMENT (#28: Genius text → audio via model.align)
 # ============================================================================
 
-def align_genius_to_audio(audio_path, genius_text, language=None):
+def align_genius_to_audio(audio, genius_text, language=None):
     """
     Use stable-ts forced alignment to get precise word timestamps for Genius text.
     Falls back to None on failure — caller should use rebuild_words_after_alignment.
+    #34: Runs in the transcription worker when enabled (shares its warm model).
+    #36: Accepts a file path or a decoded AudioBuffer.
     """
     if not genius_text or not genius_text.strip():
         return None
 
+    audio_path = audio if _is_path(audio) else audio.path
+    if Config.TRANSCRIBE_WORKER and audio_path:
+        from scripts import transcription_worker
+        try:
+            return transcription_worker.remote_align(audio_path, genius_text, language)
+        except transcription_worker.WorkerUnavailable as e:
+            print(f"  \u26a0 Transcription worker unavailable ({e}) \u2014 aligning in-process")
+
     try:
+        # #39: align over the same prepared samples the passes used, so the
+        # 30 s windows hit the shared mel/encoder cache
+        if _is_path(audio):
+            audio = load_audio(audio)
+        if not _is_path(audio):
+            audio = _prepare_audio(audio, from_demucs=False)
+        whisper_features.begin_clip(_clip_id(audio))
+
         model = load_whisper_model()
         lang_params = {"language": language} if language else {}
-        result = model.align(
-            audio_path, genius_text,
+        result = _active_backend().align(
+            model, _audio_input(audio), genius_text,
             vad=True, suppress_silence=True,
             min_word_dur=MIN_WORD_DUR, only_voice_freq=True,
             **lang_params,
         )
         if result and result.segments:
-            _snap_to_silence(result, audio_path)
+            _snap_to_silence(result, audio)
             print(f"  Forced alignment: {len(result.segments)} segments")
             return result
         return None
@@ -1003,6 +2087,314 @@ def align_genius_to_audio(audio_path, genius_text, language=None):
         return None
 
 
+# ============================================================================
+# MARKER TABLE (#49: structure-of-arrays post-processing)
+# ============================================================================
+
+_MARKER_BASE_KEYS = ("time", "text", "words", "color", "end_time")
+_MARKER_COLUMNS = ("time", "end_time", "word_start", "word_end", "word_prob")
+_PRESENT = object()   # MarkerTable built without source: every value is emitted
+
+
+def _column_value(value, given, default):
+    """
+    A MarkerTable value for to_markers: the value from_markers was given
+    while unchanged, None (leave the key out) while an absent key still
+    holds its stand-in (`default`, or NaN).
+    """
+    if given is _PRESENT:
+        return None if value != value else value
+    if given is None:
+        return None if value != value or value == default else value
+    return given if value == given else value
+CLUSTER_THRESHOLD_SEC = 0.025
+
+
+class MarkerTable:
+    """
+    Markers + their words as columns instead of nested dicts.
+
+    Marker columns: time, end_time (NaN if absent), text, color, extras
+    (any other marker keys, e.g. avg_logprob).  Words are flattened into
+    word_text / word_start / word_end / word_prob (NaN = no probability);
+    marker i owns words offsets[i]:offsets[i + 1].
+
+    The post-processing chain (merge, colours, gap fix, cluster spread,
+    quality score) runs on the columns and to_markers() builds the JSON
+    dict shape once at the end.  snapshot() is an array copy, not a deepcopy.
+
+    `source` keeps each numeric column's original values (None = key
+    absent), so to_markers() returns an untouched value as it was given
+    (an int time stays an int) and leaves out keys that were never set.
+    """
+
+    def __init__(self, time, end_time, text, color, extras,
+                 offsets, word_text, word_start, word_end, word_prob, source=None):
+        self.time = time
+        self.end_time = end_time
+        self.text = text
+        self.color = color
+        self.extras = extras
+        self.offsets = offsets
+        self.word_text = word_text
+        self.word_start = word_start
+        self.word_end = word_end
+        self.word_prob = word_prob
+        self.source = source
+
+    @classmethod
+    def from_markers(cls, markers):
+        nan = float("nan")
+        time, end_time, text, color, extras = [], [], [], [], []
+        offsets = [0]
+        word_text, word_start, word_end, word_prob = [], [], [], []
+        source = {name: [] for name in _MARKER_COLUMNS}
+        for m in markers:
+            source["time"].append(m.get("time"))
+            source["end_time"].append(m.get("end_time"))
+            time.append(m.get("time", 0))
+            end_time.append(m.get("end_time", nan))
+            text.append(m.get("text", ""))
+            color.append(m.get("color", ""))
+            extra = {k: v for k, v in m.items() if k not in _MARKER_BASE_KEYS}
+            extras.append(extra or None)
+            words = m.get("words", [])
+            for w in words:
+                word_text.append(w.get("word", ""))
+                start, end, prob = w.get("start"), w.get("end"), w.get("probability")
+                source["word_start"].append(start)
+                source["word_end"].append(end)
+                source["word_prob"].append(prob)
+                word_start.append(0 if start is None else start)
+                word_end.append(nan if end is None else end)
+                word_prob.append(nan if prob is None else prob)
+            offsets.append(offsets[-1] + len(words))
+        return cls(np.array(time, dtype=np.float64), np.array(end_time, dtype=np.float64),
+                   text, color, extras, np.array(offsets, dtype=np.int64), word_text,
+                   np.array(word_start, dtype=np.float64), np.array(word_end, dtype=np.float64),
+                   np.array(word_prob, dtype=np.float64), source)
+
+    def __len__(self):
+        return len(self.text)
+
+    def snapshot(self):
+        """Independent copy (arrays copied, strings shared)."""
+        source = self.source and {name: list(col) for name, col in self.source.items()}
+        return MarkerTable(self.time.copy(), self.end_time.copy(), list(self.text),
+                           list(self.color), [dict(e) if e else None for e in self.extras],
+                           self.offsets.copy(), list(self.word_text), self.word_start.copy(),
+                           self.word_end.copy(), self.word_prob.copy(), source)
+
+    def _column(self, name):
+        """(current values, original values) of a numeric column."""
+        values = getattr(self, name).tolist()
+        return values, self.source[name] if self.source else [_PRESENT] * len(values)
+
+    def _word_dicts(self, lo, hi, starts, ends, probs):
+        words = []
+        for k in range(lo, hi):
+            w = {"word": self.word_text[k]}
+            for key, (values, given), default in (("start", starts, 0), ("end", ends, None),
+                                                   ("probability", probs, None)):
+                value = _column_value(values[k], given[k], default)
+                if value is not None:
+                    w[key] = value
+            words.append(w)
+        return words
+
+    def to_markers(self):
+        """The JSON dict shape the JSX templates read (untouched markers as given)."""
+        times, end_times = self._column("time"), self._column("end_time")
+        starts, ends, probs = (self._column("word_start"), self._column("word_end"),
+                               self._column("word_prob"))
+        offsets = self.offsets.tolist()
+        markers = []
+        for i in range(len(self)):
+            m = {}
+            time = _column_value(times[0][i], times[1][i], 0)
+            if time is not None:
+                m["time"] = time
+            m["text"] = self.text[i]
+            m["words"] = self._word_dicts(offsets[i], offsets[i + 1], starts, ends, probs)
+            m["color"] = self.color[i]
+            end_time = _column_value(end_times[0][i], end_times[1][i], None)
+            if end_time is not None:
+                m["end_time"] = end_time
+            if self.extras[i]:
+                m.update(self.extras[i])
+            markers.append(m)
+        return markers
+
+    def write_back(self, markers, changed):
+        """Copy start/end of the `changed` words into the original marker dicts."""
+        idx = np.flatnonzero(changed)
+        if not len(idx):
+            return
+        owners = np.searchsorted(self.offsets, idx, side="right") - 1
+        for k, i in zip(idx.tolist(), owners.tolist()):
+            w = markers[i]["words"][k - self.offsets[i]]
+            w["start"] = float(self.word_start[k])
+            if self.word_end[k] == self.word_end[k]:
+                w["end"] = float(self.word_end[k])
+
+    def _first_words(self):
+        """Mask of words that open their marker."""
+        first = np.zeros(len(self.word_start), dtype=bool)
+        first[self.offsets[:-1][np.diff(self.offsets) > 0]] = True
+        return first
+
+    def merge_short(self, max_words=2, max_gap=1.5):
+        """Table version of merge_short_markers (#19)."""
+        n = len(self)
+        if n < 2:
+            return self
+
+        groups = []
+        i = 0
+        while i < n:
+            if i + 1 < n and len(self.text[i].split()) <= max_words:
+                end = self.end_time[i] if self.end_time[i] == self.end_time[i] else self.time[i]
+                if self.time[i + 1] - end <= max_gap:
+                    print(f"   🔗 Merged short marker '{self.text[i][:30]}' with next")
+                    groups.append((i, i + 1))
+                    i += 2
+                    continue
+            groups.append((i, i))
+            i += 1
+
+        if len(groups) == n:
+            return self
+
+        keep_words = np.concatenate([np.arange(self.offsets[a], self.offsets[b + 1])
+                                     for a, b in groups] or [np.zeros(0, dtype=np.int64)])
+        counts = [self.offsets[b + 1] - self.offsets[a] for a, b in groups]
+        src = self.source or {name: [_PRESENT] * len(getattr(self, name))
+                              for name in _MARKER_COLUMNS}
+        time, end_time, text, color, extras = [], [], [], [], []
+        time_src, end_src = [], []
+        for a, b in groups:
+            time.append(self.time[a])
+            time_src.append(src["time"][a])
+            if a == b:
+                end_time.append(self.end_time[a])
+                end_src.append(src["end_time"][a])
+                text.append(self.text[a])
+                color.append(self.color[a])
+                extras.append(self.extras[a])
+            else:
+                nxt_end = self.end_time[b]
+                if nxt_end == nxt_end:
+                    end_time.append(nxt_end)
+                    end_src.append(src["end_time"][b])
+                else:
+                    end_time.append(self.time[b])
+                    end_src.append(src["time"][b])
+                text.append(self.text[a].rstrip(",. ") + " " + self.text[b])
+                color.append(self.color[b])
+                extras.append(None)
+        keep = keep_words.tolist()
+        source = {"time": time_src, "end_time": end_src}
+        for name in ("word_start", "word_end", "word_prob"):
+            source[name] = [src[name][k] for k in keep]
+        print(f"   Merged {n - len(groups)} short marker(s)")
+        return MarkerTable(np.array(time, dtype=np.float64), np.array(end_time, dtype=np.float64),
+                           text, color, extras,
+                           np.concatenate([[0], np.cumsum(counts)]).astype(np.int64),
+                           [self.word_text[k] for k in keep],
+                           self.word_start[keep_words], self.word_end[keep_words],
+                           self.word_prob[keep_words], source)
+
+    def assign_colors(self):
+        self.color = ["white" if i % 2 == 0 else "black" for i in range(len(self))]
+
+    def fix_gaps(self, threshold=MARKER_GAP_THRESHOLD_SEC):
+        """
+        Vectorised fix_marker_gaps (#14).  Ends are never moved, so every
+        word's gap to its predecessor is independent of the others.
+        Returns the mask of words whose start changed.
+        """
+        starts, ends = self.word_start, self.word_end
+        changed = np.zeros(len(starts), dtype=bool)
+        if len(starts) < 2:
+            return changed
+        gap = starts[1:] - ends[:-1]
+        changed[1:] = gap > threshold
+        changed &= ~self._first_words()
+        prev_end = np.concatenate([[0.0], ends[:-1]])
+        shifted = np.concatenate([[0.0], np.minimum(gap * 0.1, 0.5)])
+        starts[changed] = prev_end[changed] + shifted[changed]
+        return changed
+
+    def spread_clusters(self, threshold=CLUSTER_THRESHOLD_SEC):
+        """
+        spread_clustered_words (#31) on the columns.  A vectorised pass finds
+        the markers holding near-identical neighbouring starts; only those
+        run the cluster walk.  Returns the mask of words that were respaced.
+        """
+        starts, ends = self.word_start, self.word_end
+        changed = np.zeros(len(starts), dtype=bool)
+        if len(starts) < 2:
+            return changed
+        near = np.abs(np.diff(starts)) <= threshold
+        near &= ~self._first_words()[1:]
+        if not near.any():
+            return changed
+
+        offsets = self.offsets.tolist()
+        for i in np.unique(np.searchsorted(self.offsets, np.flatnonzero(near) + 1,
+                                           side="right") - 1).tolist():
+            lo, hi = offsets[i], offsets[i + 1]
+            seg_end = self.end_time[i]
+            if seg_end != seg_end:
+                seg_end = self.time[i] + 5.0
+            seg_end = float(seg_end)
+            word_starts = starts[lo:hi].tolist()
+            a = 0
+            while a < len(word_starts):
+                cluster_time = word_starts[a]
+                b = a + 1
+                while b < len(word_starts) and abs(word_starts[b] - cluster_time) <= threshold:
+                    b += 1
+                size = b - a
+                if size > 1:
+                    span_end = word_starts[b] if b < len(word_starts) else seg_end
+                    span = span_end - cluster_time
+                    if 0.05 < span < 30.0:
+                        word_dur = span / size
+                        for k in range(size):
+                            starts[lo + a + k] = round(cluster_time + k * word_dur, 3)
+                            ends[lo + a + k] = round(cluster_time + (k + 1) * word_dur, 3)
+                        changed[lo + a:lo + b] = True
+                a = b
+        return changed
+
+    def quality_score(self):
+        """compute_quality_score (#24) on the columns."""
+        n = len(self)
+        if not n:
+            return {"coverage_pct": 0.0, "avg_prob": 0.0, "zero_time_words": 0, "total_words": 0}
+
+        probs = self.word_prob[self.word_prob == self.word_prob].tolist()
+        ends = np.where(self.word_end == self.word_end, self.word_end, 0.0)
+        zero_time = int(np.count_nonzero(ends - self.word_start < MIN_WORD_DUR))
+        avg_prob = sum(probs) / len(probs) if probs else 0.0
+
+        if n >= 2:
+            end_times = np.where(self.end_time == self.end_time, self.end_time, self.time)
+            covered = sum((end_times - self.time).tolist())
+            span = end_times[-1] - self.time[0]
+            coverage_pct = covered / span if span > 0 else 0.0
+        else:
+            coverage_pct = 1.0
+
+        return {
+            "coverage_pct": round(min(float(coverage_pct), 1.0), 4),
+            "avg_prob": round(avg_prob, 4),
+            "zero_time_words": zero_time,
+            "total_words": len(self.word_start),
+        }
+
+
 # ============================================================================
 # COLOR ASSIGNMENT (Mono/Onyx shared)
 # ============================================================================
@@ -1021,14 +2413,10 @@ def fix_marker_gaps(markers):
     """
     Fix large gaps between consecutive words.
     #14: Threshold 2.0s -> 4.0s, proportional compression min(gap*0.1, 0.5).
+    #49: Computed on a MarkerTable; only moved words are written back.
     """
-    for m in markers:
-        words = m.get("words", [])
-        for i in range(1, len(words)):
-            gap = words[i]["start"] - words[i - 1]["end"]
-            if gap > MARKER_GAP_THRESHOLD_SEC:
-                compression = min(gap * 0.1, 0.5)
-                words[i]["start"] = words[i - 1]["end"] + compression
+    table = MarkerTable.from_markers(markers)
+    table.write_back(markers, table.fix_gaps())
 
 
 # ============================================================================
@@ -1044,43 +2432,11 @@ def spread_clustered_words(markers):
 
     Returns the same markers list (words modified in-place for consistency
     with fix_marker_gaps which also mutates in-place).
-    """
-    CLUSTER_THRESHOLD = 0.025  # words within 25ms are "clustered"
-
-    for m in markers:
-        words = m.get("words", [])
-        if len(words) < 2:
-            continue
-
-        seg_end = m.get("end_time", m.get("time", 0) + 5.0)
-
-        i = 0
-        while i < len(words):
-            cluster_time = words[i]["start"]
-
-            # Find all words in this cluster
-            j = i + 1
-            while j < len(words) and abs(words[j]["start"] - cluster_time) <= CLUSTER_THRESHOLD:
-                j += 1
-
-            cluster_size = j - i
-            if cluster_size > 1:
-                # Determine available span
-                if j < len(words):
-                    span_end = words[j]["start"]
-                else:
-                    span_end = seg_end
-
-                span = span_end - cluster_time
-                # Only spread if there's enough room (avoid creating impossible timestamps)
-                if 0.05 < span < 30.0:
-                    word_dur = span / cluster_size
-                    for k in range(cluster_size):
-                        words[i + k]["start"] = round(cluster_time + k * word_dur, 3)
-                        words[i + k]["end"] = round(cluster_time + (k + 1) * word_dur, 3)
-
-            i = j
 
+    #49: Computed on a MarkerTable; only respaced words are written back.
+    """
+    table = MarkerTable.from_markers(markers)
+    table.write_back(markers, table.spread_clusters())
     return markers
 
 
@@ -1203,10 +2559,56 @@ def quality_gate(markers, clip_duration):
 # ============================================================================
 
 
+class LyricMatchMatrix:
+    """
+    #45: Fuzzy line matching for one song, scored with rapidfuzz cdist
+    matrices (all cores) instead of fuzz.ratio loops.  Genius counts are
+    memoised per normalised line, so remove_genius_confirmed_duplicates and
+    validate_lyrics_quality share the work when given the same instance.
+    """
+
+    def __init__(self, genius_text=None, threshold=LYRICS_DUPLICATE_THRESHOLD,
+                 index=None):
+        self.threshold = threshold
+        if index is None and genius_text:
+            index = GeniusLyricsIndex(genius_text)
+        self.genius_lines = index.lines if index is not None else []
+        self._genius_counts = {}
+
+    @staticmethod
+    def line_key(text):
+        return text.lower().replace("\\r", " ")
+
+    def genius_counts(self, lines):
+        """Genius lines fuzzy-matching each line (parenthesised adlibs ignored)."""
+        cleans = [_PAREN_ADLIB_RE.sub(" ", ln).strip().lower() for ln in lines]
+        missing = [c for c in dict.fromkeys(cleans) if c and c not in self._genius_counts]
+        if missing and self.genius_lines:
+            scores = process.cdist(missing, self.genius_lines, scorer=fuzz.ratio,
+                                   dtype=np.float64, workers=-1)
+            for clean, hits in zip(missing, (scores >= self.threshold).sum(axis=1)):
+                self._genius_counts[clean] = int(hits)
+        return [self._genius_counts.get(c, 0) if c else 0 for c in cleans]
+
+    def whisper_scores(self, texts):
+        """Pairwise fuzz.ratio of the Whisper lines (by line_key)."""
+        keys = [self.line_key(t) for t in texts]
+        return process.cdist(keys, keys, scorer=fuzz.ratio,
+                             dtype=np.float64, workers=-1)
+
+    def whisper_counts(self, texts, scores=None):
+        """How often each line occurs in the Whisper output (itself included)."""
+        if scores is None:
+            scores = self.whisper_scores(texts)
+        hits = (scores >= self.threshold).sum(axis=1)
+        return [int(n) if self.line_key(t) else 0 for t, n in zip(texts, hits)]
+
+
 def remove_genius_confirmed_duplicates(
     markers: list,
     genius_text: str | None = None,
     text_key: str = "text",
+    matrix: LyricMatchMatrix | None = None,
 ) -> list:
     """
     Auto-remove duplicate markers that Genius confirms are hallucinations.
@@ -1221,28 +2623,25 @@ def remove_genius_confirmed_duplicates(
     if not markers or not genius_text or not genius_text.strip():
         return list(markers)
 
-    genius_lines = _parse_genius_lines(genius_text)
-    if not genius_lines:
+    if matrix is None:
+        matrix = LyricMatchMatrix(genius_text)
+    if not matrix.genius_lines:
         return list(markers)
 
-    # Build a map: normalized line -> genius count
-    # Process each unique line in Whisper output
+    # Group Whisper indices by normalized line
     seen_lines: dict[str, dict] = {}
     for i, m in enumerate(markers):
         text = m.get(text_key, "").strip()
         if not text:
             continue
-        normalized = re.sub(r"\s*\([^)]*\)\s*", " ", text).strip().lower()
+        normalized = _PAREN_ADLIB_RE.sub(" ", text).strip().lower()
         if not normalized:
             continue
+        seen_lines.setdefault(normalized, {"indices": []})["indices"].append(i)
 
-        if normalized not in seen_lines:
-            genius_count = _count_genius_occurrences(text, genius_lines)
-            seen_lines[normalized] = {
-                "genius_count": genius_count,
-                "indices": [],
-            }
-        seen_lines[normalized]["indices"].append(i)
+    # One cdist over the unique lines gives every Genius count
+    for info, count in zip(seen_lines.values(), matrix.genius_counts(list(seen_lines))):
+        info["genius_count"] = count
 
     # Determine which indices to remove
     remove_indices = set()
@@ -1295,44 +2694,16 @@ def _parse_genius_lines(genius_text: str) -> list[str]:
             if any(inner.startswith(sw) for sw in section_words):
                 continue
         # Strip parenthesized adlibs for matching: "line (yeah)" -> "line"
-        clean = re.sub(r"\s*\([^)]*\)\s*", " ", stripped).strip()
+        clean = _PAREN_ADLIB_RE.sub(" ", stripped).strip()
         if clean:
             result.append(clean.lower())
     return result
 
 
-def _count_genius_occurrences(line: str, genius_lines: list[str],
-                              threshold: int = LYRICS_DUPLICATE_THRESHOLD) -> int:
-    """
-    Count how many Genius lines fuzzy-match the given line.
-    Genius is treated as ground truth — occurrence count is authoritative.
-    """
-    clean = re.sub(r"\s*\([^)]*\)\s*", " ", line).strip().lower()
-    if not clean:
-        return 0
-    count = 0
-    for gl in genius_lines:
-        if fuzz.ratio(clean, gl) >= threshold:
-            count += 1
-    return count
-
-
-def _count_whisper_occurrences(line: str, all_texts: list[str],
-                               threshold: int = LYRICS_DUPLICATE_THRESHOLD) -> int:
-    """Count how many times a line appears in the Whisper output."""
-    clean = line.lower().replace("\\r", " ")
-    if not clean:
-        return 0
-    count = 0
-    for t in all_texts:
-        if fuzz.ratio(clean, t.lower().replace("\\r", " ")) >= threshold:
-            count += 1
-    return count
-
-
 def validate_lyrics_quality(
     markers: list,
     genius_text: str | None = None,
+    matrix: LyricMatchMatrix | None = None,
 ) -> tuple[bool, list[str]]:
     """
     Validate lyrics for visual quality issues that would be visible in the
@@ -1352,9 +2723,15 @@ def validate_lyrics_quality(
 
     texts = [m.get("text", "").strip() for m in markers]
 
-    # Parse Genius lines once if available
-    genius_lines = _parse_genius_lines(genius_text) if genius_text else []
-    has_genius = len(genius_lines) > 0
+    # #45: one score matrix for every Whisper pair, one cdist for Genius counts
+    if matrix is None:
+        matrix = LyricMatchMatrix(genius_text)
+    has_genius = len(matrix.genius_lines) > 0
+    keys = [matrix.line_key(t) for t in texts]
+    scores = matrix.whisper_scores(texts)
+    if has_genius:
+        genius_counts = matrix.genius_counts(texts)
+        whisper_counts = matrix.whisper_counts(texts, scores)
 
     # 1. Fuzzy duplicate detection — consecutive near-identical lines
     #    With Genius: only flag if Whisper count exceeds Genius count
@@ -1362,14 +2739,11 @@ def validate_lyrics_quality(
     for i in range(1, len(texts)):
         if not texts[i] or not texts[i - 1]:
             continue
-        ratio = fuzz.ratio(
-            texts[i].lower().replace("\\r", " "),
-            texts[i - 1].lower().replace("\\r", " "),
-        )
+        ratio = float(scores[i][i - 1])
         if ratio >= LYRICS_DUPLICATE_THRESHOLD:
             if has_genius:
-                genius_count = _count_genius_occurrences(texts[i], genius_lines)
-                whisper_count = _count_whisper_occurrences(texts[i], texts)
+                genius_count = genius_counts[i]
+                whisper_count = whisper_counts[i]
                 if whisper_count <= genius_count:
                     continue  # Genius confirms this repetition — skip
                 warnings.append(
@@ -1391,20 +2765,17 @@ def validate_lyrics_quality(
     for i in range(len(texts)):
         if not texts[i]:
             continue
-        line_key = texts[i].lower().replace("\\r", " ")
+        line_key = keys[i]
         if line_key in already_checked:
             continue
         for j in range(i + 2, len(texts)):
             if not texts[j]:
                 continue
-            ratio = fuzz.ratio(
-                line_key,
-                texts[j].lower().replace("\\r", " "),
-            )
+            ratio = float(scores[i][j])
             if ratio >= LYRICS_DUPLICATE_THRESHOLD:
                 if has_genius:
-                    genius_count = _count_genius_occurrences(texts[i], genius_lines)
-                    whisper_count = _count_whisper_occurrences(texts[i], texts)
+                    genius_count = genius_counts[i]
+                    whisper_count = whisper_counts[i]
                     if whisper_count <= genius_count:
                         already_checked.add(line_key)
                         break  # Genius confirms — skip all pairs for this line
@@ -1478,78 +2849,130 @@ def compute_quality_score(markers):
         - zero_time_words: count of words where end - start < MIN_WORD_DUR
         - total_words: total word count
     """
-    if not markers:
-        return {"coverage_pct": 0.0, "avg_prob": 0.0, "zero_time_words": 0, "total_words": 0}
-
-    all_probs = []
-    zero_time = 0
-    total_words = 0
-
-    for m in markers:
-        for w in m.get("words", []):
-            total_words += 1
-            prob = w.get("probability")
-            if prob is not None:
-                all_probs.append(float(prob))
-            start = float(w.get("start", 0))
-            end = float(w.get("end", 0))
-            if end - start < MIN_WORD_DUR:
-                zero_time += 1
-
-    avg_prob = sum(all_probs) / len(all_probs) if all_probs else 0.0
-
-    # Coverage: total marker time / clip time
-    if len(markers) >= 2:
-        first_start = markers[0]["time"]
-        last_end = markers[-1].get("end_time", markers[-1]["time"])
-        covered = sum(m.get("end_time", m["time"]) - m["time"] for m in markers)
-        span = last_end - first_start
-        coverage_pct = covered / span if span > 0 else 0.0
-    elif len(markers) == 1:
-        coverage_pct = 1.0
-    else:
-        coverage_pct = 0.0
-
-    return {
-        "coverage_pct": round(min(coverage_pct, 1.0), 4),
-        "avg_prob": round(avg_prob, 4),
-        "zero_time_words": zero_time,
-        "total_words": total_words,
-    }
+    return MarkerTable.from_markers(markers).quality_score()
 
 
 # ============================================================================
 # WHISPER CACHE (#11)
 # ============================================================================
 
-def save_whisper_cache(job_folder, segments):
+def whisper_store_key(audio_path, template_name, **params):
+    """
+    Artifact-store key for raw Whisper segments (#37): audio hash + model,
+    backend, template and pass config.  Returns None if the audio can't be hashed.
+    """
+    try:
+        return get_store().key(
+            _get_audio_hash(audio_path), model=Config.WHISPER_MODEL,
+            backend=Config.WHISPER_BACKEND, template=template_name, **params)
+    except Exception:
+        return None
+
+
+# #51: v2 cache — segment rows plus one columnar word table, no indentation
+WHISPER_CACHE_VERSION = 2
+COMPACT_JSON = {"separators": (",", ":"), "ensure_ascii": False}
+
+
+def _word_columns(segments):
+    """Per-segment word counts (None = no words key) + flat word columns."""
+    counts, word, start, end, prob = [], [], [], [], []
+    for seg in segments:
+        words = seg.get("words")
+        if words is None:
+            counts.append(None)
+            continue
+        counts.append(len(words))
+        for w in words:
+            word.append(w["word"])
+            start.append(w["start"])
+            end.append(w["end"])
+            prob.append(w.get("probability"))
+    if all(c is None for c in counts):
+        return None
+    columns = {"counts": counts, "word": word, "start": start, "end": end}
+    if any(p is not None for p in prob):
+        columns["probability"] = prob
+    return columns
+
+
+def _attach_words(data, columns):
+    """Materialise the word dicts of a v2 cache onto its segment rows."""
+    counts = columns["counts"]
+    word, start, end = columns["word"], columns["start"], columns["end"]
+    prob = columns.get("probability")
+    pos = 0
+    for seg, count in zip(data, counts):
+        if count is None:
+            continue
+        if not isinstance(seg, dict):
+            pos += count   # keep later segments on their own words
+            continue
+        words = []
+        for k in range(pos, pos + count):
+            w = {"word": word[k], "start": start[k], "end": end[k]}
+            if prob is not None and prob[k] is not None:
+                w["probability"] = prob[k]
+            words.append(w)
+        seg["words"] = words
+        pos += count
+
+
+def save_whisper_cache(job_folder, segments, store_key=None):
     """Save raw Whisper segments to whisper_raw.json for caching.
     Tags the cache with the model name so stale caches are invalidated
-    when the user changes WHISPER_MODEL."""
+    when the user changes WHISPER_MODEL.
+    #37: With store_key, the file is also kept in the artifact store so the
+    same song skips transcription in later batches.
+    #51: Version 2 layout — words stored once as columns, compact JSON."""
     cache_path = os.path.join(job_folder, "whisper_raw.json")
     try:
         data = []
         for seg in segments:
-            entry = {
+            data.append({
                 "start": seg.get("t", seg.get("time", 0)),
                 "end": seg.get("end_time", 0),
                 "text": seg.get("lyric_current", seg.get("text", ""))
-            }
-            if "words" in seg:
-                entry["words"] = seg["words"]
-            data.append(entry)
-        wrapper = {"model": Config.WHISPER_MODEL, "segments": data}
-        with open(cache_path, "w", encoding="utf-8") as f:
-            json.dump(wrapper, f, indent=2, ensure_ascii=False)
+            })
+        wrapper = {
+            "version": WHISPER_CACHE_VERSION,
+            "model": Config.WHISPER_MODEL,
+            "backend": Config.WHISPER_BACKEND,
+            "segments": data,
+        }
+        columns = _word_columns(segments)
+        if columns:
+            wrapper["words"] = columns
+        # Write-then-replace: the old file may be hardlinked into the store
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(wrapper, f, **COMPACT_JSON)
+        os.replace(tmp_path, cache_path)
         print(f"  \U0001f4be Cached {len(data)} segments to whisper_raw.json")
+        if store_key:
+            try:
+                get_store().put_file("whisper", store_key, cache_path, ".json")
+            except Exception as e:
+                print(f"  \u26a0 Failed to store Whisper segments: {e}")
     except Exception as e:
         print(f"  \u26a0 Failed to save Whisper cache: {e}")
 
 
-def load_whisper_cache(job_folder):
+def load_whisper_cache(job_folder, store_key=None, words=True):
     """Load cached Whisper segments if available.
-    Returns None if the cache was produced by a different model."""
+    Returns None if the cache was produced by a different model or backend.
+    #37: Falls back to the artifact store (hardlinked into the job folder).
+    #51: words=False skips building word dicts (existence checks, Aurora)."""
     cache_path = os.path.join(job_folder, "whisper_raw.json")
+    if not os.path.exists(cache_path) and store_key:
+        try:
+            store = get_store()
+            stored = store.get("whisper", store_key, ".json")
+            if stored:
+                store.materialize(stored, cache_path)
+                print("  \u267b Whisper segments found in artifact store")
+        except Exception as e:
+            print(f"  \u26a0 Artifact store lookup failed: {e}")
     if not os.path.exists(cache_path):
         return None
     try:
@@ -1558,10 +2981,17 @@ def load_whisper_cache(job_folder):
         # Support both old format (bare list) and new format (dict with model tag)
         if isinstance(raw, dict):
             cached_model = raw.get("model")
+            cached_backend = raw.get("backend")
             data = raw.get("segments", [])
             if cached_model and cached_model != Config.WHISPER_MODEL:
                 print(f"  \u26a0 Cache model mismatch ({cached_model} vs {Config.WHISPER_MODEL}) — re-transcribing")
                 return None
+            if cached_backend and cached_backend != Config.WHISPER_BACKEND:
+                print(f"  \u26a0 Cache backend mismatch ({cached_backend} vs {Config.WHISPER_BACKEND}) — re-transcribing")
+                return None
+            # v2: words live in one column table (v1 kept them on each segment)
+            if words and raw.get("words"):
+                _attach_words(data, raw["words"])
         else:
             # Old format: bare list — use it but it can't be validated
             data = raw
@@ -1587,68 +3017,127 @@ def load_whisper_cache(job_folder):
 # INSTRUMENTAL HALLUCINATION DETECTION (#17)
 # ============================================================================
 
-def remove_instrumental_hallucinations(items, text_key, audio_path):
+class SilenceMap:
     """
-    Remove segments that fall over silent/instrumental sections.
-    #17: RMS energy analysis — full-span check instead of midpoint-only.
-    Also uses no_speech_prob from segment confidence metrics.
+    Boolean silence mask on a fixed hop (#50) with a prefix sum, so the
+    silent fraction of any time span is two lookups.  Falsy when nothing
+    in the clip is silent.
     """
-    if not items:
-        return items
 
-    # Determine time key
-    time_key = "t" if text_key == "lyric_current" else "time"
+    def __init__(self, silent, hop_sec):
+        self.silent = silent
+        self.hop_sec = hop_sec
+        self._cum = np.concatenate([[0], np.cumsum(silent, dtype=np.int64)])
+
+    def __bool__(self):
+        return bool(self._cum[-1])
+
+    def silent_ratio(self, start, end):
+        """Fraction of the hops touched by [start, end] that are silent."""
+        first = max(0, int(start / self.hop_sec))
+        last = max(first + 1, int(np.ceil(end / self.hop_sec)))
+        n = len(self.silent)
+        # Hops past the end of the clip count as not silent
+        silent = self._cum[min(last, n)] - self._cum[min(first, n)]
+        return silent / (last - first)
+
 
-    # Build silence map from audio RMS
-    silence_map = set()
+def _rms_envelope(samples, hop):
+    """RMS of consecutive `hop`-sample frames (the last one may be shorter)."""
+    starts = np.arange(0, len(samples), hop)
+    sums = np.add.reduceat(np.square(samples, dtype=np.float64), starts)
+    sizes = np.diff(np.append(starts, len(samples)))
+    return np.sqrt(sums / sizes)
+
+
+def _silence_map(audio):
+    """
+    #50: Frames of Config.SILENCE_HOP_MS whose RMS is below
+    SILENCE_ENERGY_RATIO of the loudest frame, from the decoded samples.
+    """
+    hop_sec = Config.SILENCE_HOP_MS / 1000
     try:
-        audio = AudioSegment.from_file(audio_path)
-        chunk_ms = 1000
-        chunks = [audio[i:i + chunk_ms] for i in range(0, len(audio), chunk_ms)]
-        if chunks:
-            rms_values = [chunk.rms for chunk in chunks]
-            max_rms = max(rms_values) if rms_values else 1
-            if max_rms > 0:
-                threshold = max_rms * SILENCE_ENERGY_RATIO
-                for i, rms in enumerate(rms_values):
-                    if rms < threshold:
-                        silence_map.add(i)
+        if _is_path(audio):
+            audio = load_audio(audio)
+        if _is_path(audio):
+            segment = AudioSegment.from_file(audio).set_channels(1)
+            samples = np.array(segment.get_array_of_samples(), dtype=np.float64)
+            sr = segment.frame_rate
+        else:
+            samples, sr = audio.samples, audio.sample_rate
+        if len(samples):
+            rms = _rms_envelope(samples, max(1, int(round(sr * hop_sec))))
+            peak = float(rms.max())
+            if peak > 0:
+                return SilenceMap(rms < peak * SILENCE_ENERGY_RATIO, hop_sec)
     except Exception:
         pass
+    return SilenceMap(np.zeros(0, dtype=bool), hop_sec)
 
-    filtered = []
-    removed = 0
 
-    for item in items:
-        start = item.get(time_key, 0)
+class InstrumentalStage(CleanupStage):
+    name = "instrumental"
+    summary = "   Removed {n} instrumental hallucination(s)"
+
+    def __init__(self, text_key, audio):
+        super().__init__()
+        self.time_key = "t" if text_key == "lyric_current" else "time"
+        self.audio = audio
+        self._silence = None
+
+    def silence_map(self):
+        # Built on first use — no audio analysis when nothing reaches this stage
+        if self._silence is None:
+            self._silence = _silence_map(self.audio)
+        return self._silence
+
+    def keep(self, rec):
+        item = rec.item
+        start = item.get(self.time_key, 0)
         end = item.get("end_time", start + 2)
 
         # Check 1: high no_speech_prob from Whisper confidence metrics
         no_speech = item.get("no_speech_prob", 0)
         if no_speech and no_speech > NO_SPEECH_PROB_THRESHOLD:
-            print(f"   \U0001f5d1 High no_speech_prob ({no_speech:.2f}): '{item.get(text_key, '')[:50]}' @ {start:.1f}s")
-            removed += 1
-            continue
+            return self.drop(f"   \U0001f5d1 High no_speech_prob ({no_speech:.2f}): "
+                             f"'{rec.raw[:50]}' @ {start:.1f}s")
 
         # Check 2: full-span silence analysis (>70% of span in silence)
+        silence_map = self.silence_map()
         if silence_map:
-            start_chunk = int(start)
-            end_chunk = int(end)
-            span_chunks = list(range(start_chunk, end_chunk + 1))
-            if span_chunks:
-                silent_count = sum(1 for c in span_chunks if c in silence_map)
-                silent_ratio = silent_count / len(span_chunks)
-                if silent_ratio > SILENCE_RATIO_THRESHOLD:
-                    print(f"   \U0001f5d1 Instrumental hallucination ({silent_ratio:.0%} silent): "
-                          f"'{item.get(text_key, '')[:50]}' @ {start:.1f}s")
-                    removed += 1
-                    continue
+            silent_ratio = silence_map.silent_ratio(start, end)
+            if silent_ratio > SILENCE_RATIO_THRESHOLD:
+                return self.drop(f"   \U0001f5d1 Instrumental hallucination ({silent_ratio:.0%} silent): "
+                                 f"'{rec.raw[:50]}' @ {start:.1f}s")
+        return True
+
+
+def remove_instrumental_hallucinations(items, text_key, audio):
+    """
+    Remove segments that fall over silent/instrumental sections.
+    #17: RMS energy analysis — full-span check instead of midpoint-only.
+    Also uses no_speech_prob from segment confidence metrics.
+    #36: `audio` may be an AudioBuffer, whose samples are reused (no decode).
+    #50: Silence checked on a Config.SILENCE_HOP_MS mask via prefix sums.
+    """
+    if not items:
+        return items
+    return run_cleanup(items, text_key, [InstrumentalStage(text_key, audio)])
 
-        filtered.append(item)
 
-    if removed:
-        print(f"   Removed {removed} instrumental hallucination(s)")
-    return filtered
+def clean_segments(items, text_key, initial_prompt=None, audio=None):
+    """
+    #44: The post-transcription cleanup chain (hallucinations, junk,
+    stutters, repetition loops, instrumental hallucinations) in one pass.
+    Same result as calling the remove_* functions one after another.
+    """
+    return run_cleanup(items, text_key, [
+        HallucinationStage(initial_prompt),
+        JunkStage(),
+        StutterStage(text_key),
+        RepetitionStage(),
+        InstrumentalStage(text_key, audio),
+    ])
 
 
 # ============================================================================
@@ -1682,7 +3171,9 @@ def transcribe_word_level(job_folder, song_title, template_name,
         return {"markers": [], "total_markers": 0}
 
     try:
-        audio_duration = get_audio_duration(audio_path)
+        # #36: decode once — reused for duration, Whisper input and silence map
+        audio = load_audio(audio_path)
+        audio_duration = get_audio_duration(audio)
         if audio_duration is not None:
             print(f"  Audio duration: {audio_duration:.1f}s")
         else:
@@ -1691,8 +3182,10 @@ def transcribe_word_level(job_folder, song_title, template_name,
         initial_prompt = build_initial_prompt(song_title)
         language = detect_language(song_title)
 
-        # Check Whisper cache
-        cached = load_whisper_cache(job_folder)
+        # Check Whisper cache (job folder, then artifact store)
+        store_key = whisper_store_key(audio_path, template_name,
+                                      regroup_passes=list(regroup_passes))
+        cached = load_whisper_cache(job_folder, store_key)
         if cached:
             markers = []
             for seg in cached:
@@ -1707,15 +3200,10 @@ def transcribe_word_level(job_folder, song_title, template_name,
                     "end_time": float(seg["end"])
                 })
         else:
-            # Vocal separation + multi-pass transcription
-            transcribe_path = separate_vocals(audio_path, job_folder)
-            used_demucs = transcribe_path != audio_path
-            result, pass_idx = multi_pass_transcribe(
-                transcribe_path, initial_prompt, audio_duration, language,
-                word_timestamps=True,
-                regroup_passes=regroup_passes,
-                from_demucs=used_demucs,
-            )
+            # Vocal separation + multi-pass transcription (raw passes shared, #43)
+            request = transcription_request(job_folder, song_title, template_name,
+                                            audio=audio, regroup_passes=regroup_passes)
+            result, pass_idx = multi_pass_transcribe(**request)
 
             if not result or not result.segments:
                 print("\u274c Whisper returned no segments after all attempts")
@@ -1728,7 +3216,7 @@ def transcribe_word_level(job_folder, song_title, template_name,
             markers = build_markers_from_segments(result.segments)
 
             if markers:
-                save_whisper_cache(job_folder, markers)
+                save_whisper_cache(job_folder, markers, store_key)
 
         if not markers:
             print("\u274c No valid markers generated")
@@ -1736,12 +3224,8 @@ def transcribe_word_level(job_folder, song_title, template_name,
 
         print(f"  Raw Whisper output: {len(markers)} markers")
 
-        # Cleanup pipeline
-        markers = remove_hallucinations(markers, "text", initial_prompt)
-        markers = remove_junk(markers, "text")
-        markers = remove_stutter_duplicates(markers, "text")
-        markers = remove_repetition_loops(markers, "text")
-        markers = remove_instrumental_hallucinations(markers, "text", audio_path)
+        # Cleanup pipeline (#44: one traversal)
+        markers = clean_segments(markers, "text", initial_prompt, audio)
 
         if not markers:
             print("\u274c No markers remain after cleanup")
@@ -1751,6 +3235,7 @@ def transcribe_word_level(job_folder, song_title, template_name,
 
         # Genius alignment — check database cache first
         genius_text = None
+        lyrics_index = None
         if song_title and Config.GENIUS_API_TOKEN:
             try:
                 from scripts.song_database import SongDatabase
@@ -1779,19 +3264,20 @@ def transcribe_word_level(job_folder, song_title, template_name,
                     f.write(genius_text)
 
                 language = detect_language(song_title, genius_text)
+                lyrics_index = GeniusLyricsIndex(genius_text)  # #46: parsed once
 
                 print("\u270e Aligning lyrics (sliding window)...")
-                markers_backup = copy.deepcopy(markers)
+                markers_backup = MarkerTable.from_markers(markers)  # #49: no deepcopy
                 markers, match_ratio = align_genius_to_whisper(
-                    markers, genius_text, segment_text_key="text"
+                    markers, genius_text, segment_text_key="text", index=lyrics_index
                 )
 
                 if match_ratio < 0.3:
                     print(f"  \u26a0 Low match ratio ({match_ratio:.2f}) \u2014 reverting to Whisper text")
-                    markers = markers_backup
+                    markers = markers_backup.to_markers()
                 elif match_ratio >= 0.5:
                     clean_genius = _strip_genius_section_tags(genius_text)
-                    aligned = align_genius_to_audio(audio_path, clean_genius, language)
+                    aligned = align_genius_to_audio(audio, clean_genius, language)
                     if aligned and aligned.segments:
                         aligned_markers = build_markers_from_segments(aligned.segments)
                         if len(aligned_markers) >= len(markers_backup):
@@ -1810,26 +3296,30 @@ def transcribe_word_level(job_folder, song_title, template_name,
         markers = remove_non_target_script(markers, "text", song_title)
 
         # #32: Auto-remove Genius-confirmed hallucinations before formatting
+        lyric_matches = LyricMatchMatrix(genius_text, index=lyrics_index)  # #45
         before_count = len(markers)
-        markers = remove_genius_confirmed_duplicates(markers, genius_text, "text")
+        markers = remove_genius_confirmed_duplicates(markers, genius_text, "text",
+                                                     matrix=lyric_matches)
         if len(markers) < before_count:
             print(f"  After auto-fix: {len(markers)} markers "
                   f"(removed {before_count - len(markers)})")
 
-        markers = merge_short_markers(markers)
-        assign_colors(markers)
-        fix_marker_gaps(markers)
-        spread_clustered_words(markers)  # #31: Fix Genius alignment bunching
+        # #49: Post-processing on columns, marker dicts rebuilt once
+        table = MarkerTable.from_markers(markers).merge_short()
+        table.assign_colors()
+        table.fix_gaps()
+        table.spread_clusters()  # #31: Fix Genius alignment bunching
+        markers = table.to_markers()
 
         passed, issues = quality_gate(markers, audio_duration)
         if not passed:
             print(f"  \u26a0 QUALITY WARNING: {'; '.join(issues)}")
 
         # #32: Validate remaining lyrics for visual quality issues
-        validate_lyrics_quality(markers, genius_text=genius_text)
+        validate_lyrics_quality(markers, genius_text=genius_text, matrix=lyric_matches)
 
         # Compute and save quality score
-        score = compute_quality_score(markers)
+        score = table.quality_score()
         print(f"  Quality: coverage={score['coverage_pct']:.0%}, "
               f"avg_prob={score['avg_prob']:.2f}, "
               f"zero_time={score['zero_time_words']}/{score['total_words']}")
@@ -0,0 +1,243 @@
+"""
+Whisper Features - compute log-mel and encoder output once per clip (#39)
+
+Every multi-pass attempt, each temperature fallback inside a pass, the word
+timestamp step and the Genius forced alignment all feed the same 30 s windows
+of the same clip through the mel filterbank and the audio encoder.  This
+module memoizes both, keyed by the content of the window, so repeats are free:
+
+  - stable-ts:      wraps stable_whisper's log_mel_spectrogram and the
+                    model's encoder module
+  - faster-whisper: wraps the model's feature_extractor and encode()
+
+The cache lives in the process that owns the model (GUI or transcription
+worker) and is reset when a new clip starts.
+
+Both hooks reach into engine internals (module-level functions and model
+attributes), so they are behind Config.WHISPER_SHARE_FEATURES and only
+installed when the engine matches what they were written against: the
+stable-ts release pinned by setup.py and the expected call signatures.
+Otherwise install_* raise FeatureSharingUnsupported before patching
+anything and the engine runs unmodified.
+"""
+import hashlib
+import importlib
+import inspect
+from collections import OrderedDict
+
+import numpy as np
+
+from scripts.config import Config
+
+
+# stable-ts releases the mel / encoder hooks are known to work with
+STABLE_TS_TESTED = ("2.17",)
+
+
+class FeatureSharingUnsupported(Exception):
+    """The installed engine doesn't look like the one the hooks expect."""
+
+
+def _installed_version(module_name):
+    try:
+        return getattr(importlib.import_module(module_name), "__version__", None)
+    except Exception:
+        return None
+
+
+def _takes(fn, *names):
+    """True if fn accepts every parameter in names."""
+    try:
+        params = inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return False
+    return all(n in params for n in names)
+
+
+def content_key(value, *extra):
+    """Digest of an array/tensor's bytes + shape (+ any extra call args)."""
+    if hasattr(value, "detach"):
+        value = value.detach().cpu().numpy()
+    arr = np.ascontiguousarray(value)
+    h = hashlib.blake2b(arr.view(np.uint8).data, digest_size=16)
+    h.update(repr((arr.shape, str(arr.dtype), extra)).encode("utf-8"))
+    return h.hexdigest()
+
+
+class FeatureMemo:
+    """Small LRU of computed features with hit/miss counters"""
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or Config.WHISPER_FEATURE_CACHE_WINDOWS
+        self.hits = 0
+        self.misses = 0
+        self.clip_id = None
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def cached(self, fn, key_arg, *extra):
+        """Return fn()'s result for key_arg, computing it only on a miss."""
+        key = content_key(key_arg, *extra)
+        value = self.get(key)
+        if value is None:
+            value = fn()
+            self.put(key, value)
+        return value
+
+    def begin_clip(self, clip_id):
+        """Drop features from the previous clip when a different one starts."""
+        if clip_id != self.clip_id:
+            self._entries.clear()
+            self.clip_id = clip_id
+
+    def clear(self):
+        self._entries.clear()
+        self.clip_id = None
+
+
+# Separate memos so large encoder outputs can't evict the cheap mels
+mel_memo = FeatureMemo()
+encoder_memo = FeatureMemo()
+
+
+def begin_clip(clip_id):
+    mel_memo.begin_clip(clip_id)
+    encoder_memo.begin_clip(clip_id)
+
+
+def reset():
+    mel_memo.clear()
+    encoder_memo.clear()
+
+
+# ============================================================================
+# stable-ts
+# ============================================================================
+
+# Modules in stable_whisper that call log_mel_spectrogram per 30 s window
+_STABLE_TS_MEL_MODULES = (
+    "stable_whisper.whisper_word_level.original_whisper",
+    "stable_whisper.alignment",
+)
+
+
+def _memoized_mel(original):
+    def log_mel_spectrogram(audio, n_mels=80, padding=0, device=None):
+        return mel_memo.cached(
+            lambda: original(audio, n_mels, padding=padding, device=device),
+            audio, n_mels, padding)
+    log_mel_spectrogram._apollova_original = original
+    return log_mel_spectrogram
+
+
+def _stable_ts_mel_modules():
+    """Modules whose log_mel_spectrogram has the signature _memoized_mel wraps."""
+    modules = []
+    for name in _STABLE_TS_MEL_MODULES:
+        try:
+            module = importlib.import_module(name)
+        except Exception:
+            continue
+        current = getattr(module, "log_mel_spectrogram", None)
+        if current is None:
+            continue
+        if not hasattr(current, "_apollova_original") and \
+                not _takes(current, "audio", "n_mels", "padding", "device"):
+            raise FeatureSharingUnsupported(
+                f"{name}.log_mel_spectrogram has an unexpected signature")
+        modules.append(module)
+    return modules
+
+
+def _cached_encoder(encoder):
+    import torch
+
+    class CachedEncoder(torch.nn.Module):
+        """Drop-in for model.encoder that reuses outputs for identical mels."""
+
+        def __init__(self, inner):
+            super().__init__()
+            self.inner = inner
+
+        def forward(self, mel):
+            return encoder_memo.cached(lambda: self.inner(mel), mel)
+
+    return CachedEncoder(encoder)
+
+
+def install_stable_ts(model):
+    """Share mel + encoder work across passes and alignment for a stable-ts model."""
+    version = _installed_version("stable_whisper")
+    if not version or not any(version == t or version.startswith(t + ".")
+                              for t in STABLE_TS_TESTED):
+        raise FeatureSharingUnsupported(f"untested stable-ts version {version}")
+    encoder = getattr(model, "encoder", None)
+    if encoder is None or not callable(encoder):
+        raise FeatureSharingUnsupported("model has no encoder module")
+    modules = _stable_ts_mel_modules()
+    if not modules:
+        raise FeatureSharingUnsupported("stable-ts has no log_mel_spectrogram hook")
+
+    for module in modules:
+        if not hasattr(module.log_mel_spectrogram, "_apollova_original"):
+            module.log_mel_spectrogram = _memoized_mel(module.log_mel_spectrogram)
+    if not hasattr(encoder, "inner"):
+        model.encoder = _cached_encoder(encoder)
+    return model
+
+
+# ============================================================================
+# faster-whisper
+# ============================================================================
+
+class _CachedFeatureExtractor:
+    """Proxy for faster_whisper's FeatureExtractor with a memoized __call__."""
+
+    def __init__(self, inner):
+        self.inner = inner
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+    def __call__(self, waveform, *args, **kwargs):
+        return mel_memo.cached(lambda: self.inner(waveform, *args, **kwargs),
+                               waveform, args, sorted(kwargs.items()))
+
+
+def install_faster_whisper(model):
+    """
+    Share mel + encoder work for a faster-whisper model.  CTranslate2 encoder
+    outputs are StorageViews, so they are reused as-is for identical inputs.
+    """
+    extractor = getattr(model, "feature_extractor", None)
+    encode = getattr(model, "encode", None)
+    if not callable(extractor) or not callable(encode):
+        raise FeatureSharingUnsupported("model has no feature_extractor / encode")
+    if not hasattr(encode, "_apollova_original") and not _takes(encode, "features"):
+        raise FeatureSharingUnsupported("encode() has an unexpected signature")
+
+    if not isinstance(extractor, _CachedFeatureExtractor):
+        model.feature_extractor = _CachedFeatureExtractor(extractor)
+    if not hasattr(encode, "_apollova_original"):
+        def cached_encode(features):
+            return encoder_memo.cached(lambda: encode(features), features)
+        cached_encode._apollova_original = encode
+        model.encode = cached_encode
+    return model
@@ -0,0 +1,14 @@
+"""
+YouTube video ids - the watch / youtu.be URL pattern shared by the download
+checks (audio_processing) and the per-video feature cache (chorus_detector).
+Standard library only, so importing it never pulls in pydub or librosa.
+"""
+import re
+
+YT_ID_RE = re.compile(r'(?:youtube\.com/watch\?.*v=|youtu\.be/)([A-Za-z0-9_-]{11})')
+
+
+def youtube_id(url):
+    """The 11-character video id in a YouTube URL, or None."""
+    match = YT_ID_RE.search(url or "")
+    return match.group(1) if match else None